@@ -0,0 +1,3 @@
+"""
+性能基准测试（从项目根目录运行，例如 python -m benchmarks.bench_dedup）
+"""
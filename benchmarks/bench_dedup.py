@@ -0,0 +1,110 @@
+"""
+去重基准测试：MinHash/LSH 索引 vs 逐条 SequenceMatcher 扫描
+
+用法：
+    python -m benchmarks.bench_dedup --existing 5000 --incoming 500
+    python -m benchmarks.bench_dedup --existing 5000 --incoming 500 --brute-sample 500   # 全部逐条比较（较慢）
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from src.processors.near_duplicate import NearDuplicateIndex
+from src.utils.helpers import calculate_similarity
+
+WORDS = [
+    "OpenAI", "Google", "DeepMind", "Anthropic", "Meta", "NVIDIA", "Microsoft", "startup",
+    "model", "agent", "benchmark", "reasoning", "chip", "funding", "launch", "release",
+    "research", "paper", "robotics", "vision", "language", "open-source", "safety", "policy",
+    "GPT-5", "Claude", "Gemini", "Llama", "training", "inference", "dataset", "multimodal",
+    "大模型", "发布", "融资", "芯片", "智能体", "开源", "研究", "突破",
+]
+PREFIXES = ["Exclusive: ", "Breaking: ", "Report: ", "Update: "]
+SYLLABLES = ["ka", "lo", "mi", "ren", "tor", "va", "zen", "qui", "bel", "dar", "ix", "no", "pha", "sul"]
+
+
+def build_vocabulary(rng: random.Random, size: int = 2000) -> List[str]:
+    """高频真实词 + 大量低频合成词，模拟真实标题的词汇分布"""
+    synthetic = {"".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)}
+    return WORDS + sorted(synthetic)
+
+
+def random_title(rng: random.Random, vocabulary: List[str]) -> str:
+    """生成随机标题（按 Zipf 分布取词）"""
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    return " ".join(rng.choices(vocabulary, weights=weights, k=rng.randint(6, 12)))
+
+
+def perturb(title: str, rng: random.Random) -> str:
+    """对标题做轻微改写（模拟转载 / 改标题）"""
+    words = title.split()
+    action = rng.choice(["drop", "add", "prefix", "case", "swap"])
+    if action == "drop" and len(words) > 6:
+        words.pop(rng.randrange(len(words)))
+    elif action == "add":
+        words.insert(rng.randrange(len(words) + 1), rng.choice(WORDS))
+    elif action == "prefix":
+        return rng.choice(PREFIXES) + title
+    elif action == "case":
+        return title.upper() + "!"
+    else:
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return " ".join(words)
+
+
+def brute_force(title: str, existing: List[str], threshold: float) -> bool:
+    """原实现：与所有已有标题逐条比较"""
+    return any(calculate_similarity(title, other) >= threshold for other in existing)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="去重基准测试")
+    parser.add_argument("--existing", type=int, default=5000, help="已有标题数量")
+    parser.add_argument("--incoming", type=int, default=500, help="待检查标题数量")
+    parser.add_argument("--dup-ratio", type=float, default=0.5, help="待检查标题中改写自已有标题的比例")
+    parser.add_argument("--threshold", type=float, default=0.85, help="相似度阈值")
+    parser.add_argument("--brute-sample", type=int, default=100,
+                        help="用逐条比较核对召回率的待检查标题数（逐条比较每条约需 1 秒 / 5000 条已有标题）")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = build_vocabulary(rng)
+    existing = [random_title(rng, vocabulary) for _ in range(args.existing)]
+    incoming = [
+        perturb(rng.choice(existing), rng) if rng.random() < args.dup_ratio else random_title(rng, vocabulary)
+        for _ in range(args.incoming)
+    ]
+
+    sample = incoming[:args.brute_sample]
+    start = time.perf_counter()
+    expected = [brute_force(title, existing, args.threshold) for title in sample]
+    brute_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = NearDuplicateIndex(threshold=args.threshold)
+    index.add_many(existing)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    candidate_total = 0
+    actual = []
+    for title in incoming:
+        candidate_total += len(index.candidates(title))
+        actual.append(index.find(title) is not None)
+    query_seconds = time.perf_counter() - start
+
+    true_dups = sum(expected)
+    found = sum(1 for e, a in zip(expected, actual) if e and a)
+    false_positive = sum(1 for e, a in zip(expected, actual) if a and not e)
+
+    print(f"已有标题: {args.existing}，待检查: {args.incoming}，阈值: {args.threshold}")
+    print(f"SequenceMatcher 扫描（{len(sample)} 条）: {brute_seconds:.2f}s（{brute_seconds / max(len(sample), 1) * 1000:.2f} ms/条）")
+    print(f"LSH 索引构建: {build_seconds:.2f}s，查询: {query_seconds:.2f}s"
+          f"（{query_seconds / args.incoming * 1000:.2f} ms/条，平均候选 {candidate_total / args.incoming:.1f} 条）")
+    print(f"逐条比较的 {len(sample)} 条中 重复: {true_dups}，召回: {found}（{found / max(true_dups, 1):.1%}），误报: {false_positive}")
+
+
+if __name__ == "__main__":
+    main()
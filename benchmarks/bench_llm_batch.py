@@ -0,0 +1,121 @@
+"""
+LLM批量处理基准测试：逐篇调用 vs 批量调用（使用离线模拟客户端，不访问网络）
+
+用法：
+    python -m benchmarks.bench_llm_batch --articles 100 --latency 0.2 --batch-size 10
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+import openai
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.models.news import Base
+from src.processors import Classifier, Summarizer
+from src.processors.llm_batch import LLMBatchProcessor
+
+
+class FakeChatCompletion:
+    """
+    离线模拟的 ChatCompletion 客户端（不访问网络）
+
+    批量请求返回合法的JSON数组，逐篇请求返回固定文本；
+    fail_every > 0 时每第N次请求返回无法解析的内容，用于验证回退路径。
+    """
+
+    def __init__(self, latency: float = 0.0, fail_every: int = 0):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, model: str, messages: List[Dict], temperature: float = 0.0, max_tokens: int = 0):
+        with self._lock:
+            self.calls += 1
+            call_number = self.calls
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        prompt = messages[-1]["content"]
+        if self.fail_every and call_number % self.fail_every == 0:
+            content = "抱歉，我无法处理这个请求。"
+        elif "新闻列表（JSON）" in prompt:
+            payload = json.loads(prompt.split("新闻列表（JSON）：", 1)[1])
+            content = json.dumps([{
+                "id": item["id"],
+                "summary": f"Summary of {item['title']}",
+                "summary_translated": f"摘要：{item['title']}",
+                "title_translated": None if "title_translated" in item else f"标题：{item['title']}",
+                "category": "行业动态",
+            } for item in payload], ensure_ascii=False)
+        elif "分类" in prompt:
+            content = "行业动态"
+        elif "翻译" in prompt:
+            content = "中文翻译"
+        else:
+            content = "中文摘要"
+
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def make_articles(count: int):
+    """生成测试文章（英文，关键词规则无法分类，需要AI分类）"""
+    return [{
+        "id": i,
+        "title": f"Company {i} ships new assistant features",
+        "content": f"Details about product number {i}. " * 20,
+    } for i in range(1, count + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM批量处理基准测试")
+    parser.add_argument("--articles", type=int, default=100, help="文章数量")
+    parser.add_argument("--latency", type=float, default=0.2, help="模拟每次请求的延迟（秒）")
+    parser.add_argument("--batch-size", type=int, default=10, help="每个批量请求包含的文章数")
+    parser.add_argument("--fail-every", type=int, default=0, help="每第N次请求返回无法解析的内容")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    classifier = Classifier(db)
+    summarizer = Summarizer()
+    articles = make_articles(args.articles)
+
+    # 逐篇调用（原实现：摘要、翻译、分类各一次请求）
+    single_client = FakeChatCompletion(latency=args.latency)
+    openai.ChatCompletion = single_client
+    start = time.perf_counter()
+    for article in articles:
+        classifier.classify(article)
+        summarizer.summarize(article)
+        summarizer.translate_title(article["title"])
+    single_seconds = time.perf_counter() - start
+
+    # 批量调用（回退的逐篇请求计入 fallback_client）
+    fallback_client = FakeChatCompletion(latency=args.latency)
+    openai.ChatCompletion = fallback_client
+    batch_client = FakeChatCompletion(latency=args.latency, fail_every=args.fail_every)
+    processor = LLMBatchProcessor(summarizer, classifier, client=batch_client, batch_size=args.batch_size)
+    start = time.perf_counter()
+    results = processor.process(articles)
+    batch_seconds = time.perf_counter() - start
+
+    print(f"文章数: {args.articles}，模拟延迟: {args.latency}s，批大小: {args.batch_size}")
+    print(f"逐篇调用: {single_client.calls} 次请求，{single_seconds:.2f}s")
+    print(f"批量调用: {batch_client.calls} 次批量请求 + {fallback_client.calls} 次回退请求，"
+          f"{batch_seconds:.2f}s，结果 {len(results)} 条")
+
+
+if __name__ == "__main__":
+    main()
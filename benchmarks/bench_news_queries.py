@@ -0,0 +1,145 @@
+"""
+新闻列表查询基准测试：逐条懒加载来源/分类 vs 单次联表查询（统计每个请求的SQL数量）
+
+用法：
+    python -m benchmarks.bench_news_queries --news 5000 --page-size 100
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, desc, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api.routes.news import NewsResponse, get_news
+from src.models.news import Base, News, NewsCategory, NewsSource
+
+
+def populate(db, news_count: int, source_count: int = 30):
+    """生成测试数据"""
+    categories = [NewsCategory(name=f"分类{i}") for i in range(8)]
+    sources = [NewsSource(name=f"source-{i}", url=f"https://example{i}.com/feed", source_type="rss")
+               for i in range(source_count)]
+    db.add_all(categories + sources)
+    db.flush()
+
+    random.seed(42)
+    now = datetime.utcnow()
+    db.bulk_insert_mappings(News, [{
+        "title": f"News {i}",
+        "content": "Lorem ipsum dolor sit amet. " * 200,
+        "summary": f"Summary {i}",
+        "url": f"https://example.com/news/{i}",
+        "source_id": random.choice(sources).id,
+        "category_id": random.choice(categories).id if i % 5 else None,
+        "published_at": now - timedelta(minutes=i),
+        "importance_score": random.random(),
+        "is_featured": i % 10 == 0,
+        "is_processed": True,
+    } for i in range(news_count)])
+    db.commit()
+
+
+def legacy_get_news(db, page: int, page_size: int, category=None):
+    """原实现：先查分类ID，再读取完整ORM对象，逐条懒加载来源和分类"""
+    query = db.query(News)
+    if category:
+        category_obj = db.query(NewsCategory).filter(NewsCategory.name == category).first()
+        if category_obj:
+            query = query.filter(News.category_id == category_obj.id)
+
+    query = query.order_by(desc(News.published_at), desc(News.importance_score))
+    query.count()
+    news_list = query.offset((page - 1) * page_size).limit(page_size).all()
+
+    return [NewsResponse(
+        id=news.id,
+        title=news.title,
+        title_translated=news.title_translated,
+        summary=news.summary,
+        summary_translated=news.summary_translated,
+        url=news.url,
+        image_url=news.image_url,
+        source_name=news.source.name,
+        category_name=news.category.name if news.category else None,
+        published_at=news.published_at,
+        importance_score=news.importance_score,
+        is_featured=news.is_featured
+    ) for news in news_list]
+
+
+async def joined_get_news(db, page: int, page_size: int, category=None):
+    """新实现（直接调用路由函数，异步会话）"""
+    return await get_news.__wrapped__(page=page, page_size=page_size, category=category, source=None,
+                                      featured=None, days=None, min_score=None, db=db)
+
+
+def run_request(session_factory, func, page: int, page_size: int, category):
+    """每个请求使用新会话，与API中的 get_db / get_async_db 一致（不复用身份映射）"""
+    if asyncio.iscoroutinefunction(func):
+        async def run_async():
+            async with session_factory() as db:
+                return await func(db, page, page_size, category)
+        return asyncio.run(run_async())
+
+    db = session_factory()
+    try:
+        return func(db, page, page_size, category)
+    finally:
+        db.close()
+
+
+def measure(engine, session_factory, func, page_size: int, category, repeat: int):
+    """返回（每个请求的SQL数量，每个请求的平均耗时ms）"""
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        start = time.perf_counter()
+        for i in range(repeat):
+            result = run_request(session_factory, func, i % 3 + 1, page_size, category)
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(result) == page_size
+    return len(statements) / repeat, elapsed / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="新闻列表查询基准测试")
+    parser.add_argument("--news", type=int, default=5000, help="新闻数量")
+    parser.add_argument("--page-size", type=int, default=100, help="每页数量")
+    parser.add_argument("--repeat", type=int, default=20, help="请求次数（在前3页之间翻页）")
+    args = parser.parse_args()
+
+    # 同步（原实现）和异步（路由）引擎访问同一个临时数据库文件
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    populate(db, args.news)
+    db.close()
+
+    implementations = (
+        ("逐条懒加载", legacy_get_news, engine, session_factory),
+        ("单次联表", joined_get_news, async_engine.sync_engine, async_sessionmaker(async_engine)),
+    )
+
+    print(f"新闻 {args.news} 条，每页 {args.page_size} 条，{args.repeat} 个请求")
+    for category in (None, "分类3"):
+        label = f"category={category}" if category else "无筛选"
+        for name, func, bench_engine, bench_sessions in implementations:
+            queries, ms = measure(bench_engine, bench_sessions, func, args.page_size, category, args.repeat)
+            print(f"  [{label}] {name}: 每请求 {queries:.0f} 条SQL，平均 {ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
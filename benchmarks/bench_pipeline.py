@@ -0,0 +1,390 @@
+"""
+爬取流水线离线回放基准测试：本地HTTP服务回放RSS/网页样本，在临时数据库上端到端运行 scrape_all
+
+报告吞吐量（条/秒）、各阶段耗时（p50/p95）、峰值内存，以及已有数据量下的查询耗时。
+可预先生成大量已有新闻（10k / 100k / 1M），测量去重索引和查询随数据量的变化。
+回放时不访问外部网络，也不调用AI和翻译接口。
+
+用法：
+    python -m benchmarks.bench_pipeline --feeds 20 --items 50
+    python -m benchmarks.bench_pipeline --existing 100000 --runs 2
+    python -m benchmarks.bench_pipeline --record benchmarks/fixtures   # 录制 config.yaml 中启用的源（需要网络）
+    python -m benchmarks.bench_pipeline --fixtures benchmarks/fixtures  # 回放录制的样本
+"""
+import argparse
+import asyncio
+import copy
+import functools
+import itertools
+import json
+import os
+import random
+import re
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+import yaml
+from loguru import logger
+
+from benchmarks.bench_dedup import build_vocabulary, perturb
+
+MANIFEST = "manifest.json"
+
+# 生成的网页样本使用的选择器
+WEB_SELECTORS = {
+    "item": "article.post",
+    "title": "h2 a",
+    "link": "h2 a",
+    "content": "p.summary",
+    "date": "time",
+    "image": "img",
+}
+
+
+class Corpus:
+    """合成标题和正文（按 Zipf 分布取词，累积权重只计算一次）"""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.vocabulary = build_vocabulary(rng)
+        self.cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(self.vocabulary))))
+
+    def words(self, count: int) -> str:
+        return " ".join(self.rng.choices(self.vocabulary, cum_weights=self.cum_weights, k=count))
+
+    def title(self) -> str:
+        return self.words(self.rng.randint(6, 12))
+
+    def body(self, sentences: int) -> str:
+        return " ".join(self.words(self.rng.randint(8, 20)).capitalize() + "." for _ in range(sentences))
+
+
+def generate_fixtures(directory: str, feeds: int, items: int, web_pages: int, dup_ratio: float, seed: int):
+    """生成RSS和网页样本（部分条目为其他源标题的改写，模拟转载）"""
+    rng = random.Random(seed)
+    corpus = Corpus(rng)
+    now = datetime.now(timezone.utc)
+    titles: List[str] = []
+    manifest = []
+
+    def next_title() -> str:
+        title = perturb(rng.choice(titles), rng) if titles and rng.random() < dup_ratio else corpus.title()
+        titles.append(title)
+        return title
+
+    for i in range(feeds):
+        entries = []
+        for j in range(items):
+            link = f"https://feed{i}.example.com/articles/{j}"
+            description = f"<p>{corpus.body(rng.randint(3, 12))}</p><img src=\"https://img.example.com/{i}/{j}.jpg\"/>"
+            entries.append(
+                f"<item><title>{escape(next_title())}</title><link>{link}</link>"
+                f"<description>{escape(description)}</description>"
+                f"<author>author{rng.randint(1, 50)}@example.com</author>"
+                f"<pubDate>{format_datetime(now - timedelta(minutes=rng.randint(0, 3 * 24 * 60)))}</pubDate></item>"
+            )
+        filename = f"feed{i}.xml"
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            f.write(f"<?xml version=\"1.0\" encoding=\"utf-8\"?><rss version=\"2.0\"><channel>"
+                    f"<title>Feed {i}</title><link>https://feed{i}.example.com/</link>{''.join(entries)}"
+                    f"</channel></rss>")
+        manifest.append({"name": f"Replay Feed {i}", "type": "rss", "file": filename})
+
+    for i in range(web_pages):
+        posts = []
+        for j in range(items):
+            posted = (now - timedelta(minutes=rng.randint(0, 3 * 24 * 60))).isoformat()
+            posts.append(
+                f"<article class=\"post\"><h2><a href=\"/page{i}/post/{j}\">{escape(next_title())}</a></h2>"
+                f"<p class=\"summary\">{escape(corpus.body(rng.randint(2, 5)))}</p>"
+                f"<time>{posted}</time><img src=\"/static/{i}/{j}.png\"/></article>"
+            )
+        filename = f"page{i}.html"
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            f.write(f"<html><head><title>Page {i}</title></head><body><main>{''.join(posts)}</main></body></html>")
+        manifest.append({"name": f"Replay Page {i}", "type": "web", "file": filename, "selectors": WEB_SELECTORS})
+
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def record_fixtures(directory: str, config: Dict):
+    """下载 config.yaml 中启用的源，保存为回放样本"""
+    from src.utils.http import configure_http, get_http_session
+
+    configure_http(config)
+    session = get_http_session()
+    headers = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"}
+    os.makedirs(directory, exist_ok=True)
+
+    manifest = []
+    sources = config.get("sources", {})
+    for source_type, extension in (("rss", "xml"), ("web", "html")):
+        for source in sources.get(source_type, []):
+            if not source.get("enabled", True):
+                continue
+            try:
+                response = session.get(source["url"], headers=headers, timeout=30)
+                response.raise_for_status()
+            except Exception as e:
+                print(f"  跳过 {source['name']}: {e}")
+                continue
+
+            filename = f"{len(manifest):03d}-{re.sub(r'[^A-Za-z0-9]+', '-', source['name']).strip('-').lower()}.{extension}"
+            with open(os.path.join(directory, filename), "wb") as f:
+                f.write(response.content)
+            entry = {"name": source["name"], "type": source_type, "file": filename}
+            if source_type == "web":
+                entry["selectors"] = source.get("selectors", {})
+            manifest.append(entry)
+            print(f"  已录制 {source['name']}（{len(response.content) / 1024:.0f} KB）")
+
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"共录制 {len(manifest)} 个源到 {directory}")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """静态文件服务（不输出访问日志）"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(directory: str) -> ThreadingHTTPServer:
+    """在本地随机端口启动样本文件服务"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_config(manifest: List[Dict], base_url: str, max_workers: int, parse_workers: Optional[int] = None) -> Dict:
+    """基于 config.yaml 生成回放配置（数据源指向本地服务，关闭翻译和翻译缓存）"""
+    with open("config.yaml", "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    config["sources"] = {
+        "rss": [{"name": entry["name"], "url": f"{base_url}/{entry['file']}", "enabled": True}
+                for entry in manifest if entry["type"] == "rss"],
+        "web": [{"name": entry["name"], "url": f"{base_url}/{entry['file']}", "enabled": True,
+                 "selectors": entry.get("selectors", {})}
+                for entry in manifest if entry["type"] == "web"],
+    }
+    # 所有样本来自同一个本地地址，单域名并发上限放开到全局并发数
+    scraping = config.setdefault("scraping", {})
+    scraping.update({"max_workers": max_workers, "per_host_limit": max_workers})
+    if parse_workers is not None:
+        scraping["parse_workers"] = parse_workers
+    processing = config.setdefault("processing", {})
+    processing.setdefault("summarization", {})["translate_to_chinese"] = False
+    processing.setdefault("translation_cache", {})["enabled"] = False
+    return config
+
+
+def populate_existing(count: int, seed: int, batch_size: int = 10000):
+    """
+    生成已有新闻（发布时间分布在最近30天，约1/4落在去重窗口内）
+
+    写入期间暂停全文索引的插入触发器，写完后一次重建索引（比逐行触发快约一倍）。
+    """
+    from sqlalchemy import insert, text
+    from src.database import SessionLocal, engine, rebuild_daily_stats
+    from src.database.fts import FTS_TABLE, setup_fts
+    from src.models.news import News, NewsSource
+
+    rng = random.Random(seed + 1)
+    corpus = Corpus(rng)
+    now = datetime.utcnow()
+
+    fts_enabled = engine.dialect.name == "sqlite"
+    if fts_enabled:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TRIGGER IF EXISTS news_fts_ai"))
+
+    db = SessionLocal()
+    try:
+        sources = [NewsSource(name=f"corpus-{i}", url=f"https://corpus{i}.example.com/feed", source_type="rss")
+                   for i in range(20)]
+        db.add_all(sources)
+        db.flush()
+        source_ids = [source.id for source in sources]
+
+        for start in range(0, count, batch_size):
+            rows = []
+            for i in range(start, min(count, start + batch_size)):
+                url = f"https://corpus.example.com/news/{i}"
+                rows.append({
+                    "title": corpus.title(),
+                    "content": corpus.body(rng.randint(2, 6)),
+                    "summary": corpus.words(20),
+                    "url": url,
+                    "url_normalized": url,
+                    "source_id": rng.choice(source_ids),
+                    "published_at": now - timedelta(seconds=rng.randint(0, 30 * 86400)),
+                    "importance_score": rng.random(),
+                    "is_processed": True,
+                })
+            db.execute(insert(News), rows)
+            db.commit()
+            if count >= 100000 and (start // batch_size) % 10 == 9:
+                print(f"  已生成 {start + len(rows)} / {count}")
+
+        rebuild_daily_stats(db)
+    finally:
+        db.close()
+        if fts_enabled:
+            with engine.begin() as conn:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            setup_fts(engine)
+
+
+def measure_queries(repeat: int) -> Dict[str, float]:
+    """已有数据量下的API查询耗时（中位数ms，直接调用路由函数，绕过响应缓存）"""
+    from src.api.routes.news import get_news_feed, search_news
+    from src.api.routes.stats import get_overview
+    from src.database import AsyncReadSessionLocal, async_engine, async_read_engine
+
+    queries = {
+        "feed 首页": lambda db: get_news_feed.__wrapped__(
+            cursor=None, page_size=20, category=None, source=None, featured=None,
+            days=None, min_score=None, include_total=False, db=db),
+        "feed 精选": lambda db: get_news_feed.__wrapped__(
+            cursor=None, page_size=20, category=None, source=None, featured=True,
+            days=None, min_score=None, include_total=False, db=db),
+        "search 全文": lambda db: search_news.__wrapped__(
+            q="model release", page=1, page_size=20, category=None, source=None,
+            days=None, min_score=None, db=db),
+        "stats overview": lambda db: get_overview.__wrapped__(db=db),
+    }
+
+    async def run() -> Dict[str, float]:
+        results = {}
+        for name, query in queries.items():
+            durations = []
+            for _ in range(repeat):
+                async with AsyncReadSessionLocal() as db:
+                    start = time.perf_counter()
+                    await query(db)
+                    durations.append(time.perf_counter() - start)
+            results[name] = statistics.median(durations) * 1000
+        for engine in (async_read_engine, async_engine):
+            await engine.dispose()
+        return results
+
+    return asyncio.run(run())
+
+
+def print_timings(run: Dict, slowest: int):
+    """输出各阶段耗时和最慢的来源"""
+    print(f"  {'阶段':<20}{'次数':>6}{'总计ms':>10}{'p50ms':>9}{'p95ms':>9}{'最大ms':>9}")
+    for stage, stats in run["stages"].items():
+        print(f"  {stage:<20}{stats['count']:>6}{stats['total_ms']:>10.1f}"
+              f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+    for source in run["slowest_sources"][:slowest]:
+        stages = ", ".join(f"{stage} {ms:.0f}" for stage, ms in source["stages_ms"].items())
+        print(f"  最慢来源 {source['source']}: {source['total_ms']:.0f} ms（{stages}）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="爬取流水线离线回放基准测试")
+    parser.add_argument("--feeds", type=int, default=20, help="生成的RSS源数量")
+    parser.add_argument("--web-pages", type=int, default=2, help="生成的网页源数量")
+    parser.add_argument("--items", type=int, default=50, help="每个源的条目数")
+    parser.add_argument("--dup-ratio", type=float, default=0.1, help="条目中改写自其他条目标题的比例")
+    parser.add_argument("--existing", type=int, default=0, help="预先生成的已有新闻数量（如 10000 / 100000 / 1000000）")
+    parser.add_argument("--runs", type=int, default=1, help="运行次数（之后的运行命中条件请求缓存，测量未更新路径）")
+    parser.add_argument("--workers", type=int, default=8, help="并发抓取数")
+    parser.add_argument("--parse-workers", type=int, help="HTML解析进程数（默认使用 config.yaml 的设置）")
+    parser.add_argument("--query-repeat", type=int, default=20, help="每个查询的执行次数")
+    parser.add_argument("--fixtures", help="回放已录制的样本目录（包含 manifest.json）")
+    parser.add_argument("--record", help="录制 config.yaml 中启用的源到该目录后退出")
+    parser.add_argument("--tracemalloc", action="store_true", help="跟踪Python内存分配峰值（运行明显变慢，吞吐量仅供参考）")
+    parser.add_argument("--log-level", default="WARNING", help="日志级别（逐条日志会影响耗时）")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+
+    if args.record:
+        with open("config.yaml", "r", encoding="utf-8") as f:
+            record_fixtures(args.record, yaml.safe_load(f))
+        return
+
+    # 临时数据库须在导入 src.database 之前指定；回放不调用AI接口
+    workdir = tempfile.mkdtemp(prefix="bench-pipeline-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.pop("OPENAI_API_KEY", None)
+
+    from sqlalchemy import func
+    from src.database import SessionLocal, migrate_db
+    from src.models.news import News
+    from src.scheduler.tasks import ScrapeTask
+    from src.utils.timing import get_pipeline_timings
+
+    fixtures_dir = args.fixtures
+    if not fixtures_dir:
+        fixtures_dir = os.path.join(workdir, "fixtures")
+        os.makedirs(fixtures_dir)
+        generate_fixtures(fixtures_dir, args.feeds, args.items, args.web_pages, args.dup_ratio, args.seed)
+    with open(os.path.join(fixtures_dir, MANIFEST), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    migrate_db()
+    if args.existing:
+        print(f"生成已有新闻 {args.existing} 条...")
+        start = time.perf_counter()
+        populate_existing(args.existing, args.seed)
+        print(f"  耗时 {time.perf_counter() - start:.1f}s")
+
+    server = serve_fixtures(fixtures_dir)
+    config = build_config(manifest, f"http://127.0.0.1:{server.server_port}", args.workers, args.parse_workers)
+
+    class ReplayScrapeTask(ScrapeTask):
+        """使用回放配置的爬取任务"""
+
+        def _load_config(self) -> Dict:
+            return copy.deepcopy(config)
+
+    print(f"样本: {len(manifest)} 个源（{fixtures_dir}），已有新闻: {args.existing}，数据库: {workdir}")
+    try:
+        for run_index in range(1, args.runs + 1):
+            task = ReplayScrapeTask()
+            if args.tracemalloc:
+                tracemalloc.start()
+            start = time.perf_counter()
+            result = task.scrape_all()
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+            tracemalloc.stop()
+
+            print(f"\n第 {run_index} 次运行: {elapsed:.2f}s，抓取 {result['scraped']} 条"
+                  f"（{result['scraped'] / elapsed:.0f} 条/秒），写入 {result['saved']} 条"
+                  f"（{result['saved'] / elapsed:.0f} 条/秒）")
+            memory = f"Python分配峰值 {peak / 1024 / 1024:.1f} MB，" if peak is not None else ""
+            print(f"  内存: {memory}进程RSS峰值 {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+            print_timings(get_pipeline_timings(limit=1, slowest=5)["runs"][0], slowest=5)
+    finally:
+        server.shutdown()
+
+    db = SessionLocal()
+    total = db.query(func.count(News.id)).scalar()
+    db.close()
+    print(f"\n查询耗时（新闻 {total} 条，中位数）:")
+    for name, ms in measure_queries(args.query_repeat).items():
+        print(f"  {name}: {ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+网页选择器基准测试：BeautifulSoup（soup.select）vs 编译为XPath后在 lxml 树上提取
+
+对录制的网页样本（bench_pipeline --record 生成）或生成的样本逐页运行两种提取方式，
+检查提取结果一致，并报告每页耗时（仅建树 / 完整提取）。
+
+用法：
+    python -m benchmarks.bench_selectors
+    python -m benchmarks.bench_selectors --pages 4 --items 50 --boilerplate 200
+    python -m benchmarks.bench_selectors --fixtures benchmarks/fixtures   # 录制的网页样本
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+
+from benchmarks.bench_pipeline import MANIFEST, Corpus, generate_fixtures
+from src.scrapers.parsing import compile_selectors, extract_web_articles_lxml, extract_web_articles_soup
+
+BASE_URL = "https://example.com/"
+
+# 类似 Hacker News 的表格结构（与 config.yaml 中的选择器相同，包含子元素组合器）
+HN_SELECTORS = {
+    "item": "tr.athing",
+    "title": ".titleline > a",
+    "link": ".titleline > a",
+    "date": ".age",
+}
+
+
+def boilerplate(size_kb: int, rng: random.Random) -> str:
+    """导航、脚本、页脚等与文章无关的标记（真实网页的大部分内容）"""
+    parts = []
+    size = 0
+    while size < size_kb * 1024:
+        block = rng.choice([
+            "<nav class=\"menu\"><ul>" + "".join(
+                f"<li class=\"menu-item\"><a href=\"/section/{rng.randint(1, 999)}\">Section {rng.randint(1, 999)}</a></li>"
+                for _ in range(20)) + "</ul></nav>",
+            "<script>window.dataLayer = window.dataLayer || []; dataLayer.push({'event': 'view', 'id': "
+            + str(rng.randint(1, 10 ** 9)) + "});</script>",
+            "<div class=\"ad-slot\" data-slot=\"" + str(rng.randint(1, 999)) + "\"><span>Advertisement</span></div>",
+            "<footer><p>&copy; Example Media</p>" + "".join(
+                f"<a class=\"footer-link\" href=\"/about/{i}\">About {i}</a>" for i in range(15)) + "</footer>",
+        ])
+        parts.append(block)
+        size += len(block)
+    return "".join(parts)
+
+
+def hn_page(items: int, rng: random.Random) -> str:
+    """类似 Hacker News 首页的表格（发布时间在下一行，不在文章项内）"""
+    corpus = Corpus(rng)
+    rows = []
+    for j in range(items):
+        rows.append(
+            f"<tr class=\"athing\" id=\"{j}\"><td class=\"title\"><span class=\"rank\">{j + 1}.</span></td>"
+            f"<td class=\"title\"><span class=\"titleline\"><a href=\"https://news{j}.example.com/story\">"
+            f"{escape(corpus.title())}</a><span class=\"sitebit\"> (<a href=\"from?site=example.com\">example.com</a>)"
+            f"</span></span></td></tr>"
+            f"<tr><td class=\"subtext\"><span class=\"score\">{rng.randint(1, 500)} points</span> "
+            f"<span class=\"age\" title=\"2026-10-18T08:00:00\"><a href=\"item?id={j}\">3 hours ago</a></span></td></tr>"
+        )
+    return f"<html><body><table id=\"hnmain\"><tr><td><table>{''.join(rows)}</table></td></tr></table></body></html>"
+
+
+def load_pages(args) -> List[Tuple[str, str, Dict[str, str]]]:
+    """读取或生成网页样本：(名称, 内容, 选择器)"""
+    if args.fixtures:
+        with open(os.path.join(args.fixtures, MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        pages = []
+        for entry in manifest:
+            if entry["type"] != "web":
+                continue
+            with open(os.path.join(args.fixtures, entry["file"]), "rb") as f:
+                pages.append((entry["name"], f.read().decode("utf-8", errors="replace"), entry.get("selectors", {})))
+        return pages
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory(prefix="bench-selectors-") as directory:
+        generate_fixtures(directory, feeds=0, items=args.items, web_pages=args.pages, dup_ratio=0.0, seed=args.seed)
+        with open(os.path.join(directory, MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        pages = []
+        for entry in manifest:
+            with open(os.path.join(directory, entry["file"]), "r", encoding="utf-8") as f:
+                pages.append((entry["name"], f.read(), entry["selectors"]))
+    pages.append(("HN-like", hn_page(args.items, rng), HN_SELECTORS))
+
+    if args.boilerplate:
+        pages = [(name, page.replace("<body>", "<body>" + boilerplate(args.boilerplate, rng), 1), selectors)
+                 for name, page, selectors in pages]
+    return pages
+
+
+def median_ms(func: Callable, repeat: int) -> float:
+    """多次执行的耗时中位数（毫秒）"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def same_articles(left: List[Dict], right: List[Dict]) -> bool:
+    """两种方式的提取结果是否一致（没有日期元素时发布时间取当前时间，只比较到秒）"""
+    if len(left) != len(right):
+        return False
+    for a, b in zip(left, right):
+        if {k: v for k, v in a.items() if k != "published_at"} != {k: v for k, v in b.items() if k != "published_at"}:
+            return False
+        x, y = a["published_at"], b["published_at"]
+        if isinstance(x, datetime) and isinstance(y, datetime) and x.tzinfo is None and y.tzinfo is None:
+            if abs((x - y).total_seconds()) > 1:
+                return False
+        elif x != y:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="网页选择器基准测试（BeautifulSoup vs lxml XPath）")
+    parser.add_argument("--fixtures", help="录制的样本目录（包含 manifest.json），默认生成样本")
+    parser.add_argument("--pages", type=int, default=2, help="生成的网页数量（另加一个类似 Hacker News 的表格页）")
+    parser.add_argument("--items", type=int, default=50, help="每个网页的文章数")
+    parser.add_argument("--boilerplate", type=int, default=0, help="每个生成的网页附加的无关标记大小（KB）")
+    parser.add_argument("--repeat", type=int, default=20, help="每种方式的执行次数")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    pages = load_pages(args)
+    if not pages:
+        print("没有网页样本")
+        return
+
+    print(f"网页样本 {len(pages)} 个，每种方式执行 {args.repeat} 次（中位数，毫秒/页）")
+    print(f"  {'样本':<20}{'KB':>6}{'文章':>6}{'soup建树':>10}{'soup提取':>10}{'lxml建树':>10}{'lxml提取':>10}{'加速':>7}  结果")
+    totals = [0.0, 0.0]
+    for name, page, selectors in pages:
+        start = time.perf_counter()
+        xpaths = compile_selectors(selectors)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        soup_articles, _ = extract_web_articles_soup(page, BASE_URL, selectors)
+        lxml_articles, _ = extract_web_articles_lxml(page, BASE_URL, xpaths)
+        status = "一致" if same_articles(soup_articles, lxml_articles) else "不一致"
+
+        soup_tree = median_ms(lambda: BeautifulSoup(page, "lxml"), args.repeat)
+        soup_total = median_ms(lambda: extract_web_articles_soup(page, BASE_URL, selectors), args.repeat)
+        lxml_tree = median_ms(lambda: lxml_html.document_fromstring(page), args.repeat)
+        lxml_total = median_ms(lambda: extract_web_articles_lxml(page, BASE_URL, xpaths), args.repeat)
+        totals[0] += soup_total
+        totals[1] += lxml_total
+
+        print(f"  {name[:20]:<20}{len(page) / 1024:>6.0f}{len(soup_articles):>6}{soup_tree:>10.2f}{soup_total:>10.2f}"
+              f"{lxml_tree:>10.2f}{lxml_total:>10.2f}{soup_total / lxml_total:>6.1f}x  {status}（编译 {compile_ms:.2f} ms）")
+
+    print(f"合计: BeautifulSoup {totals[0]:.1f} ms，lxml XPath {totals[1]:.1f} ms（{totals[0] / totals[1]:.1f}x）")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,17 @@
 """
 import threading
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from src.database import get_db, SessionLocal
+from src.database import get_async_db, SessionLocal, rebuild_daily_stats
 from src.scheduler.tasks import ScrapeTask
+from src.processors.translation_cache import get_translation_cache_stats
+from src.utils.cache import get_response_cache_stats, invalidate_response_cache
 from src.utils.logger import get_logger
+from src.utils.timing import get_pipeline_timings
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -51,14 +55,16 @@ def run_scrape_task():
         
         try:
             from src.models.news import News
-            before_count = db.query(News).count()
+            before_count = db.query(func.count(News.id)).scalar()
+            # 结束读事务，释放写连接（爬取任务使用同一个写连接）
+            db.commit()
             
             # 执行爬取
             task = ScrapeTask()
             task.scrape_all()
             
             # 重新查询数量
-            after_count = db.query(News).count()
+            after_count = db.query(func.count(News.id)).scalar()
             saved_count = max(0, after_count - before_count)
             
             with scrape_lock:
@@ -79,7 +85,7 @@ def run_scrape_task():
 
 
 @router.post("/scrape/trigger")
-def trigger_scrape(background_tasks: BackgroundTasks):
+async def trigger_scrape(background_tasks: BackgroundTasks):
     """
     手动触发爬取任务（后台异步执行）
     
@@ -111,7 +117,7 @@ def trigger_scrape(background_tasks: BackgroundTasks):
 
 
 @router.get("/scrape/status")
-def get_scrape_status():
+async def get_scrape_status():
     """
     获取爬取任务状态
     """
@@ -125,20 +131,65 @@ def get_scrape_status():
         }
 
 
+@router.get("/translation-cache/stats")
+async def get_translation_cache_status():
+    """
+    获取翻译缓存命中统计
+    """
+    return get_translation_cache_stats()
+
+
+@router.get("/response-cache/stats")
+async def get_response_cache_status():
+    """
+    获取API响应缓存命中统计
+    """
+    return get_response_cache_stats()
+
+
+@router.get("/timings")
+async def get_timings(
+    limit: int = Query(5, ge=0, le=20, description="返回最近几次运行"),
+    slowest: int = Query(10, ge=0, le=100, description="每次运行返回最慢的来源数量")
+):
+    """
+    获取爬取/增强流水线各阶段耗时（p50/p95）和最慢的来源
+    """
+    return get_pipeline_timings(limit=limit, slowest=slowest)
+
+
+@router.post("/stats/rebuild")
+async def rebuild_stats(db: AsyncSession = Depends(get_async_db)):
+    """
+    根据新闻表重建每日统计汇总
+    """
+    rows = await db.run_sync(rebuild_daily_stats)
+    invalidate_response_cache()
+    return {"success": True, "rows": rows}
+
+
 @router.delete("/data/clear")
-def clear_all_data(db: Session = Depends(get_db)):
+async def clear_all_data(db: AsyncSession = Depends(get_async_db)):
     """
     清空所有新闻数据（保留数据源和分类配置）
+    
+    同时重置各来源的缓存校验信息和增量抓取水位，否则下次抓取会因304或“已抓取过”而得不到任何文章。
     """
     try:
-        from src.models.news import News
+        from src.models.news import News, NewsDailyStat, NewsSource
         
         # 统计当前数据量
-        count = db.query(News).count()
+        count = (await db.execute(select(func.count(News.id)))).scalar_one()
         
-        # 删除所有新闻
-        db.query(News).delete()
-        db.commit()
+        # 删除所有新闻及其统计汇总
+        await db.execute(delete(News))
+        await db.execute(delete(NewsDailyStat))
+        await db.execute(update(NewsSource).values(
+            etag=None, last_modified=None, content_hash=None,
+            last_published_at=None, seen_guids=None,
+        ))
+        await db.commit()
+        invalidate_response_cache()
         
         logger.info(f"已清空 {count} 条新闻数据")
         
@@ -149,7 +200,7 @@ def clear_all_data(db: Session = Depends(get_db)):
         }
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"清空数据失败: {e}")
         raise HTTPException(status_code=500, detail=f"清空数据失败: {str(e)}")
 
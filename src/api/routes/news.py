@@ -1,19 +1,28 @@
 """
 新闻API路由
 """
-from typing import List, Optional
+import base64
+import json
+import math
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, or_, select, tuple_
+from sqlalchemy.exc import OperationalError
 from pydantic import BaseModel
 
-from src.database import get_db
-from src.models.news import News, NewsCategory
+from src.database import get_async_read_db
+from src.database.fts import (
+    FTS_COLUMNS, split_search_terms, build_match_expression, fts_ranked_subquery, fetch_snippets
+)
+from src.utils.cache import cached_response
+from src.utils.logger import get_logger
+from src.models.news import News, NewsCategory, NewsSource
 
+logger = get_logger(__name__)
 router = APIRouter()
 
-
 class NewsResponse(BaseModel):
     """新闻响应模型"""
     id: int
@@ -33,107 +42,256 @@ class NewsResponse(BaseModel):
         from_attributes = True
 
 
-@router.get("/", response_model=List[NewsResponse])
-def get_news(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
+class NewsSearchResponse(NewsResponse):
+    """检索结果响应模型"""
+    snippet: Optional[str] = None
+
+
+class NewsContentResponse(NewsResponse):
+    """新闻全文响应模型"""
+    content: Optional[str] = None
+
+
+class NewsFeedResponse(BaseModel):
+    """游标分页响应模型"""
+    items: List[NewsResponse]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+def _news_select():
+    """
+    新闻列表查询：一次联表读取响应所需的列（不读取正文 content）
+    """
+    return select(
+        News.id,
+        News.title,
+        News.title_translated,
+        News.summary,
+        News.summary_translated,
+        News.url,
+        News.image_url,
+        NewsSource.name.label("source_name"),
+        NewsCategory.name.label("category_name"),
+        News.published_at,
+        News.importance_score,
+        News.is_featured,
+    ).join(
+        NewsSource, News.source_id == NewsSource.id
+    ).outerjoin(
+        NewsCategory, News.category_id == NewsCategory.id
+    )
+
+
+def _apply_filters(
+    query,
     category: Optional[str] = None,
     source: Optional[str] = None,
     featured: Optional[bool] = None,
-    days: Optional[int] = Query(None, ge=1, le=30),
-    min_score: Optional[float] = Query(None, ge=0.0, le=1.0),
-    db: Session = Depends(get_db)
+    days: Optional[int] = None,
+    min_score: Optional[float] = None
 ):
-    """获取新闻列表"""
-    query = db.query(News)
-    
+    """应用列表筛选条件"""
     # 分类筛选
     if category:
-        category_obj = db.query(NewsCategory).filter(NewsCategory.name == category).first()
-        if category_obj:
-            query = query.filter(News.category_id == category_obj.id)
+        query = query.where(NewsCategory.name == category)
     
     # 来源筛选
     if source:
-        from src.models.news import NewsSource
-        source_obj = db.query(NewsSource).filter(NewsSource.name == source).first()
-        if source_obj:
-            query = query.filter(News.source_id == source_obj.id)
+        query = query.where(NewsSource.name == source)
     
     # 精选筛选
     if featured is not None:
-        query = query.filter(News.is_featured == featured)
+        query = query.where(News.is_featured == featured)
     
     # 时间范围筛选
     if days:
         start_date = datetime.utcnow() - timedelta(days=days)
-        query = query.filter(News.published_at >= start_date)
+        query = query.where(News.published_at >= start_date)
     
     # 最低评分筛选
     if min_score is not None:
-        query = query.filter(News.importance_score >= min_score)
+        query = query.where(News.importance_score >= min_score)
+    
+    return query
+
+
+def _like_any_column(term: str, columns=FTS_COLUMNS):
+    """检索词出现在任一列中（LIKE，不区分大小写）"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return or_(*[
+        getattr(News, column).ilike(f"%{escaped}%", escape="\\") for column in columns
+    ])
+
+
+def _encode_cursor(row) -> str:
+    """将排序键（published_at, importance_score, id）编码为不透明游标"""
+    key = [row.published_at.isoformat(), row.importance_score, row.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, float, int]:
+    """解析游标，格式错误时返回400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, importance_score, news_id = json.loads(base64.urlsafe_b64decode(padded))
+        importance_score = float(importance_score)
+        if not math.isfinite(importance_score):
+            raise ValueError(f"importance_score 不是有限数: {importance_score}")
+        return datetime.fromisoformat(published_at), importance_score, int(news_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"无效的游标: {e}")
+
+
+@router.get("/", response_model=List[NewsResponse])
+@cached_response
+async def get_news(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    featured: Optional[bool] = None,
+    days: Optional[int] = Query(None, ge=1, le=30),
+    min_score: Optional[float] = Query(None, ge=0.0, le=1.0),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """获取新闻列表（页码分页，深度翻页请使用 /feed）"""
+    query = _apply_filters(_news_select(), category, source, featured, days, min_score)
     
     # 排序和分页
-    query = query.order_by(desc(News.published_at), desc(News.importance_score))
-    total = query.count()
-    news_list = query.offset((page - 1) * page_size).limit(page_size).all()
+    query = query.order_by(desc(News.published_at), desc(News.importance_score), desc(News.id))
+    rows = (await db.execute(query.offset((page - 1) * page_size).limit(page_size))).all()
     
     # 转换为响应模型
-    result = []
-    for news in news_list:
-        result.append(NewsResponse(
-            id=news.id,
-            title=news.title,
-            title_translated=getattr(news, 'title_translated', None),
-            summary=news.summary,
-            summary_translated=getattr(news, 'summary_translated', None),
-            url=news.url,
-            image_url=news.image_url,
-            source_name=news.source.name,
-            category_name=news.category.name if news.category else None,
-            published_at=news.published_at,
-            importance_score=news.importance_score,
-            is_featured=news.is_featured
-        ))
-    
-    return result
+    return [NewsResponse(**row._mapping) for row in rows]
+
+
+@router.get("/feed", response_model=NewsFeedResponse)
+@cached_response
+async def get_news_feed(
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=100),
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    featured: Optional[bool] = None,
+    days: Optional[int] = Query(None, ge=1, le=30),
+    min_score: Optional[float] = Query(None, ge=0.0, le=1.0),
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    获取新闻列表（游标分页）
+    
+    按（published_at, importance_score, id）倒序，从上一页返回的 next_cursor 之后继续读取，
+    翻页深度不影响查询耗时。total 仅在 include_total=true 时计算。
+    """
+    query = _apply_filters(_news_select(), category, source, featured, days, min_score)
+    
+    total = None
+    if include_total:
+        total = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+    
+    sort_key = tuple_(News.published_at, News.importance_score, News.id)
+    if cursor:
+        query = query.where(sort_key < tuple_(*_decode_cursor(cursor)))
+    
+    # 多读一条判断是否还有下一页
+    rows = (await db.execute(query.order_by(
+        desc(News.published_at), desc(News.importance_score), desc(News.id)
+    ).limit(page_size + 1))).all()
+    
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    
+    return NewsFeedResponse(
+        items=[NewsResponse(**row._mapping) for row in rows],
+        next_cursor=_encode_cursor(rows[-1]) if has_more else None,
+        total=total
+    )
+
+
+@router.get("/search", response_model=List[NewsSearchResponse])
+@cached_response
+async def search_news(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    days: Optional[int] = Query(None, ge=1, le=30),
+    min_score: Optional[float] = Query(None, ge=0.0, le=1.0),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    全文检索新闻（标题、摘要、正文及其中文翻译）
+    
+    多个检索词以空格分隔，需全部命中。SQLite下使用FTS5索引并按BM25相关度排序；
+    少于3个字符的检索词（如两个字的中文词）无法使用trigram索引，与其他数据库一样在所有检索列中LIKE匹配，
+    结果按发布时间排序。
+    """
+    fts_terms, like_terms = split_search_terms(q)
+    query = _apply_filters(_news_select(), category, source, None, days, min_score)
+    # 短检索词同样匹配正文，结果与长检索词一致。代价是扫描：与长检索词同时使用时只过滤全文索引命中的新闻；
+    # 单独使用时逐行匹配（正文是最后一列，标题或摘要已命中时不再读取正文），可用 days 缩小范围
+    for term in like_terms:
+        query = query.where(_like_any_column(term))
+    
+    if fts_terms and db.bind.dialect.name == "sqlite":
+        match = build_match_expression(fts_terms)
+        ranked = fts_ranked_subquery(match)
+        try:
+            rows = (await db.execute(query.join(ranked, ranked.c.id == News.id).order_by(
+                ranked.c.rank, desc(News.published_at)
+            ).offset((page - 1) * page_size).limit(page_size))).all()
+            snippets = await fetch_snippets(db, match, [row.id for row in rows])
+            return [NewsSearchResponse(**row._mapping, snippet=snippets.get(row.id)) for row in rows]
+        except OperationalError as e:
+            # 全文检索表不存在（如SQLite版本不支持trigram），退回LIKE
+            await db.rollback()
+            logger.warning(f"全文检索失败，改用LIKE匹配: {e}")
+    
+    for term in fts_terms:
+        query = query.where(_like_any_column(term))
+    rows = (await db.execute(query.order_by(
+        desc(News.published_at), desc(News.importance_score), desc(News.id)
+    ).offset((page - 1) * page_size).limit(page_size))).all()
+    return [NewsSearchResponse(**row._mapping) for row in rows]
 
 
 @router.get("/{news_id}", response_model=NewsResponse)
-def get_news_detail(news_id: int, db: Session = Depends(get_db)):
+async def get_news_detail(news_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """获取新闻详情"""
-    news = db.query(News).filter(News.id == news_id).first()
-    if not news:
-        from fastapi import HTTPException
+    row = (await db.execute(_news_select().where(News.id == news_id))).first()
+    if not row:
         raise HTTPException(status_code=404, detail="新闻不存在")
     
-    return NewsResponse(
-        id=news.id,
-        title=news.title,
-        title_translated=getattr(news, 'title_translated', None),
-        summary=news.summary,
-        summary_translated=getattr(news, 'summary_translated', None),
-        url=news.url,
-        image_url=news.image_url,
-        source_name=news.source.name,
-        category_name=news.category.name if news.category else None,
-        published_at=news.published_at,
-        importance_score=news.importance_score,
-        is_featured=news.is_featured
-    )
+    return NewsResponse(**row._mapping)
+
+
+@router.get("/{news_id}/content", response_model=NewsContentResponse)
+async def get_news_content(news_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """获取新闻全文（正文只由该接口读取）"""
+    row = (await db.execute(_news_select().add_columns(News.content).where(News.id == news_id))).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="新闻不存在")
+    
+    return NewsContentResponse(**row._mapping)
 
 
 @router.get("/categories/list")
-def get_categories(db: Session = Depends(get_db)):
+@cached_response
+async def get_categories(db: AsyncSession = Depends(get_async_read_db)):
     """获取所有分类"""
-    categories = db.query(NewsCategory).all()
-    return [{"id": cat.id, "name": cat.name} for cat in categories]
+    categories = (await db.execute(select(NewsCategory.id, NewsCategory.name))).all()
+    return [{"id": cat_id, "name": name} for cat_id, name in categories]
 
 
 @router.get("/sources/list")
-def get_sources(db: Session = Depends(get_db)):
+@cached_response
+async def get_sources(db: AsyncSession = Depends(get_async_read_db)):
     """获取所有来源"""
-    from src.models.news import NewsSource
-    sources = db.query(NewsSource).filter(NewsSource.enabled == True).all()
-    return [{"id": src.id, "name": src.name, "type": src.source_type} for src in sources]
+    sources = (await db.execute(
+        select(NewsSource.id, NewsSource.name, NewsSource.source_type).where(NewsSource.enabled == True)
+    )).all()
+    return [{"id": source_id, "name": name, "type": source_type} for source_id, name, source_type in sources]
 
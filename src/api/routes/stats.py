@@ -3,27 +3,32 @@
 """
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, case, select
 
-from src.database import get_db
-from src.models.news import News, NewsCategory
+from src.database import get_async_read_db
+from src.utils.cache import cached_response
+from src.models.news import News, NewsCategory, NewsSource, NewsDailyStat
 
 router = APIRouter()
 
 
 @router.get("/overview")
-def get_overview(db: Session = Depends(get_db)):
-    """获取概览统计"""
-    total_news = db.query(News).count()
-    today_news = db.query(News).filter(
-        func.date(News.published_at) == func.date(func.now())
-    ).count()
+@cached_response
+async def get_overview(db: AsyncSession = Depends(get_async_read_db)):
+    """获取概览统计（读取每日统计汇总）"""
+    # 按UTC日期汇总，近7天为含今天在内的7个自然日
+    today = datetime.utcnow().date()
+    week_start = today - timedelta(days=6)
     
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    week_news = db.query(News).filter(News.published_at >= week_ago).count()
+    total_news, score_sum, today_news, week_news = (await db.execute(select(
+        func.coalesce(func.sum(NewsDailyStat.news_count), 0),
+        func.coalesce(func.sum(NewsDailyStat.score_sum), 0.0),
+        func.coalesce(func.sum(case((NewsDailyStat.day == today, NewsDailyStat.news_count), else_=0)), 0),
+        func.coalesce(func.sum(case((NewsDailyStat.day >= week_start, NewsDailyStat.news_count), else_=0)), 0),
+    ))).one()
     
-    avg_score = db.query(func.avg(News.importance_score)).scalar() or 0.0
+    avg_score = score_sum / total_news if total_news else 0.0
     
     return {
         "total_news": total_news,
@@ -34,43 +39,44 @@ def get_overview(db: Session = Depends(get_db)):
 
 
 @router.get("/by-category")
-def get_stats_by_category(db: Session = Depends(get_db)):
-    """按分类统计"""
-    stats = db.query(
-        NewsCategory.name,
-        func.count(News.id).label("count")
-    ).join(
-        News, News.category_id == NewsCategory.id, isouter=True
-    ).group_by(NewsCategory.name).all()
+@cached_response
+async def get_stats_by_category(db: AsyncSession = Depends(get_async_read_db)):
+    """按分类统计（读取每日统计汇总）"""
+    counts = dict((await db.execute(select(
+        NewsDailyStat.category_id,
+        func.sum(NewsDailyStat.news_count)
+    ).group_by(NewsDailyStat.category_id))).all())
     
-    return [{"category": name, "count": count} for name, count in stats]
+    categories = (await db.execute(select(NewsCategory.id, NewsCategory.name))).all()
+    return [{"category": name, "count": counts.get(cat_id, 0)} for cat_id, name in categories]
 
 
 @router.get("/by-source")
-def get_stats_by_source(db: Session = Depends(get_db)):
-    """按来源统计"""
-    from src.models.news import NewsSource
+@cached_response
+async def get_stats_by_source(db: AsyncSession = Depends(get_async_read_db)):
+    """按来源统计（读取每日统计汇总）"""
+    counts = dict((await db.execute(select(
+        NewsDailyStat.source_id,
+        func.sum(NewsDailyStat.news_count)
+    ).group_by(NewsDailyStat.source_id))).all())
     
-    stats = db.query(
-        NewsSource.name,
-        func.count(News.id).label("count")
-    ).join(
-        News, News.source_id == NewsSource.id, isouter=True
-    ).group_by(NewsSource.name).all()
-    
-    return [{"source": name, "count": count} for name, count in stats]
+    sources = (await db.execute(select(NewsSource.id, NewsSource.name))).all()
+    return [{"source": name, "count": counts.get(source_id, 0)} for source_id, name in sources]
 
 
 @router.get("/trending")
-def get_trending(days: int = 7, limit: int = 10, db: Session = Depends(get_db)):
+@cached_response
+async def get_trending(days: int = 7, limit: int = 10, db: AsyncSession = Depends(get_async_read_db)):
     """获取热门新闻（按评分）"""
     start_date = datetime.utcnow() - timedelta(days=days)
     
-    news_list = db.query(News).filter(
+    news_list = (await db.execute(select(
+        News.id, News.title, News.importance_score, News.url, News.published_at
+    ).where(
         News.published_at >= start_date
     ).order_by(
         desc(News.importance_score)
-    ).limit(limit).all()
+    ).limit(limit))).all()
     
     return [{
         "id": news.id,
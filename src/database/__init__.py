@@ -1,4 +1,16 @@
-from .connection import get_db, init_db, engine, Base, SessionLocal
-
-__all__ = ["get_db", "init_db", "engine", "Base", "SessionLocal"]
+from .connection import (
+    get_db, init_db, migrate_db, engine, Base, SessionLocal,
+    get_async_db, get_async_read_db, async_engine, async_read_engine, AsyncSessionLocal, AsyncReadSessionLocal,
+)
+from .bulk import insert_ignore_conflicts
+from .rollup import add_to_daily_stats, remove_from_daily_stats, rebuild_daily_stats
+from .featured import refresh_featured
+from .data_version import read_data_version, read_data_version_async
 
+__all__ = [
+    "get_db", "init_db", "migrate_db", "engine", "Base", "SessionLocal", "insert_ignore_conflicts",
+    "get_async_db", "get_async_read_db", "async_engine", "async_read_engine",
+    "AsyncSessionLocal", "AsyncReadSessionLocal",
+    "add_to_daily_stats", "remove_from_daily_stats", "rebuild_daily_stats", "refresh_featured",
+    "read_data_version", "read_data_version_async",
+]
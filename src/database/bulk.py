@@ -0,0 +1,66 @@
+"""
+批量写入
+"""
+from typing import List, Dict, Sequence
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def dialect_insert(db: Session, model):
+    """按数据库方言返回支持 ON CONFLICT 的 insert 构造器（其他数据库返回通用 insert）"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    return insert(model)
+
+
+def insert_ignore_conflicts(db: Session, model, rows: List[Dict],
+                            conflict_columns: Sequence[str] = ("url",)) -> List[int]:
+    """
+    批量插入，唯一约束冲突的行直接跳过
+
+    SQLite / PostgreSQL 使用 INSERT ... ON CONFLICT DO NOTHING RETURNING 一次写入（不使用 SAVEPOINT，
+    失败时直接抛出，由调用方回滚）；其他数据库（如MySQL，不支持RETURNING）逐行在 SAVEPOINT 中插入，
+    唯一约束冲突的行跳过，其他错误直接抛出。调用方负责提交或回滚事务。
+
+    注意：pysqlite 默认不在事务外发出 BEGIN，最外层 SAVEPOINT 的 RELEASE 会直接提交，
+    SQLite 引擎需要通过 connection.enable_sqlite_savepoints 显式开启事务后才能使用 SAVEPOINT。
+
+    Args:
+        db: 数据库会话
+        model: ORM模型
+        rows: 待插入的行（所有行的字段需一致）
+        conflict_columns: 唯一约束列
+
+    Returns:
+        List[int]: 实际插入的行的主键
+    """
+    if not rows:
+        return []
+
+    primary_key = model.__table__.primary_key.columns.values()[0]
+    stmt = dialect_insert(db, model)
+
+    if hasattr(stmt, "on_conflict_do_nothing"):
+        result = db.execute(
+            stmt.on_conflict_do_nothing(index_elements=list(conflict_columns)).returning(primary_key),
+            rows
+        )
+        return [row[0] for row in result]
+
+    inserted_ids = []
+    for row in rows:
+        try:
+            with db.begin_nested():
+                result = db.execute(insert(model).values(row))
+                inserted_ids.append(result.inserted_primary_key[0])
+        except IntegrityError as e:
+            logger.debug(f"跳过唯一约束冲突的行: {e}")
+    return inserted_ids
@@ -2,9 +2,12 @@
 数据库连接和初始化
 """
 import os
-from sqlalchemy import create_engine
+from typing import AsyncIterator, Optional
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,21 +15,143 @@ load_dotenv()
 # 数据库URL
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./ainews.db")
 
-# 创建引擎
-if DATABASE_URL.startswith("sqlite"):
-    # SQLite需要特殊配置
+# SQLite连接参数（文件数据库生效，内存数据库保持单连接）
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),  # WAL模式下读不阻塞写，写不阻塞读
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),  # WAL下NORMAL不会损坏数据库，只可能丢失最后的事务
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE_MB", "256")) * 1024 * 1024,
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": "MEMORY",
+}
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "10"))
+# 页缓存（KB）：每个写连接的大小；只读连接池的总大小按连接数上限平均分配（读取主要依赖mmap）
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "16384"))
+SQLITE_READ_CACHE_SIZE_KB = int(os.getenv("SQLITE_READ_CACHE_SIZE_KB", "65536"))
+
+
+def is_sqlite_file(database_url: str) -> bool:
+    """是否为SQLite文件数据库（内存数据库不能使用连接池和WAL）"""
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def set_sqlite_pragmas(target_engine, read_only: bool = False, cache_size_kb: int = SQLITE_CACHE_SIZE_KB):
+    """每个新连接建立时设置SQLite参数；只读连接禁止写入"""
+    @event.listens_for(target_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.execute(f"PRAGMA cache_size={-max(1, cache_size_kb)}")  # 负数表示KB
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+def enable_sqlite_savepoints(target_engine):
+    """
+    由SQLAlchemy发出BEGIN，而不是依赖pysqlite的隐式事务
+
+    pysqlite 只在DML语句前隐式开启事务，在事务外执行的 SAVEPOINT 会成为最外层事务，
+    RELEASE 时直接提交，之后的 rollback() 不再生效。关闭驱动的事务管理并在事务开始时
+    显式发出 BEGIN（SQLAlchemy文档中的 pysqlite 处理方式），SAVEPOINT 才是真正的嵌套事务。
+    """
+    @event.listens_for(target_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(target_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+# 创建引擎（写连接：爬虫、增强任务和管理接口使用）
+# SQLite文件数据库只有一个写连接：写入在连接池中排队，而不是在多个连接间争用写锁；
+# 同一线程不能同时持有两个会话的事务（第二个会话会一直等待连接）
+if is_sqlite_file(DATABASE_URL):
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=1,
+        max_overflow=0,
+        echo=False
+    )
+    set_sqlite_pragmas(engine)
+    enable_sqlite_savepoints(engine)
+elif DATABASE_URL.startswith("sqlite"):
+    # 内存数据库需要共享同一个连接
     engine = create_engine(
         DATABASE_URL,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
         echo=False
     )
+    enable_sqlite_savepoints(engine)
 else:
     engine = create_engine(DATABASE_URL, echo=False)
 
 # 创建会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 异步驱动（API路由使用）
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def get_async_database_url(database_url: str) -> Optional[str]:
+    """将同步数据库URL转换为对应的异步驱动URL（sqlite -> aiosqlite，postgresql -> asyncpg），不支持时返回None"""
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        return None
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or get_async_database_url(DATABASE_URL)
+
+# 创建异步引擎（连接池，每个请求使用独立连接，不占用线程池）
+# SQLite文件数据库：读写连接分离，只读连接池供新闻和统计接口使用，单个写连接供管理接口使用
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+if ASYNC_DATABASE_URL:
+    if is_sqlite_file(ASYNC_DATABASE_URL):
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            echo=False
+        )
+        set_sqlite_pragmas(async_engine.sync_engine)
+        enable_sqlite_savepoints(async_engine.sync_engine)
+        
+        async_read_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=SQLITE_READ_POOL_SIZE,
+            max_overflow=SQLITE_READ_POOL_SIZE,
+            echo=False
+        )
+        set_sqlite_pragmas(
+            async_read_engine.sync_engine, read_only=True,
+            cache_size_kb=SQLITE_READ_CACHE_SIZE_KB // (2 * max(1, SQLITE_READ_POOL_SIZE))
+        )
+    elif ASYNC_DATABASE_URL.startswith("sqlite"):
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False)
+    else:
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True, echo=False)
+    
+    # 创建异步会话工厂
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+    AsyncReadSessionLocal = async_sessionmaker(
+        async_read_engine or async_engine, expire_on_commit=False, autoflush=False
+    )
+
 # 导入Base（需要在导入模型后）
 from src.models.news import Base
 
@@ -40,9 +165,67 @@ def get_db() -> Session:
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """获取异步数据库会话（需要写入的API路由使用）"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("当前数据库没有可用的异步驱动，请设置 ASYNC_DATABASE_URL")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    """获取只读异步数据库会话（查询类API路由使用，SQLite下不与写连接争用）"""
+    if AsyncReadSessionLocal is None:
+        raise RuntimeError("当前数据库没有可用的异步驱动，请设置 ASYNC_DATABASE_URL")
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+def migrate_db():
+    """创建缺失的表，并为已存在的表补齐新增的列和索引（create_all不会修改已存在的表）"""
+    had_daily_stats = inspect(engine).has_table("news_daily_stats")
+    Base.metadata.create_all(bind=engine)
+    
+    added_columns = set()
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                added_columns.add((table.name, column.name))
+            
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        
+        # 新增的增量抓取水位按已入库的新闻初始化（避免升级后每个源都重新读取全部条目）
+        if ("news_sources", "last_published_at") in added_columns:
+            from sqlalchemy import func, select, update
+            from src.models.news import News, NewsSource
+            conn.execute(update(NewsSource).values(last_published_at=select(
+                func.max(News.published_at)
+            ).where(News.source_id == NewsSource.id).scalar_subquery()))
+    
+    # 全文检索索引（仅SQLite）
+    from src.database.fts import setup_fts
+    setup_fts(engine)
+    
+    # 新建的每日统计表需要根据已有新闻回填
+    if not had_daily_stats:
+        from src.database.rollup import rebuild_daily_stats
+        db = SessionLocal()
+        try:
+            rebuild_daily_stats(db)
+        finally:
+            db.close()
+
+
 def init_db():
     """初始化数据库（创建表）"""
-    Base.metadata.create_all(bind=engine)
+    migrate_db()
     print("数据库初始化完成！")
 
 
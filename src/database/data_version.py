@@ -0,0 +1,67 @@
+"""
+数据版本（跨进程的响应缓存失效）
+
+爬虫、增强任务和管理接口可能运行在不同进程中，进程内的缓存清空无法通知其他进程。
+会话执行了写入（ORM flush 或 insert/update/delete 语句）时，在提交前将 data_version 表中的版本加一，
+与写入在同一事务中提交；API进程每次查询缓存前读取版本，变化后清空缓存。
+"""
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from src.models.news import DataVersion
+
+_CHANGED = "data_changed"
+
+
+@event.listens_for(Session, "before_flush")
+def _mark_flush(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        session.info[_CHANGED] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_CHANGED] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_version(session):
+    # flush 在 before_commit 之后执行，先手动 flush 以便记录其中的写入
+    session.flush()
+    if not session.info.pop(_CHANGED, False):
+        return
+    # 直接在连接上执行，不再触发会话事件
+    connection = session.connection()
+    result = connection.execute(
+        update(DataVersion).where(DataVersion.id == 1).values(version=DataVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(DataVersion).values(id=1, version=1))
+        except IntegrityError:
+            connection.execute(
+                update(DataVersion).where(DataVersion.id == 1).values(version=DataVersion.version + 1)
+            )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_mark(session, transaction):
+    # 最外层事务结束（回滚）时丢弃标记；SAVEPOINT 回滚不影响外层事务中已有的写入
+    if transaction.parent is None:
+        session.info.pop(_CHANGED, None)
+
+
+_VERSION_QUERY = select(DataVersion.version).where(DataVersion.id == 1)
+
+
+def read_data_version(db: Session) -> int:
+    """当前数据版本（尚未有写入时为0）"""
+    return db.execute(_VERSION_QUERY).scalar() or 0
+
+
+async def read_data_version_async(db: AsyncSession) -> int:
+    """当前数据版本（异步会话）"""
+    return (await db.execute(_VERSION_QUERY)).scalar() or 0
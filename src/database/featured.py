@@ -0,0 +1,53 @@
+"""
+精选新闻标记（在数据库中按评分排名一次更新）
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+from src.models.news import News
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def refresh_featured(db: Session, percentile: float = 0.1, window_days: int = 7) -> int:
+    """
+    重新计算精选新闻（调用方负责提交事务）
+
+    最近 window_days 天内按评分排名前 percentile 的新闻标记为精选（至少1条），其余新闻（包括已移出窗口的）
+    取消精选。排名用窗口函数在数据库中完成，只执行一条 UPDATE。
+
+    Args:
+        db: 数据库会话
+        percentile: 精选比例（0-1）
+        window_days: 统计窗口（天）
+
+    Returns:
+        int: 更新的行数
+    """
+    since = datetime.utcnow() - timedelta(days=window_days)
+
+    ranked = select(
+        News.id,
+        func.row_number().over(
+            order_by=(func.coalesce(News.importance_score, 0.0).desc(), News.id.desc())
+        ).label("position"),
+        func.count().over().label("total"),
+    ).where(News.published_at >= since).subquery("ranked")
+
+    top_ids = select(ranked.c.id).where(or_(
+        ranked.c.position == 1,
+        ranked.c.position <= ranked.c.total * percentile
+    ))
+
+    # 只更新可能变化的行：当前精选的（包括窗口外的）和窗口内新进入前列的
+    is_top = News.id.in_(top_ids)
+    result = db.execute(
+        update(News)
+        .where(or_(News.is_featured == True, and_(News.published_at >= since, is_top)))
+        .values(is_featured=is_top)
+        .execution_options(synchronize_session=False)
+    )
+
+    logger.info(f"精选新闻已重新计算：最近{window_days}天评分前{percentile:.0%}，更新 {result.rowcount} 行")
+    return result.rowcount
@@ -0,0 +1,121 @@
+"""
+全文检索（SQLite FTS5）
+
+news_fts 为外部内容表（content='news'），正文只在 news 表中保存一份，由触发器保持同步。
+使用 trigram 分词器，按三字符子串建立索引，中文无需分词也能检索；
+少于3个字符的检索词（如两个字的中文词）无法使用索引，由调用方在同样的列（包括正文）中改用 LIKE 匹配。
+没有另建二元分词索引：触发器中无法切分二元组，索引也会再增加一份正文大小的存储；
+代价是只有短检索词时需要逐行扫描。
+"""
+import html
+import re
+from typing import Dict, List, Sequence, Tuple
+from sqlalchemy import Float, Integer, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FTS_TABLE = "news_fts"
+
+# snippet() 的命中标记（控制字符，不受HTML转义影响，转义后再替换为 <mark>）
+SNIPPET_OPEN = "\x02"
+SNIPPET_CLOSE = "\x03"
+
+# 检索的列及其BM25权重（标题 > 摘要 > 正文）
+FTS_COLUMNS = ("title", "title_translated", "summary", "summary_translated", "content")
+FTS_WEIGHTS = (10.0, 10.0, 5.0, 5.0, 1.0)
+
+# trigram 分词器能索引的最短检索词
+MIN_TERM_LENGTH = 3
+
+_COLUMNS_SQL = ", ".join(FTS_COLUMNS)
+_NEW_VALUES_SQL = ", ".join(f"new.{column}" for column in FTS_COLUMNS)
+_OLD_VALUES_SQL = ", ".join(f"old.{column}" for column in FTS_COLUMNS)
+
+_SETUP_STATEMENTS = (
+    f"""CREATE TRIGGER IF NOT EXISTS news_fts_ai AFTER INSERT ON news BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS_SQL}) VALUES (new.id, {_NEW_VALUES_SQL});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS news_fts_ad AFTER DELETE ON news BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS_SQL}) VALUES ('delete', old.id, {_OLD_VALUES_SQL});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS news_fts_au AFTER UPDATE OF {_COLUMNS_SQL} ON news BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS_SQL}) VALUES ('delete', old.id, {_OLD_VALUES_SQL});
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS_SQL}) VALUES (new.id, {_NEW_VALUES_SQL});
+    END""",
+)
+
+
+def setup_fts(engine: Engine):
+    """创建全文检索表和同步触发器（仅SQLite；新建时根据已有新闻重建索引）"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+            ).first() is not None
+
+            if not exists:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                    f"{_COLUMNS_SQL}, content='news', content_rowid='id', tokenize='trigram')"
+                ))
+            for statement in _SETUP_STATEMENTS:
+                conn.execute(text(statement))
+            if not exists:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+                logger.info("全文检索索引已创建")
+    except OperationalError as e:
+        # SQLite 3.34 之前没有 trigram 分词器，检索退回 LIKE
+        logger.warning(f"创建全文检索索引失败，检索将使用LIKE匹配: {e}")
+
+
+def split_search_terms(query: str) -> Tuple[List[str], List[str]]:
+    """
+    拆分检索词
+
+    Returns:
+        (可用全文索引的检索词, 少于3个字符需使用LIKE的检索词)
+    """
+    terms = [term for term in re.split(r"\s+", query.strip()) if term]
+    return (
+        [term for term in terms if len(term) >= MIN_TERM_LENGTH],
+        [term for term in terms if len(term) < MIN_TERM_LENGTH],
+    )
+
+
+def build_match_expression(terms: Sequence[str]) -> str:
+    """构建FTS5 MATCH表达式（每个检索词作为短语，全部命中）"""
+    return " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def fts_ranked_subquery(match: str):
+    """命中新闻的ID和BM25得分（得分越小越相关）"""
+    weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+    return text(
+        f"SELECT rowid AS id, bm25({FTS_TABLE}, {weights}) AS rank "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+    ).bindparams(match=match).columns(id=Integer, rank=Float).subquery("fts")
+
+
+def _snippet_html(snippet: str) -> str:
+    """将 snippet() 的结果转为HTML：原文转义后再把命中标记替换为 <mark>"""
+    return html.escape(snippet).replace(SNIPPET_OPEN, "<mark>").replace(SNIPPET_CLOSE, "</mark>")
+
+
+async def fetch_snippets(db: AsyncSession, match: str, news_ids: Sequence[int], tokens: int = 24) -> Dict[int, str]:
+    """读取指定新闻的检索摘要片段（HTML：原文已转义，命中部分用 <mark> 标记）"""
+    if not news_ids:
+        return {}
+
+    ids = ", ".join(str(int(news_id)) for news_id in news_ids)
+    rows = await db.execute(text(
+        f"SELECT rowid, snippet({FTS_TABLE}, -1, :open, :close, '…', :tokens) "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match AND rowid IN ({ids})"
+    ), {"match": match, "tokens": tokens, "open": SNIPPET_OPEN, "close": SNIPPET_CLOSE})
+    return {news_id: _snippet_html(snippet) for news_id, snippet in rows if snippet is not None}
@@ -0,0 +1,115 @@
+"""
+每日统计汇总（news_daily_stats）的增量维护
+"""
+from typing import List, Dict, Sequence, Tuple
+from sqlalchemy.orm import Session
+from src.database.bulk import dialect_insert
+from src.models.news import News, NewsDailyStat
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+StatKey = Tuple  # (day, source_id, category_id)
+
+
+def _accumulate(deltas: Dict[StatKey, List], rows, sign: int):
+    """按（日期，来源，分类）累计数量和评分"""
+    for published_at, source_id, category_id, importance_score in rows:
+        delta = deltas.setdefault((published_at.date(), source_id, category_id or 0), [0, 0.0])
+        delta[0] += sign
+        delta[1] += sign * (importance_score or 0.0)
+
+
+def _collect_deltas(db: Session, news_ids: Sequence[int], sign: int, chunk_size: int = 500) -> List[Dict]:
+    """读取指定新闻当前的统计维度，生成增量"""
+    deltas: Dict[StatKey, List] = {}
+    news_ids = list(news_ids)
+    for i in range(0, len(news_ids), chunk_size):
+        rows = db.query(
+            News.published_at, News.source_id, News.category_id, News.importance_score
+        ).filter(News.id.in_(news_ids[i:i + chunk_size]))
+        _accumulate(deltas, rows, sign)
+
+    return [{
+        "day": day,
+        "source_id": source_id,
+        "category_id": category_id,
+        "news_count": count,
+        "score_sum": score_sum,
+    } for (day, source_id, category_id), (count, score_sum) in deltas.items()]
+
+
+def _apply_deltas(db: Session, deltas: List[Dict]):
+    """将增量累加到汇总表（SQLite / PostgreSQL 使用 INSERT ... ON CONFLICT DO UPDATE）"""
+    if not deltas:
+        return
+
+    stmt = dialect_insert(db, NewsDailyStat)
+    if hasattr(stmt, "on_conflict_do_update"):
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["day", "source_id", "category_id"],
+            set_={
+                "news_count": NewsDailyStat.news_count + stmt.excluded.news_count,
+                "score_sum": NewsDailyStat.score_sum + stmt.excluded.score_sum,
+            }
+        ), deltas)
+        return
+
+    for delta in deltas:
+        stat = db.get(NewsDailyStat, (delta["day"], delta["source_id"], delta["category_id"]))
+        if stat is None:
+            db.add(NewsDailyStat(**delta))
+        else:
+            stat.news_count += delta["news_count"]
+            stat.score_sum += delta["score_sum"]
+    db.flush()
+
+
+def add_to_daily_stats(db: Session, news_ids: Sequence[int]):
+    """
+    将新闻计入每日统计（写入新闻后、更新分类或评分后调用，调用方负责提交事务）
+
+    Args:
+        db: 数据库会话
+        news_ids: 新闻ID
+    """
+    _apply_deltas(db, _collect_deltas(db, news_ids, sign=1))
+
+
+def remove_from_daily_stats(db: Session, news_ids: Sequence[int]):
+    """
+    从每日统计中扣除新闻（更新分类或评分前调用，调用方负责提交事务）
+
+    Args:
+        db: 数据库会话
+        news_ids: 新闻ID
+    """
+    _apply_deltas(db, _collect_deltas(db, news_ids, sign=-1))
+    db.query(NewsDailyStat).filter(NewsDailyStat.news_count <= 0).delete(synchronize_session=False)
+
+
+def rebuild_daily_stats(db: Session, batch_size: int = 10000) -> int:
+    """
+    根据新闻表重建每日统计（首次创建汇总表或数据不一致时使用）
+
+    Returns:
+        int: 汇总行数
+    """
+    deltas: Dict[StatKey, List] = {}
+    rows = db.query(
+        News.published_at, News.source_id, News.category_id, News.importance_score
+    ).yield_per(batch_size)
+    _accumulate(deltas, rows, sign=1)
+
+    db.query(NewsDailyStat).delete(synchronize_session=False)
+    db.bulk_insert_mappings(NewsDailyStat, [{
+        "day": day,
+        "source_id": source_id,
+        "category_id": category_id,
+        "news_count": count,
+        "score_sum": score_sum,
+    } for (day, source_id, category_id), (count, score_sum) in deltas.items()])
+    db.commit()
+
+    logger.info(f"每日统计重建完成：{len(deltas)} 行")
+    return len(deltas)
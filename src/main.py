@@ -8,9 +8,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
-from src.database import init_db
+from src.database import init_db, async_engine, async_read_engine
 from src.api import api_router
 from src.scheduler import setup_scheduler
+from src.scrapers.parsing import shutdown_parsing
 from src.utils.logger import get_logger, setup_logger
 
 # 初始化日志
@@ -61,6 +62,14 @@ async def startup_event():
 async def shutdown_event():
     """关闭事件"""
     logger.info("AI News 应用关闭中...")
+    
+    # 关闭异步连接池
+    for db_engine in (async_read_engine, async_engine):
+        if db_engine is not None:
+            await db_engine.dispose()
+    
+    # 关闭HTML解析进程池
+    shutdown_parsing()
 
 
 @app.get("/")
@@ -1,4 +1,3 @@
-from .news import News, NewsSource, NewsCategory
-
-__all__ = ["News", "NewsSource", "NewsCategory"]
+from .news import News, NewsSource, NewsCategory, NewsDailyStat, DataVersion
 
+__all__ = ["News", "NewsSource", "NewsCategory", "NewsDailyStat", "DataVersion"]
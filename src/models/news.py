@@ -3,9 +3,9 @@
 """
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Text, Float, Date, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 Base = declarative_base()
 
@@ -19,6 +19,16 @@ class NewsSource(Base):
     url = Column(String(500), nullable=False, comment="来源URL")
     source_type = Column(String(50), nullable=False, comment="来源类型：rss/web/api")
     enabled = Column(Boolean, default=True, comment="是否启用")
+    
+    # 条件请求缓存（RSS）
+    etag = Column(String(500), comment="上次响应的ETag")
+    last_modified = Column(String(100), comment="上次响应的Last-Modified")
+    content_hash = Column(String(64), comment="上次响应内容的SHA-256")
+    
+    # 增量抓取水位（已入库的条目不再进入去重和入库流程）
+    last_published_at = Column(DateTime, comment="已抓取到的最新发布时间")
+    seen_guids = Column(Text, comment="最近抓取过的条目标识（JSON数组，GUID或链接）")
+    
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -43,10 +53,12 @@ class News(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False, comment="标题")
     title_translated = Column(String(500), comment="标题中文翻译")
-    content = Column(Text, comment="正文内容")
+    # 正文长度不受限制，默认不随对象加载；需要时显式 undefer 或只查询该列（未加载时访问会抛出异常）
+    content = deferred(Column(Text, comment="正文内容"), raiseload=True)
     summary = Column(Text, comment="摘要")
     summary_translated = Column(Text, comment="摘要中文翻译")
     url = Column(String(1000), nullable=False, unique=True, comment="原文链接")
+    url_normalized = Column(String(1000), index=True, comment="规范化后的链接（用于去重）")
     image_url = Column(String(1000), comment="配图URL")
     
     # 外键
@@ -65,6 +77,7 @@ class News(Base):
     
     # 状态
     is_processed = Column(Boolean, default=False, comment="是否已处理")
+    enrich_attempts = Column(Integer, default=0, comment="增强处理失败次数（达到上限后不再重试）")
     is_duplicate = Column(Boolean, default=False, comment="是否重复")
     is_featured = Column(Boolean, default=False, index=True, comment="是否精选")
     
@@ -77,8 +90,32 @@ class News(Base):
         Index("idx_published_at", "published_at"),
         Index("idx_importance_score", "importance_score"),
         Index("idx_source_published", "source_id", "published_at"),
+        Index("idx_processed_id", "is_processed", "id"),
+        Index("idx_feed_order", "published_at", "importance_score", "id"),
     )
     
     def __repr__(self):
         return f"<News(id={self.id}, title='{self.title[:50]}...', score={self.importance_score})>"
 
+
+class NewsDailyStat(Base):
+    """新闻每日统计汇总（按发布日期、来源、分类累计，写入和增强新闻时增量维护）"""
+    __tablename__ = "news_daily_stats"
+    
+    day = Column(Date, primary_key=True, comment="发布日期（UTC）")
+    source_id = Column(Integer, primary_key=True, comment="来源ID")
+    category_id = Column(Integer, primary_key=True, default=0, comment="分类ID（0表示未分类）")
+    news_count = Column(Integer, nullable=False, default=0, comment="新闻数量")
+    score_sum = Column(Float, nullable=False, default=0.0, comment="重要性评分之和")
+    
+    def __repr__(self):
+        return f"<NewsDailyStat(day={self.day}, source_id={self.source_id}, category_id={self.category_id}, count={self.news_count})>"
+
+
+class DataVersion(Base):
+    """数据版本（每次提交了写入的事务递增，各进程的响应缓存据此判断数据是否变化）"""
+    __tablename__ = "data_version"
+    
+    id = Column(Integer, primary_key=True, comment="固定为1")
+    version = Column(Integer, nullable=False, default=0, comment="数据版本")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
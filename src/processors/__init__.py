@@ -1,7 +1,12 @@
 from .deduplicator import Deduplicator
+from .near_duplicate import NearDuplicateIndex
 from .classifier import Classifier
 from .summarizer import Summarizer
 from .scorer import Scorer
+from .translation_cache import TranslationCache, get_translation_cache
+from .llm_batch import LLMBatchProcessor
 
-__all__ = ["Deduplicator", "Classifier", "Summarizer", "Scorer"]
-
+__all__ = [
+    "Deduplicator", "NearDuplicateIndex", "Classifier", "Summarizer", "Scorer",
+    "TranslationCache", "get_translation_cache", "LLMBatchProcessor",
+]
@@ -6,16 +6,29 @@ from typing import Optional, Dict
 from sqlalchemy.orm import Session
 from src.models.news import NewsCategory
 from src.utils.logger import get_logger
+from src.utils.timing import timed
+from src.utils.keyword_matcher import KeywordMatcher
 
 logger = get_logger(__name__)
 
+# 关键词匹配（简单规则）
+CATEGORY_KEYWORDS = {
+    "技术突破": ["breakthrough", "突破", "milestone", "里程碑", "achievement", "achieved"],
+    "产品发布": ["launch", "发布", "release", "announce", "announcement", "unveil"],
+    "融资并购": ["funding", "融资", "raise", "acquisition", "收购", "merger", "并购", "investment"],
+    "政策法规": ["policy", "政策", "regulation", "法规", "law", "法律", "government"],
+    "学术研究": ["research", "研究", "paper", "论文", "study", "academic"],
+    "人物访谈": ["interview", "访谈", "talk", "conversation"],
+}
+
 
 class Classifier:
     """新闻分类器"""
     
-    def __init__(self, db: Session, use_ai: bool = True):
+    def __init__(self, db: Session, use_ai: bool = True, word_boundary: bool = False):
         self.db = db
         self.use_ai = use_ai and bool(os.getenv("OPENAI_API_KEY"))
+        self.keyword_matcher = KeywordMatcher(CATEGORY_KEYWORDS, word_boundary=word_boundary)
         self._init_categories()
     
     def _init_categories(self):
@@ -31,7 +44,11 @@ class Classifier:
                 self.db.add(NewsCategory(name=cat_name))
         
         self.db.commit()
+        
+        # 缓存分类ID，分类时不再查询数据库（可在多线程中调用）
+        self.category_ids = {name: cat_id for cat_id, name in self.db.query(NewsCategory.id, NewsCategory.name)}
     
+    @timed("classify")
     def classify(self, article: Dict) -> Optional[int]:
         """
         分类文章
@@ -42,40 +59,39 @@ class Classifier:
         Returns:
             int: 分类ID，如果无法分类返回None
         """
-        title = article.get("title", "").lower()
-        content = article.get("content", "").lower()
-        text = f"{title} {content}"
+        category_id = self.classify_by_keywords(article)
+        if category_id is not None:
+            return category_id
+        
+        # 如果使用AI分类
+        if self.use_ai:
+            return self._classify_with_ai(article)
+        
+        # 默认分类为"其他"
+        return self.default_category_id()
+    
+    def default_category_id(self) -> Optional[int]:
+        """默认分类"其他"的ID"""
+        return self.category_ids.get("其他")
+    
+    def classify_by_keywords(self, article: Dict) -> Optional[int]:
+        """
+        按关键词规则分类
         
-        # 关键词匹配（简单规则）
-        category_keywords = {
-            "技术突破": ["breakthrough", "突破", "milestone", "里程碑", "achievement", "achieved"],
-            "产品发布": ["launch", "发布", "release", "announce", "announcement", "unveil"],
-            "融资并购": ["funding", "融资", "raise", "acquisition", "收购", "merger", "并购", "investment"],
-            "政策法规": ["policy", "政策", "regulation", "法规", "law", "法律", "government"],
-            "学术研究": ["research", "研究", "paper", "论文", "study", "academic"],
-            "人物访谈": ["interview", "访谈", "talk", "conversation"],
-        }
+        Returns:
+            int: 分类ID，没有命中任何关键词时返回None
+        """
+        text = f"{article.get('title', '')} {article.get('content', '')}"
+        counts = self.keyword_matcher.count(text)
         
-        scores = {}
-        for category, keywords in category_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text)
-            if score > 0:
-                scores[category] = score
+        scores = {category: counts[category] for category in CATEGORY_KEYWORDS if counts[category] > 0}
         
         if scores:
             # 选择得分最高的分类
             best_category = max(scores.items(), key=lambda x: x[1])[0]
-            category = self.db.query(NewsCategory).filter(NewsCategory.name == best_category).first()
-            if category:
-                return category.id
-        
-        # 如果使用AI分类
-        if self.use_ai:
-            return self._classify_with_ai(article)
+            return self.category_ids.get(best_category)
         
-        # 默认分类为"其他"
-        other_category = self.db.query(NewsCategory).filter(NewsCategory.name == "其他").first()
-        return other_category.id if other_category else None
+        return None
     
     def _classify_with_ai(self, article: Dict) -> Optional[int]:
         """使用AI进行分类"""
@@ -108,10 +124,8 @@ class Classifier:
             )
             
             category_name = response.choices[0].message.content.strip()
-            category = self.db.query(NewsCategory).filter(NewsCategory.name == category_name).first()
-            
-            if category:
-                return category.id
+            if category_name in self.category_ids:
+                return self.category_ids[category_name]
             
         except Exception as e:
             logger.error(f"AI分类失败: {e}")
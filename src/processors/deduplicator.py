@@ -1,11 +1,15 @@
 """
 去重处理器
 """
-from typing import List, Dict
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Set, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from src.models.news import News
+from src.processors.near_duplicate import NearDuplicateIndex
 from src.utils.logger import get_logger
-from src.utils.helpers import calculate_similarity, normalize_url
+from src.utils.helpers import normalize_url
+from src.utils.timing import timed
 
 logger = get_logger(__name__)
 
@@ -13,9 +17,108 @@ logger = get_logger(__name__)
 class Deduplicator:
     """新闻去重器"""
     
-    def __init__(self, db: Session, threshold: float = 0.85):
+    def __init__(self, db: Session, threshold: float = 0.85, window_days: int = 7):
         self.db = db
         self.threshold = threshold
+        self.window_days = window_days
+        # 最近N天已入库新闻的标题索引（跨运行保留，每次运行增量更新）
+        self._index: Optional[NearDuplicateIndex] = None
+        self._indexed: Dict[int, Tuple[datetime, int]] = {}  # 新闻ID -> (发布时间, 索引编号)
+        self._last_id = 0  # 已读取到索引的最大新闻ID
+        # 本次运行中已入库的标题和规范化链接（下次运行时由数据库增量读入索引）
+        self._run_index = NearDuplicateIndex(threshold=threshold)
+        self._seen_urls: Set[str] = set()
+        # 最近一次 mark_duplicates 接收、尚未入库的文章（规范化链接, 标题）
+        self._pending: List[Tuple[str, str]] = []
+    
+    def backfill_normalized_urls(self, batch_size: int = 1000):
+        """为历史数据补齐规范化链接"""
+        total = 0
+        while True:
+            rows = self.db.query(News.id, News.url).filter(
+                News.url_normalized.is_(None)
+            ).limit(batch_size).all()
+            if not rows:
+                break
+            
+            self.db.bulk_update_mappings(News, [
+                {"id": news_id, "url_normalized": normalize_url(url)} for news_id, url in rows
+            ])
+            self.db.commit()
+            total += len(rows)
+        
+        if total:
+            logger.info(f"已为 {total} 条历史新闻补齐规范化链接")
+    
+    @timed("dedup_index")
+    def build_index(self):
+        """
+        更新最近N天的新闻标题索引（每次运行调用一次，只读取标题列）
+
+        已有索引时只读入新入库的新闻、移除超出时间窗口的标题；窗口内的新闻数量与索引不一致时
+        （如新闻被删除或发布时间被修改）完整重建。
+        """
+        self.backfill_normalized_urls()
+        
+        since = datetime.utcnow() - timedelta(days=self.window_days)
+        self._run_index = NearDuplicateIndex(threshold=self.threshold)
+        self._seen_urls = set()
+        self._pending = []
+        
+        if self._index is not None and self._refresh_index(since):
+            return
+        
+        self._index = NearDuplicateIndex(threshold=self.threshold)
+        self._indexed = {}
+        self._last_id = 0
+        self._add_rows(since)
+        logger.info(f"去重索引已构建：最近{self.window_days}天 {len(self._index)} 条标题")
+    
+    def _add_rows(self, since: datetime):
+        """读入ID大于 _last_id、在时间窗口内的新闻标题"""
+        max_id = self.db.query(func.max(News.id)).scalar() or 0
+        if max_id <= self._last_id:
+            self._last_id = max_id
+            return
+        
+        rows = self.db.query(News.id, News.title, News.published_at).filter(
+            News.id > self._last_id, News.id <= max_id, News.published_at >= since
+        ).all()
+        doc_ids = self._index.add_many([title for _, title, _ in rows])
+        for (news_id, _, published_at), doc_id in zip(rows, doc_ids):
+            if doc_id is not None:
+                self._indexed[news_id] = (published_at, doc_id)
+        self._last_id = max_id
+    
+    def _refresh_index(self, since: datetime) -> bool:
+        """增量更新索引，索引与数据库不一致时返回False（需要完整重建）"""
+        expired = [news_id for news_id, (published_at, _) in self._indexed.items() if published_at < since]
+        for news_id in expired:
+            self._index.remove(self._indexed.pop(news_id)[1])
+        
+        # 空标题不在索引中，按窗口内的非空标题数核对
+        expected = self.db.query(func.count(News.id)).filter(
+            News.id <= self._last_id, News.published_at >= since, News.title != ""
+        ).scalar()
+        if expected != len(self._indexed):
+            logger.info(f"去重索引与数据库不一致（索引 {len(self._indexed)} 条，数据库 {expected} 条），重新构建")
+            return False
+        
+        before = len(self._index)
+        self._add_rows(since)
+        logger.info(f"去重索引已更新：新增 {len(self._index) - before} 条，移除过期 {len(expired)} 条，"
+                    f"共 {len(self._index)} 条标题")
+        return True
+    
+    def _get_index(self) -> NearDuplicateIndex:
+        """获取近似重复索引（未构建时自动构建）"""
+        if self._index is None:
+            self.build_index()
+        return self._index
+    
+    def _find_similar(self, title: str) -> Optional[Tuple[str, float]]:
+        """在已入库新闻和本次运行已入库的标题中查找相似标题"""
+        return self._get_index().find(title) or self._run_index.find(title)
     
     def is_duplicate(self, article: Dict) -> bool:
         """
@@ -33,31 +136,37 @@ class Deduplicator:
         if not url or not title:
             return False
         
-        # 方法1: URL完全匹配
-        existing = self.db.query(News).filter(News.url == url).first()
+        # 方法1: 规范化URL完全匹配
+        existing = self.db.query(News.id).filter(News.url_normalized == url).first()
         if existing:
             logger.debug(f"发现URL重复: {url}")
             return True
         
-        # 方法2: 标题相似度匹配（最近7天的新闻）
-        from datetime import datetime, timedelta
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        
-        recent_news = self.db.query(News).filter(
-            News.published_at >= seven_days_ago
-        ).all()
-        
-        for news in recent_news:
-            similarity = calculate_similarity(title, news.title)
-            if similarity >= self.threshold:
-                logger.debug(f"发现标题相似重复: {title} vs {news.title} (相似度: {similarity:.2f})")
-                return True
+        # 方法2: 标题相似度匹配（最近N天的新闻，通过LSH索引召回候选）
+        match = self._find_similar(title)
+        if match:
+            matched_title, similarity = match
+            logger.debug(f"发现标题相似重复: {title} vs {matched_title} (相似度: {similarity:.2f})")
+            return True
         
         return False
     
+    def _existing_urls(self, urls: List[str], chunk_size: int = 500) -> Set[str]:
+        """批量查询已存在的规范化链接（每批一次 IN 查询）"""
+        existing = set()
+        for i in range(0, len(urls), chunk_size):
+            chunk = urls[i:i + chunk_size]
+            existing.update(
+                url for (url,) in self.db.query(News.url_normalized).filter(News.url_normalized.in_(chunk))
+            )
+        return existing
+    
     def mark_duplicates(self, articles: List[Dict]) -> List[Dict]:
         """
-        标记重复文章
+        标记重复文章（整批规范化链接后一次查询，批内重复在内存中合并）
+        
+        去重后的文章会带上 url_normalized 字段，供入库使用。接收的文章在入库成功、调用 commit_pending()
+        后才加入索引；未提交的（如事务回滚）在下次调用时丢弃，不会使后续源的文章被误判为重复。
         
         Returns:
             List[Dict]: 去重后的文章列表
@@ -65,14 +174,49 @@ class Deduplicator:
         unique_articles = []
         duplicate_count = 0
         
+        # 批内按规范化链接合并
+        batch: Dict[str, Dict] = {}
         for article in articles:
-            if not self.is_duplicate(article):
+            url = normalize_url(article.get("url", ""))
+            article["url_normalized"] = url
+            if not url or not article.get("title"):
                 unique_articles.append(article)
+            elif url in batch:
+                duplicate_count += 1
             else:
+                batch[url] = article
+        
+        existing_urls = self._existing_urls(list(batch))
+        # 本批已接收的标题（批内相似标题同样视为重复）
+        batch_index = NearDuplicateIndex(threshold=self.threshold)
+        self._pending = []
+        
+        for url, article in batch.items():
+            title = article["title"]
+            if url in existing_urls or url in self._seen_urls:
+                logger.debug(f"发现URL重复: {url}")
+                duplicate_count += 1
+                continue
+            
+            match = self._find_similar(title) or batch_index.find(title)
+            if match:
+                matched_title, similarity = match
+                logger.debug(f"发现标题相似重复: {title} vs {matched_title} (相似度: {similarity:.2f})")
                 duplicate_count += 1
+                continue
+            
+            unique_articles.append(article)
+            batch_index.add(title)
+            self._pending.append((url, title))
         
         if duplicate_count > 0:
             logger.info(f"过滤掉 {duplicate_count} 条重复新闻")
         
         return unique_articles
-
+    
+    def commit_pending(self):
+        """入库成功后调用：将最近一次 mark_duplicates 接收的文章加入本次运行的索引（同一次运行中后续源据此去重）"""
+        for url, title in self._pending:
+            self._seen_urls.add(url)
+            self._run_index.add(title)
+        self._pending = []
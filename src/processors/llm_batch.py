@@ -0,0 +1,192 @@
+"""
+批量LLM处理（一次请求完成多篇文章的摘要、翻译和分类）
+"""
+import json
+import os
+import re
+from typing import List, Dict, Optional
+from src.processors.classifier import Classifier
+from src.processors.summarizer import Summarizer
+from src.utils.logger import get_logger
+from src.utils.timing import timed
+
+logger = get_logger(__name__)
+
+# 每篇文章预留的输出token数（摘要、摘要翻译、标题翻译和分类）
+TOKENS_PER_ARTICLE = 400
+
+
+class LLMBatchProcessor:
+    """
+    批量LLM处理器
+
+    将多篇文章打包成一个JSON数组发送给模型，返回每篇文章的摘要、摘要翻译、标题翻译和分类。
+    某一批的响应无法解析时，该批退回逐篇调用 Summarizer / Classifier。
+    标题翻译先查询 Summarizer 的翻译缓存（命中时不再要求模型翻译），模型返回的翻译写入缓存，
+    缓存键与逐篇翻译相同。
+    每个请求的输出token数不超过 max_tokens，每批的文章数按 max_tokens // TOKENS_PER_ARTICLE 限制。
+    """
+
+    def __init__(self, summarizer: Summarizer, classifier: Classifier, client=None,
+                 batch_size: int = 10, content_limit: int = 1000, max_tokens: int = 4000):
+        self.summarizer = summarizer
+        self.classifier = classifier
+        self.client = client
+        self.max_tokens = max(TOKENS_PER_ARTICLE, max_tokens)
+        self.batch_size = max(1, min(batch_size, self.max_tokens // TOKENS_PER_ARTICLE))
+        self.content_limit = content_limit
+        self.model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+        # 翻译缓存的后端标识（与 Summarizer 的AI翻译相同）
+        self.backend = f"openai:{self.model}"
+
+    def _get_client(self):
+        """获取ChatCompletion客户端（默认使用openai）"""
+        if self.client is None:
+            import openai
+            self.client = openai.ChatCompletion
+        return self.client
+
+    def _cached_translation(self, text: str) -> Optional[str]:
+        """查询翻译缓存"""
+        cache = self.summarizer.translation_cache
+        if cache is None or not text:
+            return None
+        return cache.get(text, "zh-CN", self.backend)
+
+    def _cache_translation(self, text: str, translation: Optional[str]):
+        """写入翻译缓存"""
+        cache = self.summarizer.translation_cache
+        if cache is not None and text and translation:
+            cache.set(text, "zh-CN", self.backend, translation)
+
+    def _build_prompt(self, articles: List[Dict], cached_titles: Dict[int, str]) -> str:
+        """构建批量处理提示词（标题翻译已缓存的文章附带翻译，模型无需再翻译）"""
+        payload = []
+        for article in articles:
+            item = {
+                "id": article["id"],
+                "title": article.get("title", ""),
+                "content": (article.get("content") or "")[:self.content_limit],
+            }
+            if article["id"] in cached_titles:
+                item["title_translated"] = cached_titles[article["id"]]
+            payload.append(item)
+        categories = "、".join(self.classifier.category_ids)
+        max_length = self.summarizer.max_length
+
+        return f"""请处理以下AI相关新闻，对每一条返回：
+- summary: 原文语言的简洁摘要（不超过{max_length}字，保持专业术语准确，突出关键信息）
+- summary_translated: 摘要的中文翻译（原文为中文时为null）
+- title_translated: 标题的中文翻译（原文为中文或新闻列表中已提供时为null）
+- category: 以下分类之一：{categories}
+
+只返回JSON数组，每个元素格式为 {{"id": ..., "summary": ..., "summary_translated": ..., "title_translated": ..., "category": ...}}，不要其他内容。
+
+新闻列表（JSON）：
+{json.dumps(payload, ensure_ascii=False)}"""
+
+    @staticmethod
+    def _parse_response(content: str) -> List[Dict]:
+        """解析模型返回的JSON数组（兼容 ```json 代码块）"""
+        content = re.sub(r"^```(?:json)?\s*|\s*```$", "", content.strip())
+        data = json.loads(content)
+        if not isinstance(data, list):
+            raise ValueError("响应不是JSON数组")
+        return data
+
+    def _to_result(self, article: Dict, item: Dict, cached_title: Optional[str] = None) -> Dict:
+        """将模型返回的条目转换为入库字段（新的翻译写入缓存）"""
+        max_length = self.summarizer.max_length
+        summary = (item.get("summary") or "").strip()
+        if not summary:
+            raise ValueError(f"缺少摘要: {article['id']}")
+
+        # 关键词规则优先，其次使用模型给出的分类
+        category_id = self.classifier.classify_by_keywords(article)
+        if category_id is None:
+            category_id = self.classifier.category_ids.get((item.get("category") or "").strip())
+        if category_id is None:
+            category_id = self.classifier.default_category_id()
+
+        summary_translated = item.get("summary_translated") or None
+        title_translated = cached_title or item.get("title_translated") or None
+        self._cache_translation(summary, summary_translated)
+        if not cached_title:
+            self._cache_translation(article.get("title", ""), title_translated)
+        return {
+            "category_id": category_id,
+            "summary": summary[:max_length],
+            "summary_translated": summary_translated[:max_length] if summary_translated else None,
+            "title_translated": title_translated,
+        }
+
+    def _process_single(self, article: Dict) -> Dict:
+        """逐篇处理（批量响应无法解析时的回退路径）"""
+        summary_result = self.summarizer.summarize(article)
+        return {
+            "category_id": self.classifier.classify(article),
+            "summary": summary_result.get("original", ""),
+            "summary_translated": summary_result.get("translated"),
+            "title_translated": self.summarizer.translate_title(article["title"]),
+        }
+
+    def _process_chunk(self, articles: List[Dict]) -> Dict[int, Dict]:
+        """处理一批文章，解析失败的条目逐篇回退"""
+        results: Dict[int, Dict] = {}
+        try:
+            cached_titles = {}
+            for article in articles:
+                cached = self._cached_translation(article.get("title", ""))
+                if cached:
+                    cached_titles[article["id"]] = cached
+
+            response = self._get_client().create(
+                model=self.model,
+                messages=[{"role": "user", "content": self._build_prompt(articles, cached_titles)}],
+                temperature=0.3,
+                max_tokens=min(self.max_tokens, TOKENS_PER_ARTICLE * len(articles))
+            )
+            # 模型可能把数字ID写成字符串（或相反），按字符串匹配
+            items = {str(item.get("id")): item for item in self._parse_response(response.choices[0].message.content)
+                     if isinstance(item, dict)}
+
+            for article in articles:
+                item = items.get(str(article["id"]))
+                if item is None:
+                    continue
+                try:
+                    results[article["id"]] = self._to_result(article, item, cached_titles.get(article["id"]))
+                except (ValueError, TypeError, AttributeError) as e:
+                    logger.debug(f"批量结果无效，改为逐篇处理: {e}")
+
+        except Exception as e:
+            logger.warning(f"批量LLM请求失败，改为逐篇处理（{len(articles)}篇）: {e}")
+
+        # 逐篇回退失败的文章不返回结果，保持未处理状态，由下次增强任务重试
+        for article in articles:
+            if article["id"] in results:
+                continue
+            try:
+                results[article["id"]] = self._process_single(article)
+            except Exception as e:
+                logger.error(f"处理文章失败 {article['id']}: {e}")
+
+        return results
+
+    @timed("llm_batch")
+    def process(self, articles: List[Dict]) -> Dict[int, Dict]:
+        """
+        批量处理文章
+
+        Args:
+            articles: 文章列表，每篇需包含 id、title、content
+
+        Returns:
+            Dict[int, Dict]: 文章ID -> {category_id, summary, summary_translated, title_translated}
+                             （处理失败的文章不在结果中）
+        """
+        results: Dict[int, Dict] = {}
+        for i in range(0, len(articles), self.batch_size):
+            results.update(self._process_chunk(articles[i:i + self.batch_size]))
+        return results
+
@@ -0,0 +1,187 @@
+"""
+近似重复标题索引（MinHash + LSH）
+
+shingle（规范化标题的连续3个字符）的码位直接拼成一个64位整数，用 numpy 对整批标题混合后再做
+NUM_BANDS * ROWS_PER_BAND 个乘移位哈希（h(x) = (a*x + b) mod 2^64 的高32位），按标题取最小值得到签名。
+重复的 shingle 不影响最小值，无需去重。
+"""
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# MinHash参数：NUM_BANDS * ROWS_PER_BAND 个哈希函数
+NUM_BANDS = 24
+ROWS_PER_BAND = 4
+SHINGLE_SIZE = 3
+
+_NUM_HASHES = NUM_BANDS * ROWS_PER_BAND
+# 每次一起计算签名的标题数（中间矩阵为 哈希函数数 x shingle 数）
+_BATCH_TITLES = 256
+# Unicode 码位的位数（3个码位拼成的整数不超过63位，不会冲突）
+_CODE_POINT_BITS = np.uint64(21)
+
+# 哈希函数参数固定（签名在进程间、各次运行间保持一致）
+_rng = np.random.default_rng(20240101)
+_MULTIPLIERS = _rng.integers(0, 2 ** 63, size=_NUM_HASHES, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_OFFSETS = _rng.integers(0, 2 ** 63, size=_NUM_HASHES, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+# 每个 band 键的字节数（ROWS_PER_BAND 个32位签名值）
+_BAND_BYTES = ROWS_PER_BAND * 4
+
+
+def normalize_title(title: str) -> str:
+    """规范化标题：小写、去标点、合并空白"""
+    title = re.sub(r'[^\w\s]', ' ', title.lower())
+    return re.sub(r'\s+', ' ', title).strip()
+
+
+def _shingle_values(title: str) -> np.ndarray:
+    """标题的字符级 n-gram（对中英文都适用），每个 n-gram 的码位拼成一个整数；不足 n 个字符时整个标题为一个"""
+    normalized = normalize_title(title)
+    if not normalized:
+        return np.empty(0, dtype=np.uint64)
+    normalized = normalized.ljust(SHINGLE_SIZE, "\0")
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype="<u4").astype(np.uint64)
+    count = len(codes) - SHINGLE_SIZE + 1
+    values = codes[:count].copy()
+    for k in range(1, SHINGLE_SIZE):
+        values <<= _CODE_POINT_BITS
+        values |= codes[k:k + count]
+    return values
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """64位混合（splitmix64 的终结函数），使相近的码位组合分散到整个取值范围"""
+    values = values ^ (values >> np.uint64(30))
+    values *= np.uint64(0xBF58476D1CE4E5B9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94D049BB133111EB)
+    values ^= values >> np.uint64(31)
+    return values
+
+
+def minhash_bands_many(titles: Sequence[str]) -> List[List[bytes]]:
+    """
+    批量计算标题的 MinHash 签名并按 band 切分
+
+    Returns:
+        List[List[bytes]]: 每个标题的各 band 键（没有 shingle 的标题为空列表）
+    """
+    shingled = [_shingle_values(title) for title in titles]
+    result: List[List[bytes]] = [[] for _ in titles]
+    nonempty = [i for i, values in enumerate(shingled) if len(values)]
+
+    for start in range(0, len(nonempty), _BATCH_TITLES):
+        chunk = nonempty[start:start + _BATCH_TITLES]
+        values = _mix(np.concatenate([shingled[i] for i in chunk]))
+        offsets = np.cumsum([0] + [len(shingled[i]) for i in chunk[:-1]])
+        # 哈希函数 x shingle（uint64 乘法按 2^64 取模），按标题分段取最小值
+        permuted = _MULTIPLIERS[:, None] * values
+        permuted += _OFFSETS[:, None]
+        permuted >>= _SHIFT
+        signatures = np.ascontiguousarray(
+            np.minimum.reduceat(permuted.astype(np.uint32), offsets, axis=1).T, dtype="<u4"
+        )
+        for i, signature in zip(chunk, signatures):
+            raw = signature.tobytes()
+            result[i] = [raw[j:j + _BAND_BYTES] for j in range(0, len(raw), _BAND_BYTES)]
+    return result
+
+
+@lru_cache(maxsize=4096)
+def minhash_bands(title: str) -> Tuple[bytes, ...]:
+    """计算单个标题的各 band 键（同一标题在查找和加入索引时重复使用，结果会缓存）"""
+    return tuple(minhash_bands_many([title])[0])
+
+
+def similarity_at_least(text1: str, text2: str, threshold: float) -> Optional[float]:
+    """
+    与 calculate_similarity 相同的相似度（忽略大小写的 SequenceMatcher.ratio），低于阈值时返回None
+
+    先用 real_quick_ratio / quick_ratio（ratio 的上界）排除，结果与直接比较 ratio 相同。
+    """
+    if not text1 or not text2:
+        return None
+    matcher = SequenceMatcher(None, text1.lower(), text2.lower())
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return None
+    similarity = matcher.ratio()
+    return similarity if similarity >= threshold else None
+
+
+class NearDuplicateIndex:
+    """
+    近似重复标题索引
+
+    LSH 只负责召回候选，候选仍用 SequenceMatcher 相似度校验，
+    因此阈值语义与逐条 calculate_similarity 比较一致。
+    """
+
+    def __init__(self, threshold: float = 0.85):
+        self.threshold = threshold
+        self._titles: Dict[int, str] = {}
+        self._keys: Dict[int, Sequence[bytes]] = {}
+        self._next_id = 0
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(NUM_BANDS)]
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def _insert(self, title: str, keys: Sequence[bytes]) -> int:
+        doc_id = self._next_id
+        self._next_id += 1
+        self._titles[doc_id] = title
+        self._keys[doc_id] = keys
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(doc_id)
+        return doc_id
+
+    def add(self, title: str) -> Optional[int]:
+        """加入一条标题，返回其编号（用于 remove；空标题不加入，返回None）"""
+        if not title:
+            return None
+        return self._insert(title, minhash_bands(title))
+
+    def add_many(self, titles: Sequence[str]) -> List[Optional[int]]:
+        """批量加入标题（整批计算签名），返回各标题的编号"""
+        doc_ids: List[Optional[int]] = [None] * len(titles)
+        indexes = [i for i, title in enumerate(titles) if title]
+        for i, keys in zip(indexes, minhash_bands_many([titles[i] for i in indexes])):
+            doc_ids[i] = self._insert(titles[i], keys)
+        return doc_ids
+
+    def remove(self, doc_id: int):
+        """移除一条标题"""
+        if self._titles.pop(doc_id, None) is None:
+            return
+        for band, key in enumerate(self._keys.pop(doc_id)):
+            bucket = self._buckets[band][key]
+            bucket.remove(doc_id)
+            if not bucket:
+                del self._buckets[band][key]
+
+    def candidates(self, title: str) -> Set[int]:
+        """返回与标题落入同一 band 桶的候选"""
+        found: Set[int] = set()
+        for band, key in enumerate(minhash_bands(title)):
+            found.update(self._buckets[band].get(key, ()))
+        return found
+
+    def find(self, title: str) -> Optional[Tuple[str, float]]:
+        """
+        查找相似标题
+
+        Returns:
+            (title, similarity): 第一个达到阈值的已有标题；没有则返回None
+        """
+        if not title:
+            return None
+        for doc_id in self.candidates(title):
+            existing = self._titles[doc_id]
+            similarity = similarity_at_least(title, existing, self.threshold)
+            if similarity is not None:
+                return existing, similarity
+        return None
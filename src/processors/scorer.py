@@ -5,7 +5,9 @@ import yaml
 from typing import Dict
 from pathlib import Path
 from src.utils.logger import get_logger
+from src.utils.timing import timed
 from src.utils.helpers import extract_keywords
+from src.utils.keyword_matcher import KeywordMatcher
 
 logger = get_logger(__name__)
 
@@ -15,8 +17,13 @@ class Scorer:
     
     def __init__(self, config_path: str = "config.yaml"):
         self.config = self._load_config(config_path)
-        self.high_priority_keywords = self.config.get("keywords", {}).get("high_priority", [])
-        self.medium_priority_keywords = self.config.get("keywords", {}).get("medium_priority", [])
+        keywords_config = self.config.get("keywords", {})
+        self.high_priority_keywords = keywords_config.get("high_priority", [])
+        self.medium_priority_keywords = keywords_config.get("medium_priority", [])
+        self.keyword_matcher = KeywordMatcher(
+            {"high": self.high_priority_keywords, "medium": self.medium_priority_keywords},
+            word_boundary=keywords_config.get("word_boundary", False)
+        )
         self.scoring_weights = self.config.get("processing", {}).get("scoring", {})
     
     def _load_config(self, config_path: str) -> Dict:
@@ -31,6 +38,7 @@ class Scorer:
         
         return {}
     
+    @timed("score")
     def score(self, article: Dict, source_weight: float = 0.2) -> float:
         """
         计算重要性评分（0-1）
@@ -92,14 +100,13 @@ class Scorer:
     def _calculate_keyword_score(self, text: str) -> float:
         """计算关键词得分"""
         score = 0.0
+        counts = self.keyword_matcher.count(text)
         
         # 高优先级关键词
-        high_count = sum(1 for keyword in self.high_priority_keywords if keyword.lower() in text)
-        score += min(high_count * 0.3, 0.6)  # 每个高优先级关键词0.3分，最高0.6
+        score += min(counts["high"] * 0.3, 0.6)  # 每个高优先级关键词0.3分，最高0.6
         
         # 中优先级关键词
-        medium_count = sum(1 for keyword in self.medium_priority_keywords if keyword.lower() in text)
-        score += min(medium_count * 0.1, 0.3)  # 每个中优先级关键词0.1分，最高0.3
+        score += min(counts["medium"] * 0.1, 0.3)  # 每个中优先级关键词0.1分，最高0.3
         
         return min(score, 1.0)
 
@@ -3,8 +3,11 @@
 """
 import os
 import re
+import threading
 from typing import Optional, Dict
+from src.processors.translation_cache import TranslationCache
 from src.utils.logger import get_logger
+from src.utils.timing import timed
 from src.utils.helpers import clean_text
 
 logger = get_logger(__name__)
@@ -13,10 +16,14 @@ logger = get_logger(__name__)
 class Summarizer:
     """新闻摘要生成器（支持中文翻译）"""
     
-    def __init__(self, use_ai: bool = True, max_length: int = 200, translate_to_chinese: bool = True):
+    def __init__(self, use_ai: bool = True, max_length: int = 200, translate_to_chinese: bool = True,
+                 translation_cache: Optional[TranslationCache] = None):
         self.use_ai = use_ai and bool(os.getenv("OPENAI_API_KEY"))
         self.max_length = max_length
         self.translate_to_chinese = translate_to_chinese
+        self.translation_cache = translation_cache
+        # 每个线程复用一个 GoogleTranslator（实例在翻译时会修改自身请求参数，不能跨线程共享）
+        self._local = threading.local()
     
     def summarize(self, article: Dict) -> Dict[str, str]:
         """
@@ -31,18 +38,19 @@ class Summarizer:
         content = article.get("content", "")
         title = article.get("title", "")
         
-        if not content:
-            summary_original = title[:self.max_length]
-        elif self.use_ai:
-            # 使用AI生成中文摘要
-            summary = self._summarize_with_ai(title, content)
-            if not summary:
-                summary_original = self._extract_summary(content)
+        with timed("summarize"):
+            if not content:
+                summary_original = title[:self.max_length]
+            elif self.use_ai:
+                # 使用AI生成中文摘要
+                summary = self._summarize_with_ai(title, content)
+                if not summary:
+                    summary_original = self._extract_summary(content)
+                else:
+                    summary_original = summary
             else:
-                summary_original = summary
-        else:
-            # 简单提取摘要
-            summary_original = self._extract_summary(content)
+                # 简单提取摘要
+                summary_original = self._extract_summary(content)
         
         # 如果是英文且需要翻译，进行翻译
         summary_translated = None
@@ -81,6 +89,7 @@ class Summarizer:
         # 如果中文字符少于10%，认为是英文
         return chinese_chars < len(text) * 0.1
     
+    @timed("translate")
     def _translate_to_chinese(self, text: str, title: str = "") -> Optional[str]:
         """将英文翻译成中文"""
         # 优先使用OpenAI翻译
@@ -97,20 +106,41 @@ class Summarizer:
         # 最后使用简单的词汇替换（作为备选）
         return self._simple_translate(text)
     
+    def _cached_translation(self, text: str, backend: str) -> Optional[str]:
+        """查询翻译缓存"""
+        if self.translation_cache is None:
+            return None
+        return self.translation_cache.get(text, "zh-CN", backend)
+    
+    def _cache_translation(self, text: str, backend: str, translation: str):
+        """写入翻译缓存"""
+        if self.translation_cache is not None:
+            self.translation_cache.set(text, "zh-CN", backend, translation)
+    
+    def _get_google_translator(self):
+        """获取当前线程复用的 GoogleTranslator"""
+        translator = getattr(self._local, "google_translator", None)
+        if translator is None:
+            from deep_translator import GoogleTranslator
+            translator = GoogleTranslator(source='en', target='zh-CN')
+            self._local.google_translator = translator
+        return translator
+    
     def _translate_with_google(self, text: str) -> Optional[str]:
         """使用Google翻译（免费）"""
+        cached = self._cached_translation(text, "google")
+        if cached:
+            return cached[:self.max_length]
+        
         try:
-            from deep_translator import GoogleTranslator
-            
             # 分段翻译（Google翻译有长度限制）
-            if len(text) > 4500:
-                text = text[:4500]
+            source_text = text[:4500]
             
-            translator = GoogleTranslator(source='en', target='zh-CN')
-            translation = translator.translate(text)
+            translation = self._get_google_translator().translate(source_text)
             
             if translation:
                 logger.debug(f"Google翻译成功: {text[:50]}... -> {translation[:50]}...")
+                self._cache_translation(text, "google", translation)
                 return translation[:self.max_length]
             
         except Exception as e:
@@ -120,6 +150,11 @@ class Summarizer:
     
     def _translate_with_ai(self, text: str, title: str = "") -> Optional[str]:
         """使用AI翻译"""
+        backend = f"openai:{os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')}"
+        cached = self._cached_translation(text, backend)
+        if cached:
+            return cached[:self.max_length]
+        
         try:
             import openai
             
@@ -137,6 +172,8 @@ class Summarizer:
             )
             
             translation = response.choices[0].message.content.strip()
+            if translation:
+                self._cache_translation(text, backend, translation)
             return translation[:self.max_length]
             
         except Exception as e:
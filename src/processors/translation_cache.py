@@ -0,0 +1,137 @@
+"""
+翻译缓存（SQLite持久化）
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TranslationCache:
+    """翻译缓存：按（原文哈希，目标语言，翻译后端）索引，超出容量时按最近使用时间淘汰"""
+
+    def __init__(self, path: str = "data/translation_cache.db", max_entries: int = 50000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                text_hash TEXT NOT NULL,
+                target TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (text_hash, target, backend)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, text: str, target: str, backend: str) -> Optional[str]:
+        """查询缓存，命中时刷新最近使用时间"""
+        key = (self._hash(text), target, backend)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE text_hash = ? AND target = ? AND backend = ?", key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE translations SET last_used = ? WHERE text_hash = ? AND target = ? AND backend = ?",
+                (time.time(),) + key
+            )
+            self._conn.commit()
+            return row[0]
+
+    def set(self, text: str, target: str, backend: str, translation: str):
+        """写入缓存，超出容量时淘汰最久未使用的10%"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR REPLACE INTO translations (text_hash, target, backend, translation, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self._hash(text), target, backend, translation, time.time())
+            )
+            self._size += cursor.rowcount
+
+            if self._size > self.max_entries:
+                evict = max(1, self.max_entries // 10)
+                self._conn.execute(
+                    "DELETE FROM translations WHERE rowid IN "
+                    "(SELECT rowid FROM translations ORDER BY last_used LIMIT ?)", (evict,)
+                )
+                self._size = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+                logger.debug(f"翻译缓存淘汰 {evict} 条")
+
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """命中统计"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "size": self._size,
+                "max_entries": self.max_entries,
+            }
+
+
+# 进程内共享的缓存实例
+_translation_cache: Optional[TranslationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_translation_cache(config: Optional[Dict] = None) -> Optional[TranslationCache]:
+    """
+    获取进程内共享的翻译缓存
+
+    Args:
+        config: 完整配置（首次调用时读取 processing.translation_cache）
+
+    Returns:
+        TranslationCache: 缓存实例；配置中关闭缓存时返回None
+    """
+    global _translation_cache
+
+    cache_config = (config or {}).get("processing", {}).get("translation_cache", {})
+    if not cache_config.get("enabled", True):
+        return None
+
+    with _cache_lock:
+        if _translation_cache is None:
+            try:
+                _translation_cache = TranslationCache(
+                    path=cache_config.get("path", "data/translation_cache.db"),
+                    max_entries=cache_config.get("max_entries", 50000)
+                )
+            except Exception as e:
+                logger.error(f"初始化翻译缓存失败: {e}")
+                return None
+        return _translation_cache
+
+
+def get_translation_cache_stats() -> Dict:
+    """共享翻译缓存的命中统计（尚未创建时返回空统计）"""
+    if _translation_cache is None:
+        return {"hits": 0, "misses": 0, "hit_rate": 0.0, "size": 0, "max_entries": 0}
+    return _translation_cache.stats()
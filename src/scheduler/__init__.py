@@ -1,4 +1,4 @@
 from .tasks import ScrapeTask, setup_scheduler
+from .enrichment import EnrichmentWorker, run_enrichment
 
-__all__ = ["ScrapeTask", "setup_scheduler"]
-
+__all__ = ["ScrapeTask", "setup_scheduler", "EnrichmentWorker", "run_enrichment"]
@@ -0,0 +1,232 @@
+"""
+内容增强任务（分类、摘要、翻译、评分）
+
+爬取阶段只写入原始文章（is_processed=False），本任务分批读取未处理的新闻并补全处理结果。
+处理失败的新闻记录失败次数，达到 processing.enrichment.max_attempts 后不再重试。
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal, add_to_daily_stats, remove_from_daily_stats, refresh_featured
+from src.models.news import News
+from src.processors import Classifier, Summarizer, Scorer
+from src.processors.translation_cache import get_translation_cache
+from src.processors.llm_batch import LLMBatchProcessor
+from src.utils.logger import get_logger
+from src.utils.cache import invalidate_response_cache
+from src.utils.timing import pipeline_run, timed
+
+logger = get_logger(__name__)
+
+# 同一进程内只允许一个增强任务运行（定时任务与爬取后的增强可能重叠）
+_run_lock = threading.Lock()
+
+
+class EnrichmentWorker:
+    """增强任务：为未处理的新闻补充分类、摘要、翻译和重要性评分"""
+
+    def __init__(self, db: Session, config: Dict):
+        self.db = db
+        processing_config = config.get("processing", {})
+        enrichment_config = processing_config.get("enrichment", {})
+        self.batch_size = enrichment_config.get("batch_size", 20)
+        self.workers = max(1, enrichment_config.get("workers", 4))
+        self.max_attempts = max(1, enrichment_config.get("max_attempts", 3))
+
+        self.classifier = Classifier(
+            self.db,
+            word_boundary=config.get("keywords", {}).get("word_boundary", False)
+        )
+
+        # 从配置中读取摘要设置
+        summarization_config = processing_config.get("summarization", {})
+        self.translation_cache = get_translation_cache(config)
+        self.summarizer = Summarizer(
+            max_length=summarization_config.get("max_length", 200),
+            translate_to_chinese=summarization_config.get("translate_to_chinese", True),
+            translation_cache=self.translation_cache
+        )
+        self.scorer = Scorer()
+        
+        # 批量LLM处理（仅在启用AI时生效）
+        llm_batch_config = processing_config.get("llm_batch", {})
+        self.llm_batch = None
+        if self.summarizer.use_ai and llm_batch_config.get("enabled", True):
+            self.llm_batch = LLMBatchProcessor(
+                self.summarizer,
+                self.classifier,
+                batch_size=llm_batch_config.get("batch_size", 10),
+                max_tokens=llm_batch_config.get("max_tokens", 4000)
+            )
+
+    def _enrich(self, article: Dict) -> Optional[Dict]:
+        """
+        处理单篇文章（在线程池中执行，不访问数据库会话）
+
+        Returns:
+            dict: 需要更新的字段；处理失败返回None
+        """
+        try:
+            # 分类
+            category_id = self.classifier.classify(article)
+
+            # 生成摘要（返回原文和翻译）
+            summary_result = self.summarizer.summarize(article)
+
+            # 翻译标题
+            title_translated = self.summarizer.translate_title(article["title"])
+
+            # 计算重要性评分
+            importance_score = self.scorer.score(article, source_weight=0.2)
+
+            return {
+                "id": article["id"],
+                "category_id": category_id,
+                "summary": summary_result.get("original", ""),
+                "summary_translated": summary_result.get("translated"),
+                "title_translated": title_translated,
+                "importance_score": importance_score,
+                "is_processed": True,
+            }
+        except Exception as e:
+            logger.error(f"处理文章失败 {article['id']}: {e}")
+            return None
+
+    def _enrich_with_llm_batch(self, batch: List[Dict], executor: ThreadPoolExecutor) -> List[Dict]:
+        """批量LLM处理一批文章（多个LLM请求并发发送）"""
+        size = self.llm_batch.batch_size
+        chunks = [batch[i:i + size] for i in range(0, len(batch), size)]
+
+        # 某一批处理异常时只跳过该批（保持未处理状态），不影响已成功的批次
+        results: Dict[int, Dict] = {}
+        futures = [executor.submit(self.llm_batch.process, chunk) for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            try:
+                results.update(future.result())
+            except Exception as e:
+                logger.error(f"批量处理失败（{len(chunk)}篇）: {e}")
+
+        updates = []
+        for article in batch:
+            result = results.get(article["id"])
+            if result is None:
+                continue
+            try:
+                importance_score = self.scorer.score(article, source_weight=0.2)
+            except Exception as e:
+                logger.error(f"评分失败 {article['id']}: {e}")
+                continue
+            updates.append(dict(result, id=article["id"], importance_score=importance_score, is_processed=True))
+        return updates
+
+    def _fetch_batch(self, after_id: int) -> List[Dict]:
+        """读取一批未处理的新闻（按ID递增，单次运行中每条只尝试一次；失败次数达到上限的不再读取）"""
+        attempts = func.coalesce(News.enrich_attempts, 0)
+        rows = self.db.query(
+            News.id, News.title, News.content, News.published_at, attempts
+        ).filter(
+            News.is_processed == False,
+            News.id > after_id,
+            attempts < self.max_attempts
+        ).order_by(News.id).limit(self.batch_size).all()
+
+        return [{
+            "id": news_id,
+            "title": title,
+            "content": content or "",
+            "published_at": published_at,
+            "attempts": attempts,
+        } for news_id, title, content, published_at, attempts in rows]
+
+    def _record_failures(self, articles: List[Dict]):
+        """记录处理失败的新闻（失败次数加一，调用方负责提交事务）"""
+        self.db.execute(
+            update(News)
+            .where(News.id.in_([article["id"] for article in articles]))
+            .values(enrich_attempts=func.coalesce(News.enrich_attempts, 0) + 1)
+        )
+        for article in articles:
+            if article["attempts"] + 1 >= self.max_attempts:
+                logger.warning(f"文章 {article['id']} 连续 {self.max_attempts} 次处理失败，不再重试")
+
+    def run_pending(self) -> int:
+        """
+        处理所有未处理的新闻
+
+        Returns:
+            int: 成功处理的数量
+        """
+        if not _run_lock.acquire(blocking=False):
+            logger.info("已有增强任务在运行，跳过本次执行")
+            return 0
+
+        try:
+            total = 0
+            last_id = 0
+
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="enrich") as executor:
+                while True:
+                    batch = self._fetch_batch(last_id)
+                    if not batch:
+                        break
+                    last_id = batch[-1]["id"]
+                    # 结束读事务，调用LLM期间不占用写连接
+                    self.db.commit()
+
+                    if self.llm_batch:
+                        updates = self._enrich_with_llm_batch(batch, executor)
+                    else:
+                        updates = [result for result in executor.map(self._enrich, batch) if result]
+                    updated_ids = {result["id"] for result in updates}
+                    failed = [article for article in batch if article["id"] not in updated_ids]
+                    if updates or failed:
+                        with timed("enrichment_commit"):
+                            if updates:
+                                # 分类和评分变化，先扣除旧的统计再计入新的
+                                remove_from_daily_stats(self.db, list(updated_ids))
+                                self.db.bulk_update_mappings(News, updates)
+                                add_to_daily_stats(self.db, list(updated_ids))
+                            if failed:
+                                self._record_failures(failed)
+                            self.db.commit()
+                        total += len(updates)
+
+            if total:
+                logger.info(f"增强任务完成：处理 {total} 条新闻")
+                invalidate_response_cache()
+            if self.translation_cache is not None:
+                logger.info(f"翻译缓存统计: {self.translation_cache.stats()}")
+            return total
+
+        except Exception as e:
+            logger.error(f"增强任务失败: {e}")
+            self.db.rollback()
+            return 0
+
+        finally:
+            _run_lock.release()
+
+
+def run_enrichment(config: Dict) -> int:
+    """使用独立会话运行一次增强任务（供定时任务调用）"""
+    db = SessionLocal()
+    try:
+        with pipeline_run("enrichment"):
+            processed = EnrichmentWorker(db, config).run_pending()
+            if processed:
+                # 评分变化后重新计算精选
+                featured_config = config.get("processing", {}).get("featured", {})
+                with timed("featured"):
+                    refresh_featured(
+                        db,
+                        percentile=featured_config.get("percentile", 0.1),
+                        window_days=featured_config.get("window_days", 7)
+                    )
+                    db.commit()
+                invalidate_response_cache()
+        return processed
+    finally:
+        db.close()
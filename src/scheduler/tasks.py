@@ -5,16 +5,23 @@ import yaml
 import os
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
 
-from src.database import SessionLocal, init_db
+from src.database import SessionLocal, migrate_db, insert_ignore_conflicts, add_to_daily_stats, refresh_featured
 from src.models.news import News, NewsSource
-from src.scrapers import RSSScraper, WebScraper
-from src.processors import Deduplicator, Classifier, Summarizer, Scorer
+from src.scrapers import RSSScraper, WebScraper, ConcurrentFetcher, SourceWatermark
+from src.scrapers.parsing import configure_parsing
+from src.processors import Deduplicator
+from src.scheduler.enrichment import EnrichmentWorker, run_enrichment
 from src.utils.logger import get_logger
+from src.utils.helpers import normalize_url
+from src.utils.http import configure_http
+from src.utils.cache import invalidate_response_cache
+from src.utils.timing import pipeline_run, timed
 
 logger = get_logger(__name__)
 
@@ -23,18 +30,17 @@ class ScrapeTask:
     """爬取任务"""
     
     def __init__(self):
+        migrate_db()
         self.db: Session = SessionLocal()
         self.config = self._load_config()
-        self.deduplicator = Deduplicator(self.db)
-        self.classifier = Classifier(self.db)
-        
-        # 从配置中读取摘要设置
-        summarization_config = self.config.get("processing", {}).get("summarization", {})
-        self.summarizer = Summarizer(
-            max_length=summarization_config.get("max_length", 200),
-            translate_to_chinese=summarization_config.get("translate_to_chinese", True)
+        configure_http(self.config)
+        configure_parsing(self.config)
+        processing_config = self.config.get("processing", {})
+        self.deduplicator = Deduplicator(
+            self.db,
+            threshold=processing_config.get("deduplication_threshold", 0.85)
         )
-        self.scorer = Scorer()
+        self.enricher = EnrichmentWorker(self.db, self.config)
     
     def _load_config(self) -> Dict:
         """加载配置"""
@@ -54,144 +60,182 @@ class ScrapeTask:
             self.db.refresh(source)
         return source
     
-    def scrape_all(self):
+    def _save_feed_cache(self, source: NewsSource, scraper: RSSScraper):
+        """记录RSS源的条件请求缓存（ETag / Last-Modified / 内容哈希，调用方负责提交事务）"""
+        source.etag = scraper.etag
+        source.last_modified = scraper.last_modified
+        source.content_hash = scraper.content_hash
+    
+    def _save_watermark(self, source: NewsSource, watermark: SourceWatermark):
+        """推进来源的增量抓取水位（本次读取到的条目入库后才视为已抓取，调用方负责提交事务）"""
+        watermark.advance()
+        source.last_published_at = watermark.last_published_at
+        source.seen_guids = watermark.seen_guids_json()
+    
+    def scrape_all(self) -> Dict[str, int]:
+        """
+        执行所有爬取任务（各阶段耗时记录在本次运行中）
+        
+        Returns:
+            dict: {"scraped": 抓取数量, "saved": 写入数量}
+        """
+        with pipeline_run("scrape"):
+            return self._scrape_all()
+    
+    def _scrape_all(self) -> Dict[str, int]:
         """执行所有爬取任务"""
         logger.info("开始执行爬取任务...")
         
         sources_config = self.config.get("sources", {})
+        scraping_config = self.config.get("scraping", {})
         total_scraped = 0
         total_saved = 0
         
+        # 每次运行重建去重索引（任务实例会被定时任务复用）
+        self.deduplicator.build_index()
+        
+        # 构建爬虫列表
+        scrapers = []
+        source_types = {}
+        
+        # 已有来源（用于读取条件请求缓存和增量抓取水位）
+        known_sources = {source.name: source for source in self.db.query(NewsSource).all()}
+        max_guids = scraping_config.get("watermark_max_guids", 200)
+        tolerance = timedelta(hours=scraping_config.get("watermark_tolerance_hours", 24))
+        
         # RSS源
         for rss_config in sources_config.get("rss", []):
             if not rss_config.get("enabled", True):
                 continue
-            
-            try:
-                scraper = RSSScraper(
-                    name=rss_config["name"],
-                    url=rss_config["url"]
-                )
-                articles = scraper.scrape()
-                total_scraped += len(articles)
-                
-                saved = self._process_articles(articles, rss_config["name"], rss_config["url"], "rss")
-                total_saved += saved
-                
-            except Exception as e:
-                logger.error(f"爬取RSS源失败 {rss_config['name']}: {e}")
+            known = known_sources.get(rss_config["name"])
+            scrapers.append(RSSScraper(
+                name=rss_config["name"],
+                url=rss_config["url"],
+                etag=known.etag if known else None,
+                last_modified=known.last_modified if known else None,
+                content_hash=known.content_hash if known else None,
+                max_entries=scraping_config.get("feed_max_entries", 50),
+                watermark=SourceWatermark.from_source(known, max_guids, tolerance),
+                streaming=scraping_config.get("feed_streaming", True)
+            ))
+            source_types[rss_config["name"]] = "rss"
         
         # Web源
         for web_config in sources_config.get("web", []):
             if not web_config.get("enabled", True):
                 continue
+            scrapers.append(WebScraper(
+                name=web_config["name"],
+                url=web_config["url"],
+                selectors=web_config.get("selectors", {}),
+                watermark=SourceWatermark.from_source(known_sources.get(web_config["name"]), max_guids, tolerance)
+            ))
+            source_types[web_config["name"]] = "web"
+        
+        # 结束读事务，等待抓取期间不占用写连接
+        self.db.commit()
+        
+        # 并发抓取，按完成顺序在当前线程内处理入库（数据库会话不跨线程共享）
+        fetcher = ConcurrentFetcher(
+            max_workers=scraping_config.get("max_workers", 8),
+            per_host_limit=scraping_config.get("per_host_limit", 2)
+        )
+        for scraper, articles, error in fetcher.fetch_all(scrapers):
+            source_type = source_types[scraper.name]
+            if error:
+                logger.error(f"爬取{source_type.upper()}源失败 {scraper.name}: {error}")
+                continue
+            
+            # 源未更新（304或内容哈希一致），跳过整个处理流程
+            if getattr(scraper, "not_modified", False):
+                continue
             
             try:
-                scraper = WebScraper(
-                    name=web_config["name"],
-                    url=web_config["url"],
-                    selectors=web_config.get("selectors", {})
-                )
-                articles = scraper.scrape()
                 total_scraped += len(articles)
-                
-                saved = self._process_articles(articles, web_config["name"], web_config["url"], "web")
-                total_saved += saved
-                
+                total_saved += self._process_articles(
+                    articles, scraper.name, scraper.url, source_type, scraper.watermark,
+                    feed_cache=scraper if source_type == "rss" else None
+                )
             except Exception as e:
-                logger.error(f"爬取Web源失败 {web_config['name']}: {e}")
+                logger.error(f"处理{source_type.upper()}源失败 {scraper.name}: {e}")
         
         logger.info(f"爬取任务完成：抓取 {total_scraped} 条，保存 {total_saved} 条")
+        if total_saved:
+            invalidate_response_cache()
+        
+        # 补全分类、摘要、翻译和评分（原始文章已入库，API此时已可查询到）
+        self.enricher.run_pending()
         
         # 标记精选新闻
         self._mark_featured()
+        invalidate_response_cache()
         
         self.db.close()
+        return {"scraped": total_scraped, "saved": total_saved}
     
-    def _process_articles(self, articles: List[Dict], source_name: str, source_url: str, source_type: str) -> int:
-        """处理文章列表"""
+    def _process_articles(self, articles: List[Dict], source_name: str, source_url: str, source_type: str,
+                          watermark: Optional[SourceWatermark] = None,
+                          feed_cache: Optional[RSSScraper] = None) -> int:
+        """
+        处理文章列表（去重后写入原始文章）
+        
+        增量抓取水位和RSS源的条件请求缓存与文章在同一事务中提交：提交失败时都不保存，
+        下次抓取仍会重新获取这些文章。
+        
+        Raises:
+            Exception: 提交事务失败（已回滚）
+        """
         # 去重
-        unique_articles = self.deduplicator.mark_duplicates(articles)
+        with timed("dedup", source_name):
+            unique_articles = self.deduplicator.mark_duplicates(articles)
         
         # 获取或创建来源
         source = self._get_or_create_source(source_name, source_url, source_type)
         
-        saved_count = 0
-        
-        for article in unique_articles:
-            try:
-                # 分类
-                category_id = self.classifier.classify(article)
-                
-                # 生成摘要（返回原文和翻译）
-                summary_result = self.summarizer.summarize(article)
-                summary_original = summary_result.get("original", "")
-                summary_translated = summary_result.get("translated")
-                
-                # 翻译标题
-                title_original = article["title"]
-                title_translated = self.summarizer.translate_title(title_original)
-                
-                # 计算重要性评分
-                importance_score = self.scorer.score(article, source_weight=0.2)
-                
-                # 创建新闻记录
-                news = News(
-                    title=title_original,
-                    title_translated=title_translated,
-                    content=article.get("content", ""),
-                    summary=summary_original,
-                    summary_translated=summary_translated,
-                    url=article["url"],
-                    image_url=article.get("image_url"),
-                    source_id=source.id,
-                    category_id=category_id,
-                    author=article.get("author"),
-                    published_at=article.get("published_at", datetime.utcnow()),
-                    importance_score=importance_score,
-                    is_processed=True
-                )
-                
-                self.db.add(news)
-                saved_count += 1
-                
-            except Exception as e:
-                logger.error(f"处理文章失败: {e}")
-                # 如果是唯一约束错误（重复URL），回滚当前事务继续
-                if "UNIQUE constraint" in str(e) or "IntegrityError" in str(type(e).__name__):
-                    self.db.rollback()
-                continue
+        # 只写入原始文章，分类、摘要、翻译和评分由增强任务异步补全
+        rows = [{
+            "title": article["title"],
+            "content": article.get("content", ""),
+            "url": article["url"],
+            "url_normalized": article.get("url_normalized") or normalize_url(article["url"]),
+            "image_url": article.get("image_url"),
+            "source_id": source.id,
+            "author": article.get("author"),
+            "published_at": article.get("published_at") or datetime.utcnow(),
+            "is_processed": False,
+        } for article in unique_articles]
         
+        # 批量写入，URL冲突的行跳过，不影响其余行
         try:
-            self.db.commit()
-        except Exception as e:
-            logger.error(f"提交事务失败: {e}")
+            with timed("commit", source_name):
+                inserted_ids = insert_ignore_conflicts(self.db, News, rows)
+                add_to_daily_stats(self.db, inserted_ids)
+                if watermark is not None:
+                    self._save_watermark(source, watermark)
+                if feed_cache is not None:
+                    self._save_feed_cache(source, feed_cache)
+                self.db.commit()
+        except Exception:
             self.db.rollback()
+            raise
+        self.deduplicator.commit_pending()
+        
+        skipped = len(rows) - len(inserted_ids)
+        if skipped:
+            logger.info(f"{source_name}: 写入 {len(inserted_ids)} 条，跳过 {skipped} 条已存在的新闻")
         
-        return saved_count
+        return len(inserted_ids)
     
     def _mark_featured(self):
-        """标记精选新闻（评分最高的前10%）"""
-        # 获取最近7天的新闻
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_news = self.db.query(News).filter(
-            News.published_at >= week_ago,
-            News.is_featured == False
-        ).all()
-        
-        if not recent_news:
-            return
-        
-        # 按评分排序
-        sorted_news = sorted(recent_news, key=lambda x: x.importance_score, reverse=True)
-        
-        # 标记前10%为精选
-        featured_count = max(1, len(sorted_news) // 10)
-        for news in sorted_news[:featured_count]:
-            news.is_featured = True
-        
-        self.db.commit()
-        logger.info(f"标记了 {featured_count} 条精选新闻")
+        """重新计算精选新闻（最近N天评分前百分之几，每次运行重新计算）"""
+        featured_config = self.config.get("processing", {}).get("featured", {})
+        with timed("featured"):
+            refresh_featured(
+                self.db,
+                percentile=featured_config.get("percentile", 0.1),
+                window_days=featured_config.get("window_days", 7)
+            )
+            self.db.commit()
 
 
 def setup_scheduler():
@@ -223,5 +267,19 @@ def setup_scheduler():
         )
         
         logger.info(f"定时任务已设置：每天 {time_str} 执行")
+        
+        # 定期补全未处理的新闻（爬取后未完成或失败的部分）
+        enrichment_config = config.get("processing", {}).get("enrichment", {})
+        interval_minutes = enrichment_config.get("interval_minutes", 10)
+        scheduler.add_job(
+            run_enrichment,
+            args=[config],
+            trigger=IntervalTrigger(minutes=interval_minutes),
+            id="enrichment",
+            name="新闻内容增强",
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True
+        )
     
     return scheduler
@@ -1,6 +1,7 @@
 from .base import BaseScraper
 from .rss_scraper import RSSScraper
 from .web_scraper import WebScraper
+from .concurrent import ConcurrentFetcher
+from .watermark import SourceWatermark
 
-__all__ = ["BaseScraper", "RSSScraper", "WebScraper"]
-
+__all__ = ["BaseScraper", "RSSScraper", "WebScraper", "ConcurrentFetcher", "SourceWatermark"]
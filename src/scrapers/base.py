@@ -4,9 +4,9 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import List, Dict, Optional
-import requests
 from bs4 import BeautifulSoup
 from src.utils.logger import get_logger
+from src.utils.http import get_http_session
 
 logger = get_logger(__name__)
 
@@ -18,8 +18,9 @@ class BaseScraper(ABC):
         self.name = name
         self.url = url
         self.user_agent = user_agent or "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": self.user_agent})
+        # 共享连接池的会话，请求头按爬虫单独传入
+        self.session = get_http_session()
+        self.headers = {"User-Agent": self.user_agent}
     
     @abstractmethod
     def scrape(self) -> List[Dict]:
@@ -40,7 +41,7 @@ class BaseScraper(ABC):
     def fetch_page(self, url: str, timeout: int = 30) -> Optional[str]:
         """获取网页内容"""
         try:
-            response = self.session.get(url, timeout=timeout)
+            response = self.session.get(url, headers=self.headers, timeout=timeout)
             response.raise_for_status()
             return response.text
         except Exception as e:
@@ -0,0 +1,81 @@
+"""
+并发抓取引擎
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Iterator, Tuple, Optional
+from urllib.parse import urlparse
+from src.scrapers.base import BaseScraper
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ConcurrentFetcher:
+    """并发抓取器（全局并发上限 + 单域名并发上限）"""
+
+    def __init__(self, max_workers: int = 8, per_host_limit: int = 2):
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self._host_semaphores: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        """提取域名"""
+        return urlparse(url).netloc.lower()
+
+    def _host_semaphore(self, url: str) -> threading.Semaphore:
+        """获取域名对应的信号量"""
+        host = self._host(url)
+        with self._lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.Semaphore(self.per_host_limit)
+            return self._host_semaphores[host]
+
+    def _interleave_by_host(self, scrapers: List[BaseScraper]) -> List[BaseScraper]:
+        """按域名轮转排列，避免同域名任务占满线程池后互相等待"""
+        groups: Dict[str, List[BaseScraper]] = {}
+        for scraper in scrapers:
+            groups.setdefault(self._host(scraper.url), []).append(scraper)
+
+        ordered = []
+        queues = list(groups.values())
+        while queues:
+            for queue in queues:
+                ordered.append(queue.pop(0))
+            queues = [queue for queue in queues if queue]
+        return ordered
+
+    def _scrape(self, scraper: BaseScraper) -> List[Dict]:
+        """在域名并发限制内执行单个爬虫"""
+        with self._host_semaphore(scraper.url):
+            return scraper.scrape()
+
+    def fetch_all(self, scrapers: List[BaseScraper]) -> Iterator[Tuple[BaseScraper, List[Dict], Optional[Exception]]]:
+        """
+        并发执行所有爬虫，按完成顺序逐个返回结果
+
+        Args:
+            scrapers: 爬虫列表
+
+        Yields:
+            (scraper, articles, error): 爬虫、抓取结果、异常（成功时为None）
+        """
+        if not scrapers:
+            return
+
+        workers = min(self.max_workers, len(scrapers))
+        logger.info(f"并发抓取 {len(scrapers)} 个源（并发数 {workers}，单域名上限 {self.per_host_limit}）")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as executor:
+            futures = {
+                executor.submit(self._scrape, scraper): scraper
+                for scraper in self._interleave_by_host(scrapers)
+            }
+            for future in as_completed(futures):
+                scraper = futures[future]
+                try:
+                    yield scraper, future.result(), None
+                except Exception as e:
+                    yield scraper, [], e
@@ -0,0 +1,296 @@
+"""
+流式RSS/Atom解析（边下载边解析，达到条数上限或遇到已抓取过的旧条目时提前停止）
+
+使用 lxml 增量解析器逐个产出条目，每个条目处理完即从树中移除，内存占用与源的总大小无关。
+产出的条目为 FeedParserDict，字段与 feedparser 的条目一致（title、link、summary、published、
+author、media_content、links 等），可直接替换 feedparser 的解析结果使用。
+相对链接和 GUID 按源的URL解析，规则与 feedparser 相同（isPermaLink="false" 的 GUID 保持原样）。
+文档不是合法的XML或格式无法识别时抛出 FeedStreamError，由调用方改用 feedparser 解析。
+"""
+import hashlib
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Optional
+from urllib.parse import urljoin
+
+from dateutil import parser as date_parser
+from feedparser import FeedParserDict
+from lxml import etree
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+RSS1_NS = "http://purl.org/rss/1.0/"
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+MEDIA_NS = "http://search.yahoo.com/mrss/"
+
+# 条目元素：RSS 2.0 <item>、RSS 1.0 <rss:item>、Atom <entry>
+ENTRY_TAGS = {"item", f"{{{RSS1_NS}}}item", f"{{{ATOM_NS}}}entry"}
+# 可识别的根元素
+ROOT_TAGS = {"rss", f"{{{RDF_NS}}}RDF", f"{{{ATOM_NS}}}feed"}
+
+# 计算内容哈希的原文长度
+HASH_PREFIX_BYTES = 64 * 1024
+
+
+class FeedStreamError(Exception):
+    """流式解析失败（需改用 feedparser）"""
+
+
+def _text(element) -> str:
+    """元素的全部文本（包含子元素，如 Atom 的 xhtml 内容）"""
+    return "".join(element.itertext()).strip()
+
+
+def _resolve(base_url: str, uri: str) -> str:
+    """按源的URL解析相对地址"""
+    try:
+        return urljoin(base_url, uri)
+    except ValueError:
+        return uri
+
+
+def _parse_entry(element, base_url: str = "") -> FeedParserDict:
+    """将条目元素转换为与 feedparser 一致的字段"""
+    entry = FeedParserDict()
+    links: List[FeedParserDict] = []
+    media: List[FeedParserDict] = []
+    content = None
+    # 可作为链接的 GUID（条目没有链接时使用）
+    guid_link = None
+
+    # RSS 1.0 条目的标识
+    about = element.get(f"{{{RDF_NS}}}about")
+    if about:
+        entry["id"] = _resolve(base_url, about)
+
+    for child in element:
+        tag = child.tag
+        if not isinstance(tag, str):
+            continue  # 注释、处理指令
+        namespace, _, name = tag[1:].partition("}") if tag.startswith("{") else ("", "", tag)
+
+        if name == "title" and namespace in ("", ATOM_NS, RSS1_NS):
+            entry["title"] = _text(child)
+        elif name == "link" and namespace == ATOM_NS:
+            rel = child.get("rel", "alternate")
+            href = _resolve(base_url, child.get("href", ""))
+            links.append(FeedParserDict(rel=rel, href=href, type=child.get("type", "")))
+            if rel == "alternate" and "link" not in entry:
+                entry["link"] = href
+        elif name == "link" and namespace in ("", RSS1_NS):
+            entry["link"] = _resolve(base_url, _text(child))
+        elif name in ("description", "summary") and namespace in ("", ATOM_NS, RSS1_NS):
+            entry["summary"] = _text(child)
+        elif (name == "encoded" and namespace == CONTENT_NS) or (name == "content" and namespace == ATOM_NS):
+            content = _text(child)
+        elif (name == "pubDate" and namespace == "") or (name == "published" and namespace == ATOM_NS):
+            entry.setdefault("published", _text(child))
+        elif (name == "updated" and namespace == ATOM_NS) or (name == "date" and namespace == DC_NS):
+            # feedparser 将 dc:date 视为更新时间
+            entry.setdefault("updated", _text(child))
+        elif name == "author" and namespace == ATOM_NS:
+            author_name = child.find(f"{{{ATOM_NS}}}name")
+            entry["author"] = _text(author_name if author_name is not None else child)
+        elif (name == "author" and namespace == "") or (name == "creator" and namespace == DC_NS):
+            entry.setdefault("author", _text(child))
+        elif name == "guid" and namespace == "":
+            if child.get("isPermaLink", "true").lower() == "false":
+                entry["id"] = _text(child)
+            else:
+                entry["id"] = guid_link = _resolve(base_url, _text(child))
+        elif name == "id" and namespace == ATOM_NS:
+            entry["id"] = guid_link = _resolve(base_url, _text(child))
+        elif name == "enclosure" and namespace == "":
+            links.append(FeedParserDict(rel="enclosure", href=child.get("url", ""), type=child.get("type", "")))
+        elif name in ("content", "thumbnail") and namespace == MEDIA_NS and child.get("url"):
+            media.append(FeedParserDict(
+                url=child.get("url"),
+                type=child.get("type") or ("image" if name == "thumbnail" else ""),
+                medium=child.get("medium", "")
+            ))
+
+    # 没有链接时使用 GUID、没有摘要时使用正文（与 feedparser 相同）
+    if "link" not in entry and guid_link:
+        entry["link"] = guid_link
+    if "summary" not in entry and content:
+        entry["summary"] = content
+    if content:
+        entry["content"] = [FeedParserDict(value=content)]
+    if links:
+        entry["links"] = links
+    if media:
+        entry["media_content"] = media
+    return entry
+
+
+def iter_feed_entries(chunks: Iterable[bytes], consumed: Optional[Callable[[bytes], None]] = None,
+                      base_url: str = "") -> Iterator[FeedParserDict]:
+    """
+    增量解析RSS/Atom文档，逐个产出条目
+
+    Args:
+        chunks: 文档内容的分块（如 response.iter_content()）
+        consumed: 每读取一块时调用（用于计算哈希、保留原文以便回退）
+        base_url: 源的URL（用于解析相对链接）
+
+    Raises:
+        FeedStreamError: 文档不是合法的XML，或根元素不是 RSS / RDF / Atom
+    """
+    parser = etree.XMLPullParser(events=("start", "end"), resolve_entities=False, no_network=True)
+    root_checked = False
+    try:
+        for chunk in chunks:
+            if consumed is not None:
+                consumed(chunk)
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if not root_checked:
+                    if element.tag not in ROOT_TAGS:
+                        raise FeedStreamError(f"无法识别的根元素: {element.tag}")
+                    root_checked = True
+
+                if event != "end" or element.tag not in ENTRY_TAGS:
+                    continue
+
+                yield _parse_entry(element, base_url)
+
+                # 释放已处理的条目
+                element.clear()
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+        parser.close()
+    except etree.XMLSyntaxError as e:
+        raise FeedStreamError(f"XML解析失败: {e}") from e
+
+    if not root_checked:
+        raise FeedStreamError("文档为空")
+
+
+def entry_datetime(entry) -> Optional[datetime]:
+    """条目的发布时间（与入库时一致，去掉时区信息）；无法解析时返回None"""
+    value = entry.get("published") or entry.get("updated")
+    if not value:
+        return None
+    try:
+        return date_parser.parse(value).replace(tzinfo=None)
+    except (ValueError, OverflowError):
+        return None
+
+
+class EntrySelection(list):
+    """take_entries 选出的条目，并记录读取是如何结束的"""
+
+    def __init__(self):
+        super().__init__()
+        self.stopped_at_watermark = False  # 倒序源中遇到旧条目而停止（之后的内容都是旧条目，未读取）
+        self.ascending = False  # 出现过比前一个条目更新的条目（按时间正序排列，新条目可能在末尾）
+
+
+def take_entries(entries: Iterable, limit: int, since: Optional[datetime] = None) -> EntrySelection:
+    """
+    按顺序读取条目，达到上限或到达已抓取过的条目时停止
+
+    源通常按时间倒序排列：发布时间早于 since 的条目出现在较新的条目之后时，其后都是旧条目，停止读取。
+    按时间正序排列的源（旧条目在前）不会提前停止，旧条目逐条跳过。没有发布时间的条目视为新条目。
+
+    Args:
+        entries: 条目（可以是流式解析的迭代器，停止读取后不再继续解析）
+        limit: 最多返回的条目数
+        since: 该源已抓取到的最新发布时间
+    """
+    selected = EntrySelection()
+    if limit <= 0:
+        return selected
+
+    previous = None
+    for entry in entries:
+        published = entry_datetime(entry) if since is not None else None
+        if published is not None and previous is not None and published > previous:
+            selected.ascending = True
+        if published is not None and published < since:
+            if previous is not None and previous >= published:
+                selected.stopped_at_watermark = True
+                break
+            previous = published
+            continue
+
+        previous = published if published is not None else previous
+        selected.append(entry)
+        if len(selected) >= limit:
+            break
+    return selected
+
+
+class StreamedFeed:
+    """
+    流式读取一个RSS源的响应（记录读取的原文，以便计算哈希或回退到 feedparser）
+
+    内容哈希默认覆盖完整的原文。倒序源在旧条目处停止读取时，之后的内容都是已抓取过的旧条目，
+    只需比较原文开头的 HASH_PREFIX_BYTES 字节（有 Content-Length 时一并计入），不再下载剩余部分；
+    正序源的新条目出现在末尾，不能只比较开头。
+    """
+
+    def __init__(self, chunks: Iterable[bytes], base_url: str = "", content_length: Optional[str] = None):
+        self._chunks = iter(chunks)
+        self.base_url = base_url
+        self.content_length = content_length
+        self._buffer: List[bytes] = []
+        self._hash = hashlib.sha256()
+        self._prefix_hash = None  # 读取到 HASH_PREFIX_BYTES 字节时的哈希
+        self._hashed = 0
+        self.exhausted = False
+
+    def _pull(self) -> bool:
+        """从响应中再读取一块（没有剩余内容时返回False）"""
+        for chunk in self._chunks:
+            self._buffer.append(chunk)
+            remaining = HASH_PREFIX_BYTES - self._hashed
+            if 0 < remaining <= len(chunk):
+                self._hash.update(chunk[:remaining])
+                self._prefix_hash = self._hash.copy()
+                self._hash.update(chunk[remaining:])
+            else:
+                self._hash.update(chunk)
+            self._hashed += len(chunk)
+            return True
+        self.exhausted = True
+        return False
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        """依次产出原文分块（包括计算哈希时已读取的部分）"""
+        position = 0
+        while position < len(self._buffer) or self._pull():
+            yield self._buffer[position]
+            position += 1
+
+    def entries(self) -> Iterator[FeedParserDict]:
+        """流式解析的条目"""
+        return iter_feed_entries(self._iter_chunks(), base_url=self.base_url)
+
+    def read_all(self) -> bytes:
+        """读取完整的原文（回退到 feedparser 时使用）"""
+        while self._pull():
+            pass
+        return b"".join(self._buffer)
+
+    def content_hash(self, prefix_only: bool = False) -> str:
+        """
+        原文的SHA-256（先读取尚未读取的部分）
+
+        Args:
+            prefix_only: 只计算开头 HASH_PREFIX_BYTES 字节（仅用于在旧条目处停止读取的倒序源；
+                原文不足该长度时与完整原文的哈希相同）
+        """
+        if prefix_only:
+            while self._prefix_hash is None and self._pull():
+                pass
+            if self._prefix_hash is not None:
+                digest = self._prefix_hash.copy()
+                if self.content_length:
+                    digest.update(f"\n{self.content_length}".encode())
+                return digest.hexdigest()
+
+        self.read_all()
+        return self._hash.hexdigest()
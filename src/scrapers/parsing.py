@@ -0,0 +1,368 @@
+"""
+HTML解析（CPU密集，在进程池中执行，不受GIL限制）
+
+网页文档整体发送到工作进程，返回普通的文章字典；工作进程数读取 config.yaml 中的 scraping.parse_workers，
+未设置时按CPU核数，单核或设置为0时在调用线程中解析。进程池在首次使用时创建，各次运行复用。
+工作进程中的函数不写日志，错误信息随结果返回，由调用方记录。
+
+网页的CSS选择器在创建爬虫时用 cssselect 编译为XPath，直接在 lxml 树上求值；
+cssselect 不支持的选择器（如 :has()）仍使用 BeautifulSoup 解析。
+"""
+import html as html_lib
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from cssselect import HTMLTranslator
+from dateutil import parser as date_parser
+from lxml import etree
+from lxml import html as lxml_html
+
+from src.utils.helpers import clean_text, load_config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# <img> 标签开头和其后的一个属性（属性名、双引号/单引号/无引号的值）
+IMG_TAG_PATTERN = re.compile(r"<img(?=[\s/>])", re.IGNORECASE)
+ATTRIBUTE_PATTERN = re.compile(r"""\s*([^\s"'=<>/]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?""")
+TAG_END_PATTERN = re.compile(r"\s*/?>")
+
+# 网页选择器未配置时的默认值
+DEFAULT_SELECTORS = {
+    "item": "article",
+    "title": "h2 a",
+    "link": "a",
+    "content": "p",
+    "date": "time",
+    "image": "img",
+}
+
+# 元素的文本（与 BeautifulSoup 的 get_text() 相同，不含注释）
+STRING_VALUE = etree.XPath("string()")
+
+
+def find_image_src(html: str) -> Optional[str]:
+    """
+    第一个 <img> 标签的 src（对格式正常的HTML，与 BeautifulSoup(html, "html.parser").find("img") 的结果一致）
+
+    先用正则逐个读取第一个 <img> 的属性；标签写法不规范（无法读到标签结尾）或前面有注释时，再完整解析。
+    """
+    if not html:
+        return None
+
+    tag = IMG_TAG_PATTERN.search(html)
+    if tag is None:
+        return None
+
+    if "<!--" not in html[:tag.start()]:
+        position = tag.end()
+        src = None
+        while True:
+            attribute = ATTRIBUTE_PATTERN.match(html, position)
+            if attribute is None or attribute.end() == position:
+                break
+            name, double_quoted, single_quoted, unquoted = attribute.groups()
+            if name.lower() == "src":
+                # 重复的属性以最后一个为准（与 BeautifulSoup 相同）
+                src = next((value for value in (double_quoted, single_quoted, unquoted) if value is not None), "")
+            position = attribute.end()
+
+        if TAG_END_PATTERN.match(html, position):
+            return html_lib.unescape(src) if src else None
+
+    img = BeautifulSoup(html, "html.parser").find("img")
+    return (img.get("src") or None) if img else None
+
+
+def _parse_date(date_str: str) -> Optional[datetime]:
+    """解析日期（无法解析时返回None）"""
+    try:
+        return date_parser.parse(date_str)
+    except (ValueError, OverflowError):
+        return None
+
+
+def _make_article(base_url: str, title: str, url: str, content: Optional[str],
+                  date_text: Optional[str], image_url: str) -> Optional[Dict]:
+    """由文章项中提取的原始文本生成文章（缺少标题或链接时返回None）"""
+    title = clean_text(title)
+
+    # 处理相对URL
+    if url and not url.startswith("http"):
+        url = urljoin(base_url, url)
+
+    if not title or not url:
+        return None
+
+    return {
+        "title": title,
+        "content": clean_text(content) if content is not None else "",
+        "url": url,
+        "published_at": _parse_date(date_text) if date_text is not None else datetime.utcnow(),
+        "image_url": image_url,
+    }
+
+
+def extract_web_articles_soup(html: str, base_url: str, selectors: Dict[str, str],
+                              limit: int = 50) -> Tuple[List[Dict], List[str]]:
+    """
+    用 BeautifulSoup 按CSS选择器从网页中提取文章（可在工作进程中执行）
+
+    Args:
+        html: 网页内容
+        base_url: 网页URL（用于解析相对链接）
+        selectors: 选择器配置（item、title、link、content、date、image）
+        limit: 最多提取的文章数
+
+    Returns:
+        (articles, errors): 文章列表、处理失败的文章项的错误信息
+    """
+    selectors = {**DEFAULT_SELECTORS, **selectors}
+    soup = BeautifulSoup(html, "lxml")
+    articles = []
+    errors = []
+
+    for item in soup.select(selectors["item"])[:limit]:
+        try:
+            title_elem = item.select_one(selectors["title"])
+            link_elem = item.select_one(selectors["link"])
+            if not title_elem or not link_elem:
+                continue
+
+            content_elem = item.select_one(selectors["content"])
+            date_elem = item.select_one(selectors["date"])
+            img_elem = item.select_one(selectors["image"])
+
+            article = _make_article(
+                base_url,
+                title_elem.get_text(),
+                link_elem.get("href", ""),
+                content_elem.get_text() if content_elem else None,
+                date_elem.get_text() if date_elem else None,
+                img_elem.get("src", "") if img_elem else "",
+            )
+            if article:
+                articles.append(article)
+
+        except Exception as e:
+            errors.append(str(e))
+
+    return articles, errors
+
+
+def compile_selectors(selectors: Dict[str, str]) -> Dict[str, str]:
+    """
+    将来源的CSS选择器编译为XPath（创建爬虫时编译一次；结果为字符串，可发送到工作进程）
+
+    XPath 在整个文档上求值：与 BeautifulSoup 的 select_one 相同，选择器中的祖先部分可以匹配文章项外的元素
+    （如文章项为 article 时的 "main h2 a"）。
+
+    Raises:
+        cssselect.SelectorError: 选择器有语法错误或 cssselect 不支持
+    """
+    translator = HTMLTranslator()
+    return {
+        field: translator.css_to_xpath(selectors.get(field, default))
+        for field, default in DEFAULT_SELECTORS.items()
+    }
+
+
+@lru_cache(maxsize=256)
+def _compiled_xpath(expression: str) -> etree.XPath:
+    """编译后的XPath（按表达式缓存，每个进程只编译一次）"""
+    return etree.XPath(expression)
+
+
+def _select_fields(item, matches: Dict[str, set]) -> Dict[str, object]:
+    """
+    按文档顺序查找文章项内各字段第一个匹配的元素（不含文章项本身，与 select_one 相同）
+
+    Args:
+        item: 文章项
+        matches: 字段 -> 在整个文档上匹配到的元素
+    """
+    found = {}
+    for element in item.iterdescendants():
+        for field, elements in matches.items():
+            if field not in found and element in elements:
+                found[field] = element
+        if len(found) == len(matches):
+            break
+    return found
+
+
+def _parse_document(html: str):
+    """用 lxml 解析网页"""
+    try:
+        return lxml_html.document_fromstring(html)
+    except ValueError:
+        # 带编码声明的XHTML不能以字符串解析
+        return lxml_html.document_fromstring(html.encode("utf-8"), parser=lxml_html.HTMLParser(encoding="utf-8"))
+
+
+def extract_web_articles_lxml(html: str, base_url: str, xpaths: Dict[str, str],
+                              limit: int = 50) -> Tuple[List[Dict], List[str]]:
+    """
+    用编译后的XPath在 lxml 树上提取文章（结果与 extract_web_articles_soup 相同，可在工作进程中执行）
+
+    Args:
+        html: 网页内容
+        base_url: 网页URL（用于解析相对链接）
+        xpaths: compile_selectors() 的结果
+        limit: 最多提取的文章数
+
+    Returns:
+        (articles, errors): 文章列表、处理失败的文章项的错误信息
+    """
+    document = _parse_document(html)
+    articles = []
+    errors = []
+
+    items = _compiled_xpath(xpaths["item"])(document)[:limit]
+    # 各字段的选择器在整个文档上只求值一次（没有匹配的字段不参与查找）
+    matches = {}
+    for field in ("title", "link", "content", "date", "image") if items else ():
+        elements = set(_compiled_xpath(xpaths[field])(document))
+        if elements:
+            matches[field] = elements
+
+    for item in items:
+        try:
+            found = _select_fields(item, matches)
+            title_elem = found.get("title")
+            link_elem = found.get("link")
+            if title_elem is None or link_elem is None:
+                continue
+
+            content_elem = found.get("content")
+            date_elem = found.get("date")
+            img_elem = found.get("image")
+
+            article = _make_article(
+                base_url,
+                STRING_VALUE(title_elem),
+                link_elem.get("href", ""),
+                STRING_VALUE(content_elem) if content_elem is not None else None,
+                STRING_VALUE(date_elem) if date_elem is not None else None,
+                img_elem.get("src", "") if img_elem is not None else "",
+            )
+            if article:
+                articles.append(article)
+
+        except Exception as e:
+            errors.append(str(e))
+
+    return articles, errors
+
+
+# 进程池连续异常退出达到该次数后不再使用进程池
+MAX_POOL_FAILURES = 3
+
+# 解析进程池（None 表示尚未读取配置）
+_workers: Optional[int] = None
+_executor: Optional[ProcessPoolExecutor] = None
+_pool_failures = 0
+_lock = threading.Lock()
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    """实际使用的进程数（0 表示在调用线程中解析）"""
+    if workers is None:
+        workers = os.cpu_count() or 1
+        # 单核时进程池只增加序列化开销
+        return workers if workers > 1 else 0
+    return max(0, int(workers))
+
+
+def configure_parsing(config: Dict):
+    """
+    设置解析进程数（在首次解析前调用；未调用时读取 config.yaml）
+
+    Args:
+        config: 完整配置，读取其中的 scraping.parse_workers
+    """
+    global _workers, _executor, _pool_failures
+    workers = _resolve_workers(config.get("scraping", {}).get("parse_workers"))
+    with _lock:
+        if workers == _workers:
+            return
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+        _workers = workers
+        _pool_failures = 0
+    logger.info(f"HTML解析进程数: {workers}" if workers else "HTML解析在抓取线程中执行")
+
+
+def _mp_context():
+    """
+    工作进程的启动方式
+
+    调度器和抓取线程运行中直接 fork 不安全。优先使用 forkserver（预先导入本模块，工作进程从服务进程 fork，
+    只有服务进程需要导入主模块），不支持时使用 spawn。
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    """获取共享的解析进程池（未启用时返回None）"""
+    global _workers, _executor
+    with _lock:
+        if _workers is None:
+            _workers = _resolve_workers(load_config().get("scraping", {}).get("parse_workers"))
+        if _workers and _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=_workers, mp_context=_mp_context())
+        return _executor
+
+
+def run_parser(func: Callable, *args):
+    """
+    在解析进程池中执行 func(*args) 并等待结果（未启用进程池时直接调用）
+
+    func 需为模块级函数，参数和返回值需可序列化。工作进程异常退出时本次在调用线程中解析，下次重建进程池；
+    连续多次异常退出（如无法启动工作进程）后不再使用进程池。
+    """
+    global _workers, _executor, _pool_failures
+    executor = _get_executor()
+    if executor is None:
+        return func(*args)
+
+    try:
+        result = executor.submit(func, *args).result()
+    except BrokenProcessPool:
+        with _lock:
+            if _executor is executor:
+                _executor = None
+                _pool_failures += 1
+                if _pool_failures >= MAX_POOL_FAILURES:
+                    _workers = 0
+                    logger.error(f"解析进程连续 {_pool_failures} 次异常退出，改为在抓取线程中解析")
+                else:
+                    logger.warning("解析进程异常退出，下次解析时重建进程池")
+        executor.shutdown(wait=False)
+        return func(*args)
+
+    _pool_failures = 0
+    return result
+
+
+def shutdown_parsing():
+    """关闭解析进程池（应用退出时调用）"""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
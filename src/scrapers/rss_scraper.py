@@ -2,24 +2,27 @@
 RSS爬虫（支持SSL跳过）
 """
 import feedparser
-import urllib.request
 import socket
-import ssl
+import requests
+import urllib3
 from datetime import datetime
 from typing import List, Dict, Optional
 from src.scrapers.base import BaseScraper
+from src.scrapers.parsing import find_image_src
+from src.scrapers.feed_stream import FeedStreamError, StreamedFeed, entry_datetime, take_entries
+from src.scrapers.watermark import SourceWatermark
 from src.utils.logger import get_logger
 from src.utils.helpers import clean_text
+from src.utils.http import get_http_session
+from src.utils.timing import timed
 
 logger = get_logger(__name__)
 
 # 设置全局超时
 socket.setdefaulttimeout(15)
 
-# 创建不验证SSL的上下文（用于证书过期的网站）
-SSL_CONTEXT = ssl.create_default_context()
-SSL_CONTEXT.check_hostname = False
-SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+# 跳过SSL验证时不输出警告（用于证书过期的网站）
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # 浏览器 User-Agent
 USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
@@ -28,97 +31,166 @@ USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36
 class RSSScraper(BaseScraper):
     """RSS源爬虫"""
     
+    def __init__(self, name: str, url: str, user_agent: Optional[str] = None,
+                 etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 content_hash: Optional[str] = None, max_entries: int = 50,
+                 watermark: Optional[SourceWatermark] = None, streaming: bool = True):
+        super().__init__(name, url, user_agent)
+        # 条件请求缓存（来自上次成功抓取）
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+        self.not_modified = False
+        # 最多读取的条目数
+        self.max_entries = max_entries
+        # 增量抓取水位：到达早于已抓取最新发布时间的条目时停止读取，已抓取过的条目不再返回
+        self.watermark = watermark or SourceWatermark()
+        # 流式解析（失败时回退到 feedparser）
+        self.streaming = streaming
+    
     def scrape(self) -> List[Dict]:
         """抓取RSS源"""
         logger.info(f"开始抓取RSS源: {self.name} ({self.url})")
         
         try:
-            # 先尝试普通方式
-            feed = self._fetch_feed()
-            
-            if feed.bozo:
-                logger.warning(f"RSS解析警告: {feed.bozo_exception}")
+            entries = self._fetch_entries()
+            if entries is None:
+                return []
             
             articles = []
+            skipped = 0
             
-            for entry in feed.entries[:50]:  # 限制最多50条
-                try:
-                    article = {
-                        "title": clean_text(entry.get("title", "")),
-                        "content": clean_text(entry.get("summary", "") or entry.get("description", "")),
-                        "url": entry.get("link", ""),
-                        "published_at": self._parse_date(entry.get("published")),
-                        "author": entry.get("author", ""),
-                        "image_url": self._extract_image(entry),
-                    }
+            with timed("extract", self.name):
+                for entry in entries:
+                    # 已抓取过的条目不再进入去重和入库流程（仍记录，避免仍在源中的条目被淘汰出水位）
+                    key = entry.get("id") or entry.get("link")
+                    published_at = entry_datetime(entry)
+                    seen = self.watermark.is_seen(key, published_at)
+                    self.watermark.observe(key, published_at)
+                    if seen:
+                        skipped += 1
+                        continue
+                    
+                    try:
+                        article = {
+                            "title": clean_text(entry.get("title", "")),
+                            "content": clean_text(entry.get("summary", "") or entry.get("description", "")),
+                            "url": entry.get("link", ""),
+                            "published_at": self._parse_date(entry.get("published")),
+                            "author": entry.get("author", ""),
+                            "image_url": self._extract_image(entry),
+                        }
                     
-                    # 验证必要字段
-                    if article["title"] and article["url"]:
-                        articles.append(article)
-                    else:
-                        logger.warning(f"跳过无效文章: {entry.get('title', 'N/A')}")
+                        # 验证必要字段
+                        if article["title"] and article["url"]:
+                            articles.append(article)
+                        else:
+                            logger.warning(f"跳过无效文章: {entry.get('title', 'N/A')}")
                         
-                except Exception as e:
-                    logger.error(f"处理RSS条目失败: {e}")
-                    continue
+                    except Exception as e:
+                        logger.error(f"处理RSS条目失败: {e}")
+                        continue
             
-            logger.info(f"成功抓取 {len(articles)} 条新闻")
+            if skipped:
+                logger.info(f"成功抓取 {len(articles)} 条新闻，跳过 {skipped} 条已抓取过的条目")
+            else:
+                logger.info(f"成功抓取 {len(articles)} 条新闻")
             return articles
             
         except Exception as e:
             logger.error(f"抓取RSS源失败 {self.name}: {e}")
+            # 抓取失败时不保留缓存校验信息，下次完整抓取
+            self.etag = self.last_modified = self.content_hash = None
             return []
     
-    def _fetch_feed(self):
-        """获取RSS feed，支持SSL跳过"""
+    def _fetch_entries(self) -> Optional[List]:
+        """
+        获取RSS条目（条件请求，支持SSL跳过）
+        
+        Returns:
+            list: 需要处理的条目（最多 max_entries 条，不含早于水位的旧条目）；
+                  服务器返回304或内容未变化时返回None
+        """
         headers = {'User-Agent': USER_AGENT}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
         
         # 已知需要SSL跳过的域名
         ssl_skip_domains = ['jiqizhixin.com', 'anthropic.com']
         needs_ssl_skip = any(domain in self.url for domain in ssl_skip_domains)
         
-        # 如果需要SSL跳过，直接使用SSL跳过方式
-        if needs_ssl_skip and self.url.startswith('https'):
-            logger.debug(f"使用SSL跳过模式: {self.name}")
-            try:
-                opener = urllib.request.build_opener(
-                    urllib.request.HTTPSHandler(context=SSL_CONTEXT)
-                )
-                opener.addheaders = [('User-Agent', USER_AGENT)]
-                response = opener.open(self.url, timeout=15)
-                content = response.read()
-                feed = feedparser.parse(content)
-                logger.info(f"SSL跳过模式获取 {len(feed.entries)} 条: {self.name}")
-                return feed
-            except Exception as e:
-                logger.warning(f"SSL跳过失败 {self.name}: {e}")
+        # 响应体边下载边解析（fetch 只包含到收到响应头为止的耗时）
+        with timed("fetch", self.name):
+            if needs_ssl_skip and self.url.startswith('https'):
+                logger.debug(f"使用SSL跳过模式: {self.name}")
+                response = get_http_session(verify=False).get(self.url, headers=headers, timeout=15, stream=True)
+            else:
+                try:
+                    response = self.session.get(self.url, headers=headers, timeout=15, stream=True)
+                except requests.exceptions.SSLError as e:
+                    # 证书有问题时跳过SSL验证重试
+                    logger.warning(f"SSL验证失败，跳过SSL验证重试 {self.name}: {e}")
+                    response = get_http_session(verify=False).get(self.url, headers=headers, timeout=15, stream=True)
         
-        # 普通请求
         try:
-            feed = feedparser.parse(self.url, request_headers=headers)
-            if feed.entries:
-                return feed
-        except Exception as e:
-            logger.debug(f"普通请求失败: {e}")
+            if response.status_code == 304:
+                logger.info(f"RSS源未更新（304）: {self.name}")
+                self.not_modified = True
+                return None
+            
+            response.raise_for_status()
+            
+            with timed("parse", self.name):
+                return self._read_entries(response)
+        finally:
+            response.close()
+    
+    def _read_entries(self, response) -> Optional[List]:
+        """读取并解析响应体（优先流式解析，提前停止时不再下载剩余内容）"""
+        feed = StreamedFeed(response.iter_content(chunk_size=64 * 1024), base_url=response.url,
+                            content_length=response.headers.get('Content-Length'))
         
-        # 如果是HTTPS且普通请求失败，尝试跳过SSL验证
-        if self.url.startswith('https') and not needs_ssl_skip:
+        entries = None
+        if self.streaming:
             try:
-                opener = urllib.request.build_opener(
-                    urllib.request.HTTPSHandler(context=SSL_CONTEXT)
-                )
-                opener.addheaders = [('User-Agent', USER_AGENT)]
-                response = opener.open(self.url, timeout=15)
-                content = response.read()
-                feed = feedparser.parse(content)
-                if feed.entries:
-                    logger.info(f"通过SSL跳过成功获取: {self.name}")
-                return feed
-            except Exception as e:
-                logger.warning(f"SSL跳过也失败: {e}")
+                entries = take_entries(feed.entries(), self.max_entries, self.watermark.stop_before)
+            except FeedStreamError as e:
+                logger.debug(f"流式解析失败，改用feedparser {self.name}: {e}")
+        
+        if entries is None:
+            content = feed.read_all()
+            parsed = feedparser.parse(content, response_headers={
+                'content-location': response.url,
+                'content-type': response.headers.get('Content-Type', ''),
+            })
+            if parsed.bozo:
+                logger.warning(f"RSS解析警告: {parsed.bozo_exception}")
+            entries = take_entries(parsed.entries, self.max_entries, self.watermark.stop_before)
+        
+        # 倒序源在旧条目处停止时只比较原文开头部分的哈希（不再下载剩余的旧条目），其他情况比较完整原文
+        prefix_only = entries.stopped_at_watermark and not entries.ascending
+        if not self._update_cache(response, feed.content_hash(prefix_only=prefix_only)):
+            return None
+        return entries
+    
+    def _update_cache(self, response, content_hash: Optional[str]) -> bool:
+        """
+        记录新的缓存校验信息（入库成功后由调用方持久化）
+        
+        Returns:
+            bool: 内容是否有变化（哈希与上次一致时返回False）
+        """
+        if content_hash is not None and content_hash == self.content_hash:
+            logger.info(f"RSS源内容未变化: {self.name}")
+            self.not_modified = True
+            return False
         
-        # 返回原始解析结果
-        return feedparser.parse(self.url, request_headers=headers)
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        self.content_hash = content_hash
+        return True
     
     def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
         """解析日期"""
@@ -144,13 +216,9 @@ class RSSScraper(BaseScraper):
                 if link.get("type", "").startswith("image"):
                     return link.get("href")
         
-        # 从内容中提取图片
+        # 从内容中提取图片（先用正则扫描，必要时完整解析）
         if hasattr(entry, "summary"):
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(entry.summary, "html.parser")
-            img = soup.find("img")
-            if img and img.get("src"):
-                return img["src"]
+            return find_image_src(entry.summary)
         
         return None
 
@@ -0,0 +1,113 @@
+"""
+来源的增量抓取水位
+
+记录每个来源已抓取到的最新发布时间和最近抓取过的条目标识（RSS的GUID，没有时用链接）。
+爬虫据此在去重之前丢弃已抓取过的条目，稳定运行时只有新内容进入去重和入库流程。
+本次抓取到的条目先暂存，入库成功后再由调用方推进水位并持久化到 NewsSource。
+
+条目是否抓取过只按标识判断；发布时间只用于提示何时停止读取源（提前 tolerance 停止，
+发布时间略早于水位、较晚才出现在源中的条目仍会读取）。水位不超过当前时间，
+发布时间在未来的条目不会使之后的条目都被跳过。
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 默认保留的条目标识数量（应大于单个源一次读取的条目数）
+DEFAULT_MAX_GUIDS = 200
+# 默认的停止读取提前量：发布时间早于水位超过该时长的条目不再读取
+DEFAULT_TOLERANCE = timedelta(hours=24)
+
+
+class SourceWatermark:
+    """单个来源的增量抓取水位"""
+
+    def __init__(self, last_published_at: Optional[datetime] = None,
+                 seen_guids: Optional[Iterable[str]] = None, max_guids: int = DEFAULT_MAX_GUIDS,
+                 tolerance: timedelta = DEFAULT_TOLERANCE):
+        # 之前记录的未来时间（旧版本未限制）按当前时间处理
+        if last_published_at is not None:
+            last_published_at = min(last_published_at, datetime.utcnow())
+        self.last_published_at = last_published_at
+        self.max_guids = max_guids
+        self.tolerance = tolerance
+        # 按抓取顺序保存（dict 保持插入顺序，超出上限时淘汰最早的）
+        self._seen: Dict[str, None] = dict.fromkeys(seen_guids or [])
+        # 本次抓取到、尚未入库的条目
+        self._pending: Dict[str, None] = {}
+        self._pending_latest: Optional[datetime] = None
+
+    @classmethod
+    def from_source(cls, source, max_guids: int = DEFAULT_MAX_GUIDS,
+                    tolerance: timedelta = DEFAULT_TOLERANCE) -> "SourceWatermark":
+        """从 NewsSource 读取水位（source 为 None 时返回空水位）"""
+        if source is None:
+            return cls(max_guids=max_guids, tolerance=tolerance)
+
+        seen_guids: List[str] = []
+        if source.seen_guids:
+            try:
+                seen_guids = json.loads(source.seen_guids)
+            except ValueError:
+                logger.warning(f"来源 {source.name} 的条目标识记录无法解析，已忽略")
+        return cls(source.last_published_at, seen_guids, max_guids, tolerance)
+
+    @property
+    def stop_before(self) -> Optional[datetime]:
+        """读取源时的停止提示：倒序源中发布时间早于该时间的条目之后不再读取（没有水位时为None）"""
+        if self.last_published_at is None:
+            return None
+        return self.last_published_at - self.tolerance
+
+    def is_seen(self, key: Optional[str], published_at: Optional[datetime] = None) -> bool:
+        """
+        条目是否已抓取过
+
+        有标识时只按标识判断（发布时间早于水位、之前没有读取到的条目仍是新条目）；
+        没有标识时，发布时间早于 stop_before 的条目视为已抓取过。
+
+        Args:
+            key: 条目标识（GUID或链接）
+            published_at: 条目自身的发布时间（没有时传None）
+        """
+        if key:
+            return key in self._seen
+        stop_before = self.stop_before
+        if published_at is not None and stop_before is not None:
+            return published_at.replace(tzinfo=None) < stop_before
+        return False
+
+    def observe(self, key: Optional[str], published_at: Optional[datetime] = None):
+        """记录本次读取到的条目（包括已抓取过的，使仍在源中的条目不被淘汰；advance() 后生效）"""
+        if key:
+            self._pending[key] = None
+        if published_at is not None:
+            published_at = published_at.replace(tzinfo=None)
+            if self._pending_latest is None or published_at > self._pending_latest:
+                self._pending_latest = published_at
+
+    def advance(self):
+        """本次抓取的条目入库成功后调用：推进水位"""
+        for key in self._pending:
+            self._seen.pop(key, None)
+            self._seen[key] = None
+        overflow = len(self._seen) - self.max_guids
+        if overflow > 0:
+            for key in list(self._seen)[:overflow]:
+                del self._seen[key]
+
+        if self._pending_latest is not None:
+            latest = min(self._pending_latest, datetime.utcnow())
+            if self.last_published_at is None or latest > self.last_published_at:
+                self.last_published_at = latest
+
+        self._pending = {}
+        self._pending_latest = None
+
+    def seen_guids_json(self) -> str:
+        """条目标识的持久化格式"""
+        return json.dumps(list(self._seen), ensure_ascii=False)
@@ -1,11 +1,13 @@
 """
 网页爬虫
 """
-from datetime import datetime
 from typing import List, Dict, Optional
+from cssselect import SelectorError
 from src.scrapers.base import BaseScraper
+from src.scrapers.parsing import compile_selectors, extract_web_articles_lxml, extract_web_articles_soup, run_parser
+from src.scrapers.watermark import SourceWatermark
 from src.utils.logger import get_logger
-from src.utils.helpers import clean_text
+from src.utils.timing import timed
 
 logger = get_logger(__name__)
 
@@ -13,70 +15,58 @@ logger = get_logger(__name__)
 class WebScraper(BaseScraper):
     """网页爬虫"""
     
-    def __init__(self, name: str, url: str, selectors: Dict[str, str], user_agent: Optional[str] = None):
+    def __init__(self, name: str, url: str, selectors: Dict[str, str], user_agent: Optional[str] = None,
+                 watermark: Optional[SourceWatermark] = None):
         super().__init__(name, url, user_agent)
         self.selectors = selectors  # CSS选择器配置
+        # 选择器在创建爬虫时编译为XPath；cssselect 不支持的选择器使用 BeautifulSoup 解析
+        try:
+            self.xpaths: Optional[Dict[str, str]] = compile_selectors(selectors)
+        except SelectorError as e:
+            logger.warning(f"选择器无法编译为XPath，使用BeautifulSoup解析 {name}: {e}")
+            self.xpaths = None
+        # 增量抓取水位（网页上的日期精度通常只到天，只按链接判断是否抓取过）
+        self.watermark = watermark or SourceWatermark()
     
     def scrape(self) -> List[Dict]:
         """抓取网页"""
         logger.info(f"开始抓取网页: {self.name} ({self.url})")
         
-        html = self.fetch_page(self.url)
+        with timed("fetch", self.name):
+            html = self.fetch_page(self.url)
         if not html:
             return []
         
-        soup = self.parse_html(html)
-        articles = []
+        with timed("parse", self.name):
+            articles = self._extract_articles(html)
+        
+        return self._drop_seen(articles)
+    
+    def _drop_seen(self, articles: List[Dict]) -> List[Dict]:
+        """丢弃已抓取过的文章（仍记录，避免仍在页面上的文章被淘汰出水位）"""
+        fresh = []
+        for article in articles:
+            seen = self.watermark.is_seen(article["url"])
+            self.watermark.observe(article["url"])
+            if not seen:
+                fresh.append(article)
         
+        if len(fresh) < len(articles):
+            logger.info(f"{self.name}: 跳过 {len(articles) - len(fresh)} 条已抓取过的文章")
+        return fresh
+    
+    def _extract_articles(self, html: str) -> List[Dict]:
+        """按选择器从网页中提取文章（在解析进程池中执行）"""
         try:
-            # 根据配置的选择器提取内容
-            # 这里需要根据具体网站结构调整
-            # 示例：假设选择器指向文章列表项
-            items = soup.select(self.selectors.get("item", "article"))
-            
-            for item in items[:50]:  # 限制最多50条
-                try:
-                    title_elem = item.select_one(self.selectors.get("title", "h2 a"))
-                    link_elem = item.select_one(self.selectors.get("link", "a"))
-                    
-                    if not title_elem or not link_elem:
-                        continue
-                    
-                    title = clean_text(title_elem.get_text())
-                    url = link_elem.get("href", "")
-                    
-                    # 处理相对URL
-                    if url and not url.startswith("http"):
-                        from urllib.parse import urljoin
-                        url = urljoin(self.url, url)
-                    
-                    # 提取其他信息
-                    content_elem = item.select_one(self.selectors.get("content", "p"))
-                    content = clean_text(content_elem.get_text()) if content_elem else ""
-                    
-                    date_elem = item.select_one(self.selectors.get("date", "time"))
-                    published_at = self.normalize_date(date_elem.get_text()) if date_elem else datetime.utcnow()
-                    
-                    img_elem = item.select_one(self.selectors.get("image", "img"))
-                    image_url = img_elem.get("src", "") if img_elem else ""
-                    
-                    if title and url:
-                        articles.append({
-                            "title": title,
-                            "content": content,
-                            "url": url,
-                            "published_at": published_at,
-                            "image_url": image_url,
-                        })
-                        
-                except Exception as e:
-                    logger.error(f"处理文章项失败: {e}")
-                    continue
-            
-            logger.info(f"成功抓取 {len(articles)} 条新闻")
-            return articles
-            
+            if self.xpaths is not None:
+                articles, errors = run_parser(extract_web_articles_lxml, html, self.url, self.xpaths)
+            else:
+                articles, errors = run_parser(extract_web_articles_soup, html, self.url, self.selectors)
         except Exception as e:
             logger.error(f"解析网页失败 {self.name}: {e}")
             return []
-
+        
+        for error in errors:
+            logger.error(f"处理文章项失败: {error}")
+        logger.info(f"成功抓取 {len(articles)} 条新闻")
+        return articles
@@ -1,5 +1,6 @@
 from .logger import setup_logger, get_logger
 from .helpers import clean_text, extract_keywords, calculate_similarity
+from .keyword_matcher import KeywordMatcher
 
-__all__ = ["setup_logger", "get_logger", "clean_text", "extract_keywords", "calculate_similarity"]
+__all__ = ["setup_logger", "get_logger", "clean_text", "extract_keywords", "calculate_similarity", "KeywordMatcher"]
 
@@ -0,0 +1,210 @@
+"""
+API响应缓存（进程内，TTL + LRU淘汰）
+
+配置读取 config.yaml 中的 api.cache_enabled / cache_ttl / cache_max_entries。
+其他进程（如 run_scrape.py、独立的调度进程）写入的数据无法通知本进程：每次查询缓存前用路由的数据库会话
+读取 data_version 表中的版本，版本变化后清空缓存。版本与路由的查询在同一个读事务中读取。
+"""
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from src.database.data_version import read_data_version, read_data_version_async
+from src.utils.helpers import load_config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_MISSING = object()
+
+
+class ResponseCache:
+    """
+    响应缓存：条目过期后失效，超出容量时淘汰最久未使用的条目
+
+    每次清空时递增 generation；计算响应前记录 generation，写入时已变化则不写入，
+    避免清空前开始计算的旧响应在清空后写入缓存。
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._route_stats: Dict[str, Dict[str, int]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.generation = 0
+        self.data_version: Optional[int] = None
+
+    def _record(self, route: str, hit: bool):
+        stats = self._route_stats.setdefault(route, {"hits": 0, "misses": 0})
+        if hit:
+            self.hits += 1
+            stats["hits"] += 1
+        else:
+            self.misses += 1
+            stats["misses"] += 1
+
+    def get(self, route: str, key: Hashable) -> Any:
+        """查询缓存，未命中或已过期时返回 _MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._record(route, hit=True)
+                return entry[1]
+
+            if entry is not None:
+                del self._entries[key]
+            self._record(route, hit=False)
+            return _MISSING
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        """写入缓存（generation 为计算响应前读取的值，期间缓存被清空时不写入）"""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """清空缓存（数据变化后调用）"""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._entries.clear()
+        self.invalidations += 1
+        self.generation += 1
+
+    def observe_data_version(self, version: int):
+        """记录读取到的数据版本，与上次不同时清空缓存（首次读取时只记录）"""
+        with self._lock:
+            if version == self.data_version:
+                return
+            if self.data_version is not None:
+                self._clear()
+            self.data_version = version
+
+    def stats(self) -> Dict:
+        """命中统计"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "routes": {route: dict(stats) for route, stats in self._route_stats.items()},
+            }
+
+
+# 进程内共享的缓存实例
+_response_cache: Optional[ResponseCache] = None
+_cache_enabled: Optional[bool] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    获取进程内共享的响应缓存
+
+    Returns:
+        ResponseCache: 缓存实例；配置中关闭缓存时返回None
+    """
+    global _response_cache, _cache_enabled
+
+    if _cache_enabled is None:
+        with _cache_lock:
+            if _cache_enabled is None:
+                api_config = load_config().get("api", {})
+                if api_config.get("cache_enabled", False):
+                    _response_cache = ResponseCache(
+                        ttl=api_config.get("cache_ttl", 3600),
+                        max_entries=api_config.get("cache_max_entries", 1000)
+                    )
+                _cache_enabled = _response_cache is not None
+    return _response_cache
+
+
+def invalidate_response_cache():
+    """数据变化后清空响应缓存"""
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate()
+        logger.debug("响应缓存已清空")
+
+
+def get_response_cache_stats() -> Dict:
+    """响应缓存的命中统计（未启用时返回空统计）"""
+    cache = get_response_cache()
+    if cache is None:
+        return {"enabled": False, "hits": 0, "misses": 0, "hit_rate": 0.0, "size": 0}
+    return dict(cache.stats(), enabled=True)
+
+
+def cached_response(func: Callable) -> Callable:
+    """
+    缓存路由函数的返回值
+
+    缓存键为路由函数和参数值（FastAPI校验并填充默认值后的参数，参数顺序和省略默认值不影响命中），
+    数据库会话参数 db 不参与缓存键，用于在查询缓存前读取数据版本。同时支持同步和异步路由函数，应放在 @router.get 下方。
+    """
+    route = f"{func.__module__}.{func.__qualname__}"
+
+    def make_key(args, kwargs):
+        return (route, args, tuple(sorted((name, value) for name, value in kwargs.items() if name != "db")))
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            cache = get_response_cache()
+            if cache is None:
+                return await func(*args, **kwargs)
+
+            db = kwargs.get("db")
+            if db is not None:
+                cache.observe_data_version(await read_data_version_async(db))
+
+            key = make_key(args, kwargs)
+            value = cache.get(route, key)
+            if value is _MISSING:
+                generation = cache.generation
+                value = await func(*args, **kwargs)
+                cache.set(key, value, generation)
+            return value
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = get_response_cache()
+        if cache is None:
+            return func(*args, **kwargs)
+
+        db = kwargs.get("db")
+        if db is not None:
+            cache.observe_data_version(read_data_version(db))
+
+        key = make_key(args, kwargs)
+        value = cache.get(route, key)
+        if value is _MISSING:
+            generation = cache.generation
+            value = func(*args, **kwargs)
+            cache.set(key, value, generation)
+        return value
+
+    return wrapper
@@ -2,8 +2,24 @@
 工具函数
 """
 import re
-from typing import List, Set
+import yaml
+from pathlib import Path
+from typing import List, Set, Dict
 from difflib import SequenceMatcher
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# URL中的跟踪参数（规范化时移除）
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "spm", "from", "source"}
+
+
+def load_config(config_path: str = "config.yaml") -> Dict:
+    """加载配置文件"""
+    config_file = Path(config_path)
+    if config_file.exists():
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    return {}
 
 
 def clean_text(text: str) -> str:
@@ -68,14 +84,17 @@ def calculate_similarity(text1: str, text2: str) -> float:
 
 
 def normalize_url(url: str) -> str:
-    """规范化URL"""
+    """规范化URL（去除跟踪参数、锚点和末尾斜杠，域名小写）"""
     if not url:
         return ""
     
-    # 移除查询参数中的某些参数（如utm_source等）
-    # 这里简化处理，实际可以更复杂
-    url = url.split('?')[0]
-    url = url.rstrip('/')
+    parts = urlsplit(url.strip())
     
-    return url
-
+    # 只移除跟踪类参数，保留标识文章的参数（如 ?p=123、?id=456）
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAM_PREFIXES) and key.lower() not in TRACKING_PARAMS
+    ]
+    
+    path = parts.path.rstrip('/')
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ""))
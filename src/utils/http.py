@@ -0,0 +1,111 @@
+"""
+共享HTTP客户端（连接池 + keep-alive + 共享TLS上下文）
+
+所有爬虫共用同一组 requests.Session，避免每个请求重新建立TCP连接和TLS握手。
+配置读取 config.yaml 中的 http 部分。
+"""
+import ssl
+import threading
+from typing import Dict, Optional
+
+import certifi
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.ssl_ import create_urllib3_context
+
+from src.utils.helpers import load_config
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+class SharedTLSAdapter(HTTPAdapter):
+    """使用共享 SSLContext 的连接池适配器（CA证书只加载一次）"""
+
+    def __init__(self, ssl_context: ssl.SSLContext, verify: bool = True, **kwargs):
+        self.ssl_context = ssl_context
+        self.verify = verify
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self.ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs["ssl_context"] = self.ssl_context
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    def cert_verify(self, conn, url, verify, cert):
+        # 环境变量 REQUESTS_CA_BUNDLE 会覆盖 session.verify=False，跳过验证的适配器在此强制关闭
+        if not self.verify:
+            verify = False
+        super().cert_verify(conn, url, verify, cert)
+        # 共享上下文已加载CA证书，避免每个连接重复加载证书文件
+        if verify is True:
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+
+def _create_ssl_context(verify: bool) -> ssl.SSLContext:
+    """创建TLS上下文"""
+    if verify:
+        context = create_urllib3_context(cert_reqs=ssl.CERT_REQUIRED)
+        context.load_verify_locations(cafile=certifi.where())
+    else:
+        # 跳过SSL验证（用于证书过期的网站）
+        context = create_urllib3_context(cert_reqs=ssl.CERT_NONE)
+        context.check_hostname = False
+    return context
+
+
+def _create_session(http_config: Dict, verify: bool) -> requests.Session:
+    """创建带连接池的会话"""
+    adapter = SharedTLSAdapter(
+        _create_ssl_context(verify),
+        verify=verify,
+        pool_connections=http_config.get("pool_connections", 50),
+        pool_maxsize=http_config.get("pool_maxsize", 10),
+        max_retries=http_config.get("max_retries", 0),
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.verify = verify
+    session.headers.update({"User-Agent": http_config.get("user_agent", DEFAULT_USER_AGENT)})
+    return session
+
+
+_sessions: Dict[bool, requests.Session] = {}
+_http_config: Optional[Dict] = None
+_lock = threading.Lock()
+
+
+def configure_http(config: Dict):
+    """
+    设置HTTP客户端配置（在首次请求前调用；未调用时读取 config.yaml）
+
+    Args:
+        config: 完整配置，读取其中的 http 部分
+    """
+    global _http_config
+    with _lock:
+        _http_config = config.get("http", {})
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def get_http_session(verify: bool = True) -> requests.Session:
+    """
+    获取共享的HTTP会话
+
+    Args:
+        verify: 是否验证SSL证书（False 时返回跳过验证的独立会话）
+    """
+    global _http_config
+    with _lock:
+        if verify not in _sessions:
+            if _http_config is None:
+                _http_config = load_config().get("http", {})
+            _sessions[verify] = _create_session(_http_config, verify)
+        return _sessions[verify]
@@ -0,0 +1,120 @@
+"""
+多模式关键词匹配（一次扫描找出所有命中的关键词）
+"""
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    """是否为英文单词字符（中文等字符不参与单词边界判断）"""
+    return char.isascii() and (char.isalnum() or char == "_")
+
+
+class KeywordMatcher:
+    """
+    预编译的多模式关键词匹配器
+
+    构建时将所有关键词合并成一棵字典树，并编译为一个正则表达式，由正则引擎在一次扫描中
+    找出每个位置上最长的命中关键词；同一位置被更长关键词覆盖的关键词（如 GPT 与 GPT-4）
+    通过预先计算的包含关系补全（相当于 Aho–Corasick 的输出链接）。
+    单篇文章的匹配开销与关键词数量无关。
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]], word_boundary: bool = False):
+        """
+        Args:
+            groups: 分组名 -> 关键词列表（同一关键词可属于多个分组）
+            word_boundary: 是否要求英文关键词两侧为单词边界（中文关键词不受影响）
+        """
+        self.word_boundary = word_boundary
+        self.groups = list(groups)
+        self._keyword_groups: Dict[str, List[str]] = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword:
+                    self._keyword_groups.setdefault(keyword, []).append(group)
+
+        # 每个关键词命中时，同时命中的（关键词, 偏移）列表（包含自身）
+        self._outputs: Dict[str, List[Tuple[str, int]]] = {
+            keyword: [
+                (other, offset)
+                for other in self._keyword_groups
+                for offset in self._occurrences(keyword, other)
+            ]
+            for keyword in self._keyword_groups
+        }
+        self._pattern = self._compile(self._keyword_groups) if self._keyword_groups else None
+
+    @staticmethod
+    def _occurrences(text: str, keyword: str) -> List[int]:
+        """keyword 在 text 中出现的所有偏移（允许重叠）"""
+        offsets = []
+        start = text.find(keyword)
+        while start != -1:
+            offsets.append(start)
+            start = text.find(keyword, start + 1)
+        return offsets
+
+    @staticmethod
+    def _compile(keywords: Iterable[str]) -> "re.Pattern":
+        """将关键词字典树编译为正则（零宽前瞻，保证每个位置都会被检查）"""
+        trie: Dict = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        def to_regex(node: Dict) -> str:
+            branches = [re.escape(char) + to_regex(child) for char, child in node.items() if char]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            # 当前节点本身是关键词时，后续部分可选（贪婪匹配优先取更长的关键词）
+            return f"(?:{body})?" if "" in node else body
+
+        return re.compile(f"(?=({to_regex(trie)}))")
+
+    def _at_boundary(self, text: str, keyword: str, start: int) -> bool:
+        """检查关键词两侧是否为单词边界"""
+        end = start + len(keyword)
+        if _is_word_char(keyword[0]) and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if _is_word_char(keyword[-1]) and end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def find(self, text: str) -> Set[str]:
+        """
+        扫描文本
+
+        Returns:
+            Set[str]: 命中的关键词（小写）
+        """
+        if not text or self._pattern is None:
+            return set()
+
+        text = text.lower()
+        hits: Set[str] = set()
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            for keyword, offset in self._outputs[match.group(1)]:
+                if keyword in hits:
+                    continue
+                if not self.word_boundary or self._at_boundary(text, keyword, start + offset):
+                    hits.add(keyword)
+        return hits
+
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        按分组统计命中的不同关键词数量
+
+        Returns:
+            Dict[str, int]: 分组名 -> 命中数量（包含所有分组）
+        """
+        counts = {group: 0 for group in self.groups}
+        for keyword in self.find(text):
+            for group in self._keyword_groups[keyword]:
+                counts[group] += 1
+        return counts
@@ -0,0 +1,170 @@
+"""
+流水线耗时统计（按运行记录各阶段、各来源的耗时）
+
+爬取或增强任务运行期间，timed() 记录的耗时写入当前运行；没有运行中的任务时不记录。
+最近的运行结果保存在进程内，由管理接口输出 p50/p95 和最慢的来源。
+"""
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 保留的历史运行数量
+MAX_RUNS = 20
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """最近秩百分位数（输入需已排序）"""
+    index = math.ceil(fraction * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, index))]
+
+
+def _stage_stats(durations: List[float]) -> Dict:
+    """单个阶段的耗时统计（毫秒）"""
+    durations = sorted(durations)
+    return {
+        "count": len(durations),
+        "total_ms": round(sum(durations) * 1000, 1),
+        "p50_ms": round(_percentile(durations, 0.5) * 1000, 1),
+        "p95_ms": round(_percentile(durations, 0.95) * 1000, 1),
+        "max_ms": round(durations[-1] * 1000, 1),
+    }
+
+
+class PipelineRun:
+    """一次运行的耗时记录（可在多个线程中同时写入）"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name: str):
+        self.id = next(self._ids)
+        self.name = name
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self._spans: List[Tuple[str, Optional[str], float]] = []
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, source: Optional[str] = None):
+        """记录一个耗时片段"""
+        with self._lock:
+            self._spans.append((stage, source, seconds))
+
+    def summary(self, slowest: int = 10) -> Dict:
+        """
+        汇总耗时
+
+        Args:
+            slowest: 返回最慢的来源数量
+
+        Returns:
+            dict: 各阶段的次数、总耗时、p50/p95/最大值，以及按总耗时排序的最慢来源
+        """
+        with self._lock:
+            spans = list(self._spans)
+
+        by_stage: Dict[str, List[float]] = {}
+        by_source: Dict[str, Dict[str, float]] = {}
+        for stage, source, seconds in spans:
+            by_stage.setdefault(stage, []).append(seconds)
+            if source is not None:
+                source_stages = by_source.setdefault(source, {})
+                source_stages[stage] = source_stages.get(stage, 0.0) + seconds
+
+        sources = sorted(by_source.items(), key=lambda item: sum(item[1].values()), reverse=True)
+        finished_at = self.finished_at or datetime.utcnow()
+        return {
+            "id": self.id,
+            "name": self.name,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_ms": round((finished_at - self.started_at).total_seconds() * 1000, 1),
+            "stages": {stage: _stage_stats(durations) for stage, durations in by_stage.items()},
+            "slowest_sources": [{
+                "source": source,
+                "total_ms": round(sum(stages.values()) * 1000, 1),
+                "stages_ms": {stage: round(seconds * 1000, 1) for stage, seconds in stages.items()},
+            } for source, stages in sources[:slowest]],
+        }
+
+
+# 当前运行和最近完成的运行
+_active_run: Optional[PipelineRun] = None
+_finished_runs: Deque[PipelineRun] = deque(maxlen=MAX_RUNS)
+_runs_lock = threading.Lock()
+
+
+@contextmanager
+def pipeline_run(name: str):
+    """
+    记录一次运行（如爬取、增强）
+
+    已有运行进行中时（如爬取任务内调用增强任务），耗时计入已有的运行。
+    """
+    global _active_run
+
+    with _runs_lock:
+        if _active_run is not None:
+            run, owner = _active_run, False
+        else:
+            run, owner = PipelineRun(name), True
+            _active_run = run
+
+    try:
+        yield run
+    finally:
+        if owner:
+            run.finished_at = datetime.utcnow()
+            with _runs_lock:
+                _active_run = None
+                _finished_runs.append(run)
+            stages = run.summary()["stages"]
+            logger.info("阶段耗时（{}）: {}".format(
+                name, ", ".join(f"{stage} {stats['total_ms']:.0f}ms" for stage, stats in stages.items())
+            ))
+
+
+@contextmanager
+def timed(stage: str, source: Optional[str] = None):
+    """
+    记录代码块的耗时到当前运行（也可作为装饰器使用）
+
+    Args:
+        stage: 阶段名称（如 fetch、parse、dedup、commit）
+        source: 来源名称（可选，用于统计最慢的来源）
+    """
+    run = _active_run
+    if run is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run.record(stage, time.perf_counter() - start, source)
+
+
+def get_pipeline_timings(limit: int = 5, slowest: int = 10) -> Dict:
+    """
+    最近运行的耗时统计（最新的在前）
+
+    Args:
+        limit: 返回的历史运行数量
+        slowest: 每次运行返回最慢的来源数量
+    """
+    with _runs_lock:
+        active = _active_run
+        finished = list(_finished_runs)[-limit:] if limit > 0 else []
+
+    return {
+        "active": active.summary(slowest) if active is not None else None,
+        "runs": [run.summary(slowest) for run in reversed(finished)],
+    }
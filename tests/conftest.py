@@ -0,0 +1,58 @@
+"""
+测试配置：使用临时SQLite文件数据库（在导入 src.database 之前设置 DATABASE_URL）
+"""
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="ainews-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from src.database import AsyncReadSessionLocal, Base, SessionLocal, async_engine, async_read_engine, migrate_db
+from src.utils.cache import invalidate_response_cache
+
+
+@pytest.fixture(scope="session")
+def database():
+    """建表（整个测试会话只执行一次）"""
+    migrate_db()
+
+
+@pytest.fixture
+def db(database):
+    """数据库会话；测试结束后清空所有表"""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        for table in reversed(Base.metadata.sorted_tables):
+            session.execute(delete(table))
+        session.commit()
+        session.close()
+
+
+@pytest.fixture
+def source(db):
+    """测试用新闻来源"""
+    from src.models.news import NewsSource
+    item = NewsSource(name="Test Source", url="https://example.com/feed", source_type="rss")
+    db.add(item)
+    db.commit()
+    return item
+
+
+@pytest_asyncio.fixture
+async def read_db(db):
+    """只读异步会话（API路由使用）；每个测试前清空响应缓存，结束后释放连接（连接不能跨事件循环复用）"""
+    invalidate_response_cache()
+    try:
+        async with AsyncReadSessionLocal() as session:
+            yield session
+    finally:
+        await async_read_engine.dispose()
+        await async_engine.dispose()
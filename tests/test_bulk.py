@@ -0,0 +1,44 @@
+"""
+批量写入：冲突跳过，且调用方回滚后不会留下任何数据
+"""
+from datetime import datetime
+
+from sqlalchemy import func, insert, select
+
+from src.database import bulk
+from src.database.bulk import insert_ignore_conflicts
+from src.models.news import News
+
+
+def rows(source_id, *urls):
+    return [{"title": url, "url": url, "source_id": source_id, "published_at": datetime(2024, 1, 1)} for url in urls]
+
+
+def count(db):
+    return db.scalar(select(func.count()).select_from(News))
+
+
+def test_skips_conflicts(db, source):
+    assert len(insert_ignore_conflicts(db, News, rows(source.id, "https://a", "https://b"))) == 2
+    db.commit()
+    assert len(insert_ignore_conflicts(db, News, rows(source.id, "https://b", "https://c"))) == 1
+    db.commit()
+    assert count(db) == 3
+
+
+def test_rollback_discards_bulk_insert(db, source):
+    insert_ignore_conflicts(db, News, rows(source.id, "https://a", "https://b"))
+    db.rollback()
+    assert count(db) == 0
+
+
+def test_rollback_discards_row_by_row_insert(db, source, monkeypatch):
+    """逐行写入使用 SAVEPOINT，RELEASE 不能提前提交外层事务"""
+    monkeypatch.setattr(bulk, "dialect_insert", lambda db, model: insert(model))
+    insert_ignore_conflicts(db, News, rows(source.id, "https://a"))
+    db.commit()
+
+    inserted = insert_ignore_conflicts(db, News, rows(source.id, "https://a", "https://b", "https://c"))
+    assert len(inserted) == 2
+    db.rollback()
+    assert count(db) == 1
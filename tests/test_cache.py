@@ -0,0 +1,50 @@
+"""
+响应缓存：其他会话（其他进程）提交的写入使缓存失效
+"""
+import pytest
+
+from src.api.routes.news import get_sources
+from src.database import AsyncReadSessionLocal, SessionLocal, read_data_version
+from src.models.news import NewsSource
+from src.utils.cache import get_response_cache
+
+
+async def sources():
+    """与API请求相同，每次使用新的只读会话"""
+    async with AsyncReadSessionLocal() as session:
+        return sorted(item["name"] for item in await get_sources(db=session))
+
+
+def add_source(name, commit=True):
+    """在独立的同步会话中写入（相当于 run_scrape.py 等其他进程）"""
+    session = SessionLocal()
+    try:
+        session.add(NewsSource(name=name, url=f"https://{name}.example.com/", source_type="rss"))
+        session.commit() if commit else session.rollback()
+    finally:
+        session.close()
+
+
+@pytest.mark.asyncio
+async def test_write_from_other_session_invalidates(read_db, source):
+    cache = get_response_cache()
+    assert cache is not None
+    assert await sources() == ["Test Source"]
+    hits = cache.hits
+    assert await sources() == ["Test Source"]
+    assert cache.hits == hits + 1
+
+    add_source("other")
+    assert await sources() == ["Test Source", "other"]
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_write_keeps_version(read_db, db, source):
+    # SQLite只有一个写连接：读取后结束事务，释放连接给其他会话
+    version = read_data_version(db)
+    db.rollback()
+    add_source("discarded", commit=False)
+    assert read_data_version(db) == version
+    db.rollback()
+    add_source("kept")
+    assert read_data_version(db) == version + 1
@@ -0,0 +1,62 @@
+"""
+去重索引增量更新：新入库的标题读入索引，过期和删除的新闻不再参与去重
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+
+from src.models.news import News
+from src.processors.deduplicator import Deduplicator
+
+TITLE = "OpenAI releases a new reasoning model for developers"
+
+
+def add_news(db, source, title, url, days_ago=0):
+    news = News(title=title, url=url, source_id=source.id, published_at=datetime.utcnow() - timedelta(days=days_ago))
+    db.add(news)
+    db.commit()
+    return news
+
+
+def test_incremental_update(db, source):
+    deduplicator = Deduplicator(db)
+    deduplicator.build_index()
+    assert deduplicator.mark_duplicates([{"title": TITLE, "url": "https://a.example.com/1"}])
+
+    add_news(db, source, TITLE, "https://b.example.com/1")
+    add_news(db, source, "An old story about chips and funding", "https://b.example.com/2", days_ago=30)
+    deduplicator.build_index()
+    assert len(deduplicator._index) == 1
+    assert deduplicator.mark_duplicates([{"title": TITLE + "!", "url": "https://c.example.com/1"}]) == []
+
+
+def test_expired_titles_removed(db, source):
+    add_news(db, source, TITLE, "https://b.example.com/1", days_ago=3)
+    deduplicator = Deduplicator(db, window_days=7)
+    deduplicator.build_index()
+    assert len(deduplicator._index) == 1
+
+    deduplicator.window_days = 1
+    deduplicator.build_index()
+    assert len(deduplicator._index) == 0
+    assert deduplicator.mark_duplicates([{"title": TITLE, "url": "https://c.example.com/1"}])
+
+
+def test_rebuild_after_delete(db, source):
+    add_news(db, source, TITLE, "https://b.example.com/1")
+    deduplicator = Deduplicator(db)
+    deduplicator.build_index()
+
+    db.execute(delete(News))
+    db.commit()
+    deduplicator.build_index()
+    assert len(deduplicator._index) == 0
+    assert deduplicator.mark_duplicates([{"title": TITLE, "url": "https://c.example.com/1"}])
+
+
+def test_committed_titles_used_within_run(db, source):
+    deduplicator = Deduplicator(db)
+    deduplicator.build_index()
+    assert deduplicator.mark_duplicates([{"title": TITLE, "url": "https://a.example.com/1"}])
+    deduplicator.commit_pending()
+    assert deduplicator.mark_duplicates([{"title": TITLE + "!", "url": "https://b.example.com/1"}]) == []
@@ -0,0 +1,26 @@
+"""
+精选新闻：窗口内按评分排名，窗口外的新闻取消精选
+"""
+from datetime import datetime, timedelta
+
+from src.database import refresh_featured
+from src.models.news import News
+
+
+def test_refresh_featured(db, source):
+    now = datetime.utcnow()
+    db.add_all([News(title=f"news {i}", url=f"https://a/{i}", source_id=source.id, published_at=now,
+                     importance_score=i / 10) for i in range(10)])
+    db.add_all([
+        News(title="old featured", url="https://a/old", source_id=source.id, published_at=now - timedelta(days=30),
+             importance_score=1.0, is_featured=True),
+        News(title="stale", url="https://a/stale", source_id=source.id, published_at=now,
+             importance_score=0.0, is_featured=True),
+    ])
+    db.commit()
+
+    refresh_featured(db, percentile=0.2, window_days=7)
+    db.commit()
+
+    featured = sorted(title for (title,) in db.query(News.title).filter(News.is_featured == True))
+    assert featured == ["news 8", "news 9"]
@@ -0,0 +1,123 @@
+"""
+游标分页：游标往返、无效游标返回400、published_at 相同时翻页不重复不遗漏
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.routes.news import _decode_cursor, _encode_cursor, get_news_feed
+from src.models.news import News
+
+
+async def feed(read_db, cursor=None, page_size=2, include_total=False):
+    return await get_news_feed(cursor=cursor, page_size=page_size, category=None, source=None, featured=None,
+                               days=None, min_score=None, include_total=include_total, db=read_db)
+
+
+async def read_all(read_db, page_size=2):
+    """逐页读取直到没有下一页，返回按顺序读到的 id"""
+    ids, cursor = [], None
+    while True:
+        page = await feed(read_db, cursor, page_size)
+        ids.extend(item.id for item in page.items)
+        if page.next_cursor is None:
+            return ids
+        cursor = page.next_cursor
+
+
+def encode(key) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+@pytest.fixture
+def tied(db, source):
+    """大多数新闻发布时间相同，其中部分评分也相同（只能靠 id 区分）"""
+    now = datetime(2026, 10, 18, 8, 0, 0)
+    scores = [0.5, 0.5, 0.5, 0.9, 0.1, 0.5, 0.9]
+    db.add_all([News(title=f"tied {i}", url=f"https://a/tied/{i}", source_id=source.id, published_at=now,
+                     importance_score=score) for i, score in enumerate(scores)])
+    db.add_all([
+        News(title="newer", url="https://a/newer", source_id=source.id, published_at=now + timedelta(microseconds=1),
+             importance_score=0.0),
+        News(title="older", url="https://a/older", source_id=source.id, published_at=now - timedelta(seconds=1),
+             importance_score=1.0),
+    ])
+    db.commit()
+    rows = db.query(News.id, News.published_at, News.importance_score).all()
+    return [row.id for row in sorted(rows, key=lambda r: (r.published_at, r.importance_score, r.id), reverse=True)]
+
+
+@pytest.mark.parametrize("published_at", [
+    datetime(2026, 10, 18, 8, 0, 0),
+    datetime(2026, 10, 18, 8, 0, 0, 123456),
+])
+def test_cursor_round_trip(published_at):
+    row = SimpleNamespace(published_at=published_at, importance_score=0.1 + 0.2, id=42)
+    cursor = _encode_cursor(row)
+    assert "=" not in cursor
+    assert _decode_cursor(cursor) == (published_at, 0.1 + 0.2, 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "!!!",
+    "游标",
+    encode({"published_at": "2026-10-18T08:00:00"}),
+    encode(["2026-10-18T08:00:00", 0.5]),
+    encode(["2026-10-18T08:00:00", 0.5, 1, 2]),
+    encode(["not a date", 0.5, 1]),
+    encode([1, 0.5, 1]),
+    encode(["2026-10-18T08:00:00", None, 1]),
+    encode(["2026-10-18T08:00:00", "NaN", 1]),
+    encode(["2026-10-18T08:00:00", 0.5, "abc"]),
+    encode(None),
+    base64.urlsafe_b64encode(b"\xff\xfe\x00").decode(),
+    encode(["2026-10-18T08:00:00", 0.5, 1])[:-3],
+])
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_in_route(read_db, tied):
+    with pytest.raises(HTTPException) as exc_info:
+        await feed(read_db, cursor="not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_size", [1, 2, 3, 100])
+async def test_ties_have_no_duplicates_or_gaps(read_db, tied, page_size):
+    assert await read_all(read_db, page_size) == tied
+
+
+@pytest.mark.asyncio
+async def test_new_articles_do_not_shift_pages(read_db, db, source, tied):
+    first = await feed(read_db, include_total=True)
+    assert first.total == len(tied)
+    assert [item.id for item in first.items] == tied[:2]
+
+    # 翻页过程中插入更新的新闻（以及与游标排序键相同时间、评分的新闻）
+    db.add_all([
+        News(title="breaking", url="https://a/breaking", source_id=source.id, published_at=datetime(2026, 10, 19),
+             importance_score=1.0),
+        News(title="same time", url="https://a/same", source_id=source.id, published_at=datetime(2026, 10, 18, 8),
+             importance_score=0.9),
+    ])
+    db.commit()
+
+    ids = [item.id for item in first.items]
+    cursor = first.next_cursor
+    while cursor:
+        page = await feed(read_db, cursor)
+        ids.extend(item.id for item in page.items)
+        cursor = page.next_cursor
+
+    assert len(ids) == len(set(ids))
+    assert set(tied) <= set(ids)
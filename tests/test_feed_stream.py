@@ -0,0 +1,153 @@
+"""
+流式RSS解析：条目截取规则和内容哈希
+"""
+from datetime import datetime, timedelta
+
+from src.scrapers.feed_stream import HASH_PREFIX_BYTES, StreamedFeed, take_entries
+
+SINCE = datetime(2024, 1, 10)
+
+
+def entry(day=None, title=""):
+    """测试用条目（day 为 2024年1月的日期，None 表示没有发布时间）"""
+    item = {"title": title or f"day {day}"}
+    if day is not None:
+        item["published"] = f"2024-01-{day:02d}T00:00:00Z"
+    return item
+
+
+class Recorder:
+    """记录被读取的条目数（验证提前停止后不再继续读取）"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.read = 0
+
+    def __iter__(self):
+        for item in self.entries:
+            self.read += 1
+            yield item
+
+
+def titles(entries):
+    return [item["title"] for item in entries]
+
+
+def test_limit():
+    entries = [entry(day) for day in (20, 19, 18, 17)]
+    assert titles(take_entries(entries, 2)) == ["day 20", "day 19"]
+    assert take_entries(entries, 0) == []
+
+
+def test_without_since_returns_everything_up_to_limit():
+    entries = [entry(day) for day in (1, 20, 2)]
+    assert titles(take_entries(entries, 10)) == ["day 1", "day 20", "day 2"]
+
+
+def test_descending_feed_stops_at_first_old_entry():
+    source = Recorder([entry(day) for day in (12, 11, 9, 8, 7)])
+    assert titles(take_entries(source, 10, SINCE)) == ["day 12", "day 11"]
+    # 第一个旧条目之后不再读取
+    assert source.read == 3
+
+
+def test_old_entry_followed_by_older_one_stops():
+    source = Recorder([entry(day) for day in (9, 8, 15)])
+    assert take_entries(source, 10, SINCE) == []
+    assert source.read == 2
+
+
+def test_ascending_feed_never_stops_early():
+    source = Recorder([entry(day) for day in (7, 8, 9, 11, 12)])
+    assert titles(take_entries(source, 10, SINCE)) == ["day 11", "day 12"]
+    assert source.read == 5
+
+
+def test_entries_without_date_are_new():
+    entries = [entry(None, "undated"), entry(9), entry(None, "undated 2")]
+    assert titles(take_entries(entries, 10, SINCE)) == ["undated", "undated 2"]
+
+
+def test_entry_at_watermark_is_kept():
+    assert titles(take_entries([entry(10)], 10, SINCE)) == ["day 10"]
+
+
+def feed_chunks(items, chunk_size=1024, dates=None):
+    """生成RSS文档并分块（dates 为各条目的发布时间）"""
+    body = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{i}</link>"
+        + (f"<pubDate>{dates[i].isoformat()}Z</pubDate>" if dates else "") + "</item>"
+        for i, title in enumerate(items)
+    )
+    document = f"<?xml version=\"1.0\"?><rss version=\"2.0\"><channel>{body}</channel></rss>".encode()
+    return [document[i:i + chunk_size] for i in range(0, len(document), chunk_size)]
+
+
+def test_descending_feed_stopped_at_watermark():
+    selected = take_entries([entry(day) for day in (12, 11, 9, 8)], 10, SINCE)
+    assert selected.stopped_at_watermark
+    assert not selected.ascending
+
+
+def test_ascending_feed_detected():
+    selected = take_entries([entry(day) for day in (7, 8, 9, 11)], 10, SINCE)
+    assert selected.ascending
+    assert not selected.stopped_at_watermark
+
+
+def test_prefix_hash_covers_prefix_only():
+    head = ["x" * 200] * (HASH_PREFIX_BYTES // 200 + 10)
+    first = StreamedFeed(feed_chunks(head + ["old tail"]))
+    second = StreamedFeed(feed_chunks(head + ["new tail"]))
+    assert first.content_hash(prefix_only=True) == second.content_hash(prefix_only=True)
+    assert not first.exhausted
+
+    changed = StreamedFeed(feed_chunks(["new item"] + head))
+    assert changed.content_hash(prefix_only=True) != first.content_hash(prefix_only=True)
+
+
+def test_full_hash_covers_tail():
+    head = ["x" * 200] * (HASH_PREFIX_BYTES // 200 + 10)
+    first = StreamedFeed(feed_chunks(head + ["old tail"]))
+    assert first.content_hash() != StreamedFeed(feed_chunks(head + ["new tail"])).content_hash()
+    assert first.exhausted
+
+
+def test_short_feed_hash_same_for_prefix_and_full():
+    chunks = feed_chunks(["a", "b"])
+    assert StreamedFeed(chunks).content_hash(prefix_only=True) == StreamedFeed(chunks).content_hash()
+
+
+def test_prefix_hash_includes_content_length():
+    chunks = feed_chunks(["x" * 200] * (HASH_PREFIX_BYTES // 200 + 10))
+    assert StreamedFeed(chunks, content_length="100").content_hash(prefix_only=True) != \
+        StreamedFeed(chunks, content_length="200").content_hash(prefix_only=True)
+
+
+def read_feed(chunks, since):
+    """与 RSSScraper 相同的读取顺序：先选出条目，再按读取结果计算哈希"""
+    feed = StreamedFeed(chunks)
+    selected = take_entries(feed.entries(), 50, since)
+    return selected, feed.content_hash(prefix_only=selected.stopped_at_watermark and not selected.ascending)
+
+
+def test_large_ascending_feed_with_new_tail_items_changes_hash():
+    """超过 HASH_PREFIX_BYTES 的正序源（旧条目在前），只在末尾追加新条目"""
+    count = HASH_PREFIX_BYTES // 100
+    items = [f"old {i} " + "x" * 60 for i in range(count)]
+    dates = [datetime(2024, 1, 1) + timedelta(minutes=i) for i in range(count)]
+    _, first_hash = read_feed(feed_chunks(items, dates=dates), SINCE)
+
+    new_dates = [datetime(2024, 1, 11), datetime(2024, 1, 12)]
+    selected, second_hash = read_feed(feed_chunks(items + ["new 1", "new 2"], dates=dates + new_dates), SINCE)
+    assert titles(selected) == ["new 1", "new 2"]
+    assert second_hash != first_hash
+
+
+def test_entries_after_content_hash_include_buffered_chunks():
+    items = [f"item {i}" for i in range(2000)]
+    feed = StreamedFeed(feed_chunks(items))
+    feed.content_hash()
+    assert [item["title"] for item in feed.entries()] == items
+    assert feed.exhausted
+    assert feed.read_all() == b"".join(feed_chunks(items))
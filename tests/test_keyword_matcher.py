@@ -0,0 +1,99 @@
+"""
+关键词匹配器：与逐个关键词做子串查找（keyword.lower() in text.lower()）的结果一致
+"""
+import random
+
+from src.utils.keyword_matcher import KeywordMatcher, _is_word_char
+
+
+def brute_force(keywords, text, word_boundary=False):
+    """逐个关键词在小写文本的每个出现位置检查（word_boundary 时要求英文关键词两侧为单词边界）"""
+    text = text.lower()
+    hits = set()
+    for keyword in keywords:
+        keyword = keyword.lower()
+        start = text.find(keyword) if keyword else -1
+        while start != -1:
+            end = start + len(keyword)
+            if not word_boundary or (
+                not (_is_word_char(keyword[0]) and start > 0 and _is_word_char(text[start - 1]))
+                and not (_is_word_char(keyword[-1]) and end < len(text) and _is_word_char(text[end]))
+            ):
+                hits.add(keyword)
+                break
+            start = text.find(keyword, start + 1)
+    return hits
+
+
+def test_overlapping_keywords():
+    keywords = ["gpt", "gpt-4", "pt-4", "gpt-4o", "4o", "openai", "ai", "open"]
+    matcher = KeywordMatcher({"all": keywords})
+
+    # 同一位置的长短关键词、被长关键词包含在中间或结尾的关键词都能命中
+    assert matcher.find("OpenAI ships GPT-4o") == {"gpt", "gpt-4", "pt-4", "gpt-4o", "4o", "openai", "ai", "open"}
+    assert matcher.find("GPT-4 only") == {"gpt", "gpt-4", "pt-4"}
+    # 自身重叠的关键词
+    assert KeywordMatcher({"all": ["aa", "aaa"]}).find("aaaa") == {"aa", "aaa"}
+
+
+def test_overlapping_keywords_with_word_boundary():
+    matcher = KeywordMatcher({"all": ["gpt", "gpt-4", "pt-4", "ai", "openai", "ai safety"]}, word_boundary=True)
+
+    # "pt-4" 在 "gpt-4" 中间，左侧不是单词边界；"ai" 在 "openai" 结尾同理
+    assert matcher.find("GPT-4 from OpenAI") == {"gpt", "gpt-4", "openai"}
+    # 最长关键词不满足边界时，同一位置较短的关键词仍要检查
+    assert matcher.find("gpt-4x and ai") == {"gpt", "ai"}
+    # 同一关键词第一次出现不满足边界、后面的出现满足时仍命中
+    assert matcher.find("openai says ai safety matters") == {"openai", "ai", "ai safety"}
+
+
+def test_case_folding():
+    matcher = KeywordMatcher({"high": ["OpenAI", "LLM"], "medium": ["deepmind", "Élysée"]})
+
+    assert matcher.find("openai and DEEPMIND publish llm results") == {"openai", "deepmind", "llm"}
+    assert matcher.find("Visite à l'ÉLYSÉE") == {"élysée"}
+    assert matcher.count("OPENAI, OpenAI, openai") == {"high": 1, "medium": 0}
+
+
+def test_regex_metacharacters():
+    keywords = ["c++", "c#", ".net", "node.js", "a*b", "(beta)", "[rfc]", "x|y", "$100m", "^_^", "what?", "\\d"]
+    matcher = KeywordMatcher({"all": keywords})
+
+    assert matcher.find("C++ and C# on .NET, (beta) [RFC] what? $100M ^_^ \\d a*b x|y node.js") == set(keywords)
+    # 元字符只按字面匹配，不作为正则解释
+    assert matcher.find("cc and nodexjs, aab, x, y, beta, 100m, d") == set()
+
+    bounded = KeywordMatcher({"all": ["c++", "c#", ".net", "go"]}, word_boundary=True)
+    # 关键词首尾的非单词字符不要求边界，英文字母一侧仍要求
+    assert bounded.find("c++x uses asp.net, gopher, c#10") == {"c++", ".net", "c#"}
+    assert bounded.find("abc++ and go2") == set()
+
+
+def test_chinese_keywords_ignore_word_boundary():
+    matcher = KeywordMatcher({"all": ["大模型", "模型", "ai"]}, word_boundary=True)
+    assert matcher.find("发布了大模型AI芯片") == {"大模型", "模型", "ai"}
+
+
+def test_count_by_group():
+    matcher = KeywordMatcher({
+        "high": ["gpt", "gpt-4", "openai"],
+        "medium": ["openai", "model"],
+        "empty": [],
+    })
+
+    # 同一关键词属于多个分组时分别计数，重复出现只算一次
+    assert matcher.count("OpenAI GPT-4 model, GPT-4 again") == {"high": 3, "medium": 2, "empty": 0}
+    assert matcher.count("") == {"high": 0, "medium": 0, "empty": 0}
+    assert KeywordMatcher({}).find("anything") == set()
+
+
+def test_matches_brute_force_on_random_text():
+    rng = random.Random(11)
+    alphabet = "abc-+. 模型"
+    for word_boundary in (False, True):
+        for _ in range(200):
+            keywords = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(8)]
+            keywords = [keyword for keyword in keywords if keyword.strip()]
+            text = "".join(rng.choice(alphabet + "ABC") for _ in range(rng.randint(0, 40)))
+            matcher = KeywordMatcher({"all": keywords}, word_boundary=word_boundary)
+            assert matcher.find(text) == brute_force(keywords, text, word_boundary), (keywords, text)
@@ -0,0 +1,118 @@
+"""
+批量LLM处理：分批、输出token上限、部分/无法解析的响应，以及逐篇回退
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.processors.classifier import Classifier
+from src.processors.llm_batch import TOKENS_PER_ARTICLE, LLMBatchProcessor
+
+
+class StubSummarizer:
+    """逐篇回退路径使用的摘要器（不访问网络）"""
+
+    translation_cache = None
+    max_length = 200
+
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+        self.calls = []
+
+    def summarize(self, article):
+        self.calls.append(article["id"])
+        if article["id"] in self.fail_ids:
+            raise RuntimeError("summarize failed")
+        return {"original": f"single {article['id']}", "translated": None}
+
+    def translate_title(self, title):
+        return None
+
+
+class StubClient:
+    """按顺序返回预设响应；respond 为 None 时按请求中的文章生成合法响应"""
+
+    def __init__(self, respond=None, string_ids=False):
+        self.respond = respond
+        self.string_ids = string_ids
+        self.requests = []
+
+    def create(self, model, messages, temperature, max_tokens):
+        payload = json.loads(messages[-1]["content"].split("新闻列表（JSON）：", 1)[1])
+        self.requests.append({"ids": [item["id"] for item in payload], "max_tokens": max_tokens})
+        if self.respond is not None:
+            content = self.respond(payload)
+        else:
+            content = json.dumps([{
+                "id": str(item["id"]) if self.string_ids else item["id"],
+                "summary": f"batch {item['id']}",
+                "summary_translated": None,
+                "title_translated": None,
+                "category": "行业动态",
+            } for item in payload], ensure_ascii=False)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def articles(count):
+    return [{"id": i, "title": f"Company {i} ships features", "content": "Details."} for i in range(1, count + 1)]
+
+
+@pytest.fixture
+def classifier(db):
+    return Classifier(db, use_ai=False)
+
+
+def test_batches_split_by_batch_size(classifier):
+    client = StubClient()
+    processor = LLMBatchProcessor(StubSummarizer(), classifier, client=client, batch_size=10)
+    results = processor.process(articles(25))
+    assert [len(request["ids"]) for request in client.requests] == [10, 10, 5]
+    assert {result["summary"] for result in results.values()} == {f"batch {i}" for i in range(1, 26)}
+
+
+def test_batch_size_derived_from_max_tokens(classifier):
+    client = StubClient()
+    processor = LLMBatchProcessor(StubSummarizer(), classifier, client=client, batch_size=10,
+                                  max_tokens=3 * TOKENS_PER_ARTICLE)
+    assert processor.batch_size == 3
+    processor.process(articles(7))
+    assert [len(request["ids"]) for request in client.requests] == [3, 3, 1]
+    assert all(request["max_tokens"] <= 3 * TOKENS_PER_ARTICLE for request in client.requests)
+    assert client.requests[-1]["max_tokens"] == TOKENS_PER_ARTICLE
+
+
+def test_string_ids_match(classifier):
+    summarizer = StubSummarizer()
+    processor = LLMBatchProcessor(summarizer, classifier, client=StubClient(string_ids=True))
+    results = processor.process(articles(3))
+    assert [results[i]["summary"] for i in (1, 2, 3)] == ["batch 1", "batch 2", "batch 3"]
+    assert summarizer.calls == []
+
+
+def test_partial_response_falls_back_for_missing(classifier):
+    def respond(payload):
+        return "```json\n" + json.dumps([{"id": payload[0]["id"], "summary": "batch", "category": "其他"},
+                                         {"id": payload[1]["id"], "summary": ""}]) + "\n```"
+
+    summarizer = StubSummarizer()
+    processor = LLMBatchProcessor(summarizer, classifier, client=StubClient(respond))
+    results = processor.process(articles(3))
+    assert results[1]["summary"] == "batch"
+    assert results[2]["summary"] == "single 2"  # 摘要为空的条目无效
+    assert results[3]["summary"] == "single 3"  # 响应中缺少的条目
+    assert summarizer.calls == [2, 3]
+
+
+def test_malformed_response_falls_back(classifier):
+    summarizer = StubSummarizer()
+    processor = LLMBatchProcessor(summarizer, classifier, client=StubClient(lambda payload: '[{"id": 1, "summ'))
+    results = processor.process(articles(3))
+    assert [results[i]["summary"] for i in (1, 2, 3)] == ["single 1", "single 2", "single 3"]
+
+
+def test_failed_fallback_leaves_article_unprocessed(classifier):
+    summarizer = StubSummarizer(fail_ids={2})
+    processor = LLMBatchProcessor(summarizer, classifier, client=StubClient(lambda payload: "not json"))
+    results = processor.process(articles(3))
+    assert sorted(results) == [1, 3]
@@ -0,0 +1,56 @@
+"""
+近似重复索引：与逐条 calculate_similarity 比较的结果一致（召回率、准确率）
+"""
+import random
+
+from benchmarks.bench_dedup import build_vocabulary, perturb, random_title
+from src.processors.near_duplicate import NearDuplicateIndex, minhash_bands, minhash_bands_many
+from src.utils.helpers import calculate_similarity
+
+THRESHOLD = 0.85
+
+
+def brute_force(title, existing):
+    return any(calculate_similarity(title, other) >= THRESHOLD for other in existing)
+
+
+def test_signatures_are_stable():
+    titles = ["OpenAI releases new model", "大模型发布", "a", ""]
+    assert minhash_bands_many(titles) == [list(minhash_bands(title)) for title in titles]
+    assert minhash_bands_many(titles)[3] == []
+    assert len(minhash_bands_many(titles)[0]) == 24
+
+
+def test_recall_and_precision():
+    rng = random.Random(7)
+    vocabulary = build_vocabulary(rng, size=300)
+    existing = [random_title(rng, vocabulary) for _ in range(200)]
+    incoming = [perturb(rng.choice(existing), rng) if i % 2 else random_title(rng, vocabulary) for i in range(80)]
+
+    index = NearDuplicateIndex(threshold=THRESHOLD)
+    index.add_many(existing)
+
+    expected = [brute_force(title, existing) for title in incoming]
+    found = [index.find(title) for title in incoming]
+
+    # 校验后的结果都达到阈值（准确率 100%），LSH 召回漏掉的很少
+    assert all(calculate_similarity(title, match[0]) >= THRESHOLD for title, match in zip(incoming, found) if match)
+    true_positives = sum(1 for e, f in zip(expected, found) if e and f)
+    assert sum(expected) >= 30
+    assert true_positives >= 0.95 * sum(expected)
+
+
+def test_chinese_titles():
+    index = NearDuplicateIndex(threshold=THRESHOLD)
+    index.add("智谱发布新一代开源大模型，性能超越同类产品")
+    assert index.find("智谱发布新一代开源大模型，性能超越同类产品！") is not None
+    assert index.find("英伟达公布季度财报，数据中心收入创新高") is None
+
+
+def test_remove():
+    index = NearDuplicateIndex(threshold=THRESHOLD)
+    doc_id = index.add("OpenAI releases new reasoning model")
+    assert index.find("OpenAI releases new reasoning model!") is not None
+    index.remove(doc_id)
+    assert len(index) == 0
+    assert index.find("OpenAI releases new reasoning model!") is None
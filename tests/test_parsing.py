@@ -0,0 +1,75 @@
+"""
+网页选择器：编译后的XPath与 BeautifulSoup 的提取结果一致
+"""
+from datetime import datetime
+
+import pytest
+
+from src.scrapers.parsing import (
+    DEFAULT_SELECTORS, compile_selectors, extract_web_articles_lxml, extract_web_articles_soup,
+)
+from src.utils.helpers import load_config
+
+BASE_URL = "https://example.com/"
+
+PAGES = {
+    "articles": """<html><body><nav><h2><a href="/nav">Menu</a></h2></nav>
+        <main>
+          <article><h2><a href="/one">Title One</a></h2><time>2024-01-02</time><p>First <b>body</b></p>
+            <img src="/one.png"></article>
+          <article><h2><a href="/two">Title Two</a></h2><p>Second body</p></article>
+          <article class="paper-card"><h1><a href="/paper">Paper</a></h1><div class="paper-abstract">Abstract</div></article>
+        </main></body></html>""",
+    "hn": """<html><body><table id="hnmain"><tr><td><table>
+        <tr class="athing" id="1"><td class="title"><span class="titleline"><a href="https://a.example.com/">Story A</a>
+          <span class="sitebit"> (<a href="from?site=a.example.com">a.example.com</a>)</span></span></td></tr>
+        <tr><td class="subtext"><span class="age" title="2024-01-02T08:00:00"><a href="item?id=1">3 hours ago</a></span></td></tr>
+        <tr class="athing" id="2"><td class="title"><span class="titleline"><a href="/b">Story B</a></span></td>
+          <td><span class="age">2024-01-03</span></td></tr>
+        </table></td></tr></table></body></html>""",
+    "papers": """<html><body><div class="infinite-container">
+        <div class="paper-card"><h1><a href="/paper/x">Paper X</a></h1><p class="paper-abstract">About X</p></div>
+        <div class="paper-card"><div class="row"><h1><a href="/paper/y">Paper Y</a></h1></div></div>
+        <div class="paper-card"><h1>No link</h1></div>
+        </div></body></html>""",
+}
+
+
+def configured_selectors():
+    """config.yaml 中所有网页来源的选择器，以及默认选择器"""
+    sources = load_config().get("sources", {}).get("web", [])
+    return [pytest.param(source.get("selectors", {}), id=source["name"]) for source in sources] + [
+        pytest.param(DEFAULT_SELECTORS, id="default"),
+        pytest.param({"item": "article", "title": "main h2 a", "link": "main h2 a", "content": "article > p"},
+                     id="ancestor-outside-item"),
+    ]
+
+
+def normalise(articles):
+    """没有日期元素时发布时间为当前时间，不参与比较"""
+    return [
+        {**article, "published_at": None if article["published_at"] is None
+         or abs((article["published_at"] - datetime.utcnow()).total_seconds()) < 60 else article["published_at"]}
+        for article in articles
+    ]
+
+
+@pytest.mark.parametrize("page", sorted(PAGES))
+@pytest.mark.parametrize("selectors", configured_selectors())
+def test_xpath_matches_soup(selectors, page):
+    soup_articles, soup_errors = extract_web_articles_soup(PAGES[page], BASE_URL, selectors)
+    lxml_articles, lxml_errors = extract_web_articles_lxml(PAGES[page], BASE_URL, compile_selectors(selectors))
+    assert normalise(lxml_articles) == normalise(soup_articles)
+    assert lxml_errors == soup_errors == []
+
+
+def test_ancestor_outside_item():
+    selectors = {"item": "main article", "title": "main h2 a", "link": "main h2 a"}
+    articles, _ = extract_web_articles_lxml(PAGES["articles"], BASE_URL, compile_selectors(selectors))
+    assert [article["title"] for article in articles] == ["Title One", "Title Two"]
+
+
+def test_item_itself_not_selected():
+    selectors = {"item": "h2", "title": "h2", "link": "a"}
+    articles, _ = extract_web_articles_lxml(PAGES["articles"], BASE_URL, compile_selectors(selectors))
+    assert articles == []
@@ -0,0 +1,139 @@
+"""
+每日统计汇总：写入（含重复文章）、增强更新分类和评分、重建后都与按新闻表重新统计的结果一致
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database import add_to_daily_stats, insert_ignore_conflicts, rebuild_daily_stats, remove_from_daily_stats
+from src.models.news import News, NewsCategory, NewsDailyStat
+from src.scheduler.tasks import ScrapeTask
+
+NOW = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+
+
+def recount(db):
+    """按新闻表重新统计：(日期, 来源, 分类) -> (数量, 评分之和)"""
+    counts = defaultdict(lambda: [0, 0.0])
+    for published_at, source_id, category_id, score in db.query(
+        News.published_at, News.source_id, News.category_id, News.importance_score
+    ):
+        count = counts[(published_at.date(), source_id, category_id or 0)]
+        count[0] += 1
+        count[1] += score or 0.0
+    return {key: (count, pytest.approx(score_sum)) for key, (count, score_sum) in counts.items()}
+
+
+def rollup(db):
+    db.expire_all()
+    return {(stat.day, stat.source_id, stat.category_id): (stat.news_count, stat.score_sum)
+            for stat in db.query(NewsDailyStat)}
+
+
+def article(title, url, days_ago=0, **fields):
+    return {"title": title, "url": url, "content": f"{title} content", "published_at": NOW - timedelta(days=days_ago),
+            **fields}
+
+
+@pytest.fixture
+def task(db):
+    """爬取任务（使用独立会话写入，测试会话先结束读事务，不占用写连接）"""
+    db.rollback()
+    task = ScrapeTask()
+    task.deduplicator.build_index()
+    yield task
+    task.db.rollback()
+    task.db.close()
+
+
+def test_inserts_with_duplicates(db, task):
+    saved = task._process_articles([
+        article("OpenAI releases a new reasoning model", "https://a.example.com/1"),
+        article("OpenAI releases a new reasoning model", "https://a.example.com/1"),
+        article("OpenAI releases a new reasoning model!", "https://a.example.com/1-copy"),
+        article("Google unveils Gemini update", "https://a.example.com/2", days_ago=1),
+        article("Anthropic raises new funding round", "https://a.example.com/3", days_ago=2),
+    ], "Source A", "https://a.example.com/feed", "rss")
+    assert saved == 3
+
+    saved = task._process_articles([
+        article("OpenAI releases a new reasoning model", "https://a.example.com/1/?utm_source=b"),
+        article("Google unveils the Gemini update", "https://b.example.com/gemini", days_ago=1),
+        article("Meta open-sources a vision model", "https://b.example.com/vision", days_ago=1),
+        article("EU passes AI act amendments", "https://b.example.com/eu"),
+    ], "Source B", "https://b.example.com/feed", "rss")
+    assert saved == 2
+
+    assert db.query(News).count() == 5
+    assert rollup(db) == recount(db)
+
+
+def test_conflicting_urls_are_not_counted(db, source):
+    rows = [{"title": f"news {i}", "url": f"https://a/{i}", "source_id": source.id,
+             "published_at": NOW - timedelta(days=i % 2), "importance_score": 0.1 * i} for i in range(4)]
+    add_to_daily_stats(db, insert_ignore_conflicts(db, News, rows))
+    db.commit()
+
+    # 已存在的链接和批内重复的链接都被跳过，只计入实际写入的新闻
+    rows = [dict(rows[0], title="again"), {**rows[1], "url": "https://a/new"}, {**rows[2], "url": "https://a/new"}]
+    inserted_ids = insert_ignore_conflicts(db, News, rows)
+    add_to_daily_stats(db, inserted_ids)
+    db.commit()
+
+    assert len(inserted_ids) == 1
+    assert db.query(News).count() == 5
+    assert rollup(db) == recount(db)
+
+
+def test_enrichment_updates(db, task):
+    task._process_articles([
+        article("OpenAI announces funding and acquisition", "https://a.example.com/1"),
+        article("New research paper on model safety", "https://a.example.com/2", days_ago=1),
+        article("Government passes AI regulation", "https://a.example.com/3"),
+        article("Weekend links", "https://a.example.com/4", days_ago=3),
+    ], "Source A", "https://a.example.com/feed", "rss")
+
+    assert task.enricher.run_pending() == 4
+    task.db.rollback()
+    assert db.query(News).filter(News.category_id.isnot(None)).count() > 0
+    assert rollup(db) == recount(db)
+
+    # 再次修改分类和评分（先扣除旧的统计，更新后再计入）
+    category = NewsCategory(name="测试分类")
+    db.add(category)
+    db.flush()
+    ids = [news_id for (news_id,) in db.query(News.id)]
+    remove_from_daily_stats(db, ids[:2])
+    db.bulk_update_mappings(News, [
+        {"id": ids[0], "category_id": category.id, "importance_score": 0.95},
+        {"id": ids[1], "category_id": None, "importance_score": 0.0},
+    ])
+    add_to_daily_stats(db, ids[:2])
+    db.commit()
+
+    assert rollup(db) == recount(db)
+
+
+def test_remove_deletes_empty_rows(db, source):
+    rows = [{"title": f"news {i}", "url": f"https://a/{i}", "source_id": source.id, "published_at": NOW,
+             "importance_score": 0.5} for i in range(3)]
+    ids = insert_ignore_conflicts(db, News, rows)
+    add_to_daily_stats(db, ids)
+    db.commit()
+
+    remove_from_daily_stats(db, ids)
+    db.commit()
+
+    assert rollup(db) == {}
+
+
+def test_rebuild(db, source):
+    db.add_all([News(title=f"news {i}", url=f"https://a/{i}", source_id=source.id,
+                     published_at=NOW - timedelta(days=i % 3), importance_score=i / 10) for i in range(9)])
+    db.add(NewsDailyStat(day=NOW.date() - timedelta(days=10), source_id=source.id, category_id=0,
+                         news_count=7, score_sum=1.0))
+    db.commit()
+
+    assert rebuild_daily_stats(db) == 3
+    assert rollup(db) == recount(db)
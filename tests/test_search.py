@@ -0,0 +1,59 @@
+"""
+全文检索：trigram 索引覆盖3个字符以上的检索词，短检索词（如两个字的中文词）同样匹配所有列
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.api.routes.news import search_news
+from src.models.news import News
+
+
+async def search(read_db, q):
+    rows = await search_news(q=q, page=1, page_size=20, category=None, source=None, days=None, min_score=None,
+                             db=read_db)
+    return sorted(row.url for row in rows)
+
+
+@pytest.fixture
+def articles(db, source):
+    now = datetime.utcnow()
+    db.add_all([
+        News(title="谷歌发布新一代芯片", summary="性能提升", url="https://a/1", source_id=source.id, published_at=now),
+        News(title="Weekly roundup", summary="Links", content="本周开源大模型继续刷新榜单", url="https://a/2",
+             source_id=source.id, published_at=now - timedelta(hours=1)),
+        News(title="OpenAI 融资", summary_translated="新一轮融资完成", url="https://a/3", source_id=source.id,
+             published_at=now - timedelta(hours=2)),
+    ])
+    db.commit()
+
+
+@pytest.mark.asyncio
+async def test_two_character_term_matches_title(read_db, articles):
+    assert await search(read_db, "芯片") == ["https://a/1"]
+
+
+@pytest.mark.asyncio
+async def test_two_character_term_matches_content(read_db, articles):
+    assert await search(read_db, "开源") == ["https://a/2"]
+    assert await search(read_db, "榜单") == ["https://a/2"]
+
+
+@pytest.mark.asyncio
+async def test_three_character_terms_use_index(read_db, articles):
+    assert await search(read_db, "大模型") == ["https://a/2"]
+    assert await search(read_db, "新一代") == ["https://a/1"]
+    assert await search(read_db, "新一轮融资") == ["https://a/3"]
+
+
+@pytest.mark.asyncio
+async def test_mixed_short_and_long_terms(read_db, articles):
+    assert await search(read_db, "大模型 榜单") == ["https://a/2"]
+    assert await search(read_db, "大模型 芯片") == []
+
+
+@pytest.mark.asyncio
+async def test_snippet_marks_match(read_db, articles):
+    rows = await search_news(q="新一代", page=1, page_size=20, category=None, source=None, days=None,
+                             min_score=None, db=read_db)
+    assert "<mark>" in rows[0].snippet
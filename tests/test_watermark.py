@@ -0,0 +1,55 @@
+"""
+增量抓取水位：按标识判断是否抓取过，水位不超过当前时间
+"""
+from datetime import datetime, timedelta
+
+from src.scrapers.feed_stream import take_entries
+from src.scrapers.watermark import SourceWatermark
+
+
+def rss_entry(guid, published):
+    return {"id": guid, "title": guid, "published": published.isoformat() + "Z"}
+
+
+def test_future_dated_entry_does_not_block_later_entries():
+    now = datetime.utcnow()
+    watermark = SourceWatermark()
+    watermark.observe("future", now + timedelta(days=365))
+    watermark.advance()
+    assert watermark.last_published_at <= datetime.utcnow()
+
+    published = now + timedelta(minutes=1)
+    assert not watermark.is_seen("next", published)
+    assert [e["id"] for e in take_entries([rss_entry("next", published)], 10, watermark.stop_before)] == ["next"]
+
+
+def test_stored_future_watermark_is_capped():
+    watermark = SourceWatermark(datetime.utcnow() + timedelta(days=30))
+    assert watermark.last_published_at <= datetime.utcnow()
+
+
+def test_late_backdated_entry_is_new():
+    last = datetime(2024, 1, 10, 12)
+    watermark = SourceWatermark(last, ["old-1", "old-2"])
+    entries = [
+        rss_entry("new", last + timedelta(hours=1)),
+        rss_entry("old-1", last),
+        rss_entry("late", last - timedelta(hours=3)),  # 较晚才出现在源中、发布时间早于水位
+        rss_entry("old-2", last - timedelta(days=2)),
+        rss_entry("older", last - timedelta(days=3)),
+    ]
+    selected = take_entries(entries, 10, watermark.stop_before)
+    assert [e["id"] for e in selected] == ["new", "old-1", "late"]
+    assert [e["id"] for e in selected if not watermark.is_seen(e["id"], last)] == ["new", "late"]
+
+
+def test_seen_guid_is_seen_regardless_of_date():
+    watermark = SourceWatermark(datetime(2024, 1, 10), ["a"])
+    assert watermark.is_seen("a", datetime(2024, 2, 1))
+    assert not watermark.is_seen("b", datetime(2023, 1, 1))
+
+
+def test_entries_without_key_use_date_with_tolerance():
+    watermark = SourceWatermark(datetime(2024, 1, 10), tolerance=timedelta(hours=24))
+    assert not watermark.is_seen(None, datetime(2024, 1, 9, 12))
+    assert watermark.is_seen(None, datetime(2024, 1, 8))